@@ -0,0 +1,245 @@
+# auth.py
+"""Oturum belirteci deposu.
+
+`login()` kullanıcı adı ve şifreyi veritabanında bir kez doğrular ve
+rastgele bir belirteç üretir. `users.token` sütununa belirtecin kendisi
+değil SHA-256 özeti yazılır. Belirteç -> (kullanıcı, rol, departman)
+eşlemesi süreç genelinde TTL/LRU önbellekte tutulur; `authenticate()`
+her rerun'da veritabanına gitmeden bellekten okur.
+
+`last_login` önbellekte hemen güncellenir, veritabanına ise oturum başına
+en fazla `LAST_LOGIN_WRITE_INTERVAL` saniyede bir grup commit kuyruğu
+(`config.submit_write`) üzerinden arka planda yazılır.
+
+Önbellek süreç başınadır. Bu süreçteki `revoke()` / `revoke_user()` /
+`invalidate_user()` girdiyi hemen atar; başka bir süreçte yapılan iptal ya
+da rol değişikliği en geç `SESSION_REVALIDATE_AFTER` saniye sonra görülür.
+"""
+
+import hashlib
+import hmac
+import logging
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+import config
+
+logger = logging.getLogger(__name__)
+
+SESSION_TTL = 8 * 3600              # Hareketsiz oturumun ömrü (sn, her istekte uzar)
+SESSION_CACHE_SIZE = 10000          # Bellekteki azami oturum sayısı (LRU)
+SESSION_REVALIDATE_AFTER = 300      # Önbellekteki oturum bu süreden sonra veritabanından doğrulanır
+LAST_LOGIN_WRITE_INTERVAL = 60      # last_login'in veritabanına yazılma sıklığı (sn)
+
+_DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def hash_password(password):
+    """users.password ile aynı biçim (SHA-256 hex)"""
+    return hashlib.sha256(password.encode()).hexdigest()
+
+
+def _token_digest(token):
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class Session:
+    __slots__ = ('user_id', 'username', 'role', 'department', 'expires_at',
+                 'validated_at', 'last_seen', 'last_written')
+
+    def __init__(self, user_id, username, role, department, last_seen):
+        now = time.monotonic()
+        self.user_id = user_id
+        self.username = username
+        self.role = role
+        self.department = department
+        self.expires_at = now + SESSION_TTL
+        self.validated_at = now
+        self.last_seen = last_seen
+        self.last_written = now
+
+    def __repr__(self):
+        return f"<Session {self.username} ({self.role})>"
+
+
+class SessionStore:
+    """Belirteç özeti -> Session; TTL ve LRU sınırlı, thread-safe"""
+
+    def __init__(self, maxsize=SESSION_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'expired': 0, 'evictions': 0, 'revoked': 0}
+
+    def get(self, digest):
+        now = time.monotonic()
+        with self._lock:
+            session = self._sessions.get(digest)
+            if session is None:
+                self.stats['misses'] += 1
+                return None
+            if now >= session.expires_at:
+                del self._sessions[digest]
+                self.stats['expired'] += 1
+                return None
+            self._sessions.move_to_end(digest)
+            self.stats['hits'] += 1
+            session.expires_at = now + SESSION_TTL
+            return session
+
+    def put(self, digest, session):
+        with self._lock:
+            self._sessions[digest] = session
+            self._sessions.move_to_end(digest)
+            while len(self._sessions) > self.maxsize:
+                self._sessions.popitem(last=False)
+                self.stats['evictions'] += 1
+
+    def pop(self, digest, revoked=False):
+        with self._lock:
+            session = self._sessions.pop(digest, None)
+            if revoked and session is not None:
+                self.stats['revoked'] += 1
+            return session
+
+    def pop_user(self, username, revoked=False):
+        with self._lock:
+            digests = [d for d, s in self._sessions.items() if s.username == username]
+            for digest in digests:
+                del self._sessions[digest]
+            if revoked:
+                self.stats['revoked'] += len(digests)
+        return len(digests)
+
+    def clear(self):
+        with self._lock:
+            self._sessions.clear()
+
+    def info(self):
+        with self._lock:
+            data = dict(self.stats)
+            data['size'] = len(self._sessions)
+        return data
+
+
+session_store = SessionStore()
+
+
+def _fetch_user(column, value):
+    p = config.sql_placeholder()
+    rows = config.fetch_dicts(f"""
+        SELECT id, username, password, role, department, last_login, token
+        FROM users
+        WHERE {column} = {p} AND (deleted = 0 OR deleted IS NULL)
+    """, (value,))
+    return rows[0] if rows else None
+
+
+def _parse_last_login(value):
+    if value is None or isinstance(value, datetime):
+        return value
+    try:
+        return datetime.strptime(str(value)[:19], _DATETIME_FORMAT)
+    except ValueError:
+        return None
+
+
+def _write_last_login(user_id, when):
+    p = config.sql_placeholder()
+    config.submit_write(f"UPDATE users SET last_login = {p} WHERE id = {p}",
+                        (when.strftime(_DATETIME_FORMAT), user_id))
+
+
+def login(username, password):
+    """Şifreyi doğrula ve yeni belirteç döndür (başarısızsa None).
+
+    Kullanıcı başına tek belirteç tutulur; yeni giriş önceki oturumu geçersiz kılar.
+    """
+    user = _fetch_user("username", username)
+    if user is None or not hmac.compare_digest(user['password'], hash_password(password)):
+        logger.warning(f"Başarısız giriş denemesi: {username}")
+        return None
+
+    token = secrets.token_urlsafe(32)
+    digest = _token_digest(token)
+    now = datetime.now()
+    p = config.sql_placeholder()
+    # Belirteç diğer süreçlerin de görebilmesi için hemen yazılır (yazma kuyruğunu bekler)
+    config.submit_write(f"UPDATE users SET token = {p}, last_login = {p} WHERE id = {p}",
+                        (digest, now.strftime(_DATETIME_FORMAT), user['id'])).result()
+
+    if user['token']:
+        session_store.pop(user['token'])
+    session_store.put(digest, Session(user['id'], user['username'], user['role'], user['department'], now))
+    logger.info(f"Giriş: {username}")
+    return token
+
+
+def _load_session(digest):
+    """Önbellekte olmayan belirteci veritabanından doğrula"""
+    user = _fetch_user("token", digest)
+    if user is None:
+        return None
+    last_login = _parse_last_login(user['last_login'])
+    if last_login is None or datetime.now() - last_login > timedelta(seconds=SESSION_TTL):
+        return None
+    return Session(user['id'], user['username'], user['role'], user['department'], last_login)
+
+
+def authenticate(token):
+    """Belirtecin oturumunu döndür; geçersiz ya da süresi dolmuşsa None.
+
+    Önbellekte bulunan oturum için veritabanına gidilmez; yalnızca
+    `SESSION_REVALIDATE_AFTER` saniyede bir yeniden doğrulanır.
+    """
+    if not token:
+        return None
+    digest = _token_digest(token)
+    session = session_store.get(digest)
+    now = time.monotonic()
+
+    if session is not None and now - session.validated_at >= SESSION_REVALIDATE_AFTER:
+        fresh = _fetch_user("token", digest)
+        if fresh is None:
+            session_store.pop(digest)
+            return None
+        session.role, session.department = fresh['role'], fresh['department']
+        session.validated_at = now
+
+    if session is None:
+        session = _load_session(digest)
+        if session is None:
+            return None
+        session_store.put(digest, session)
+
+    session.last_seen = datetime.now()
+    if now - session.last_written >= LAST_LOGIN_WRITE_INTERVAL:
+        session.last_written = now
+        _write_last_login(session.user_id, session.last_seen)
+    return session
+
+
+def revoke(token):
+    """Oturumu kapat: önbellekten at ve veritabanındaki belirteci sil"""
+    digest = _token_digest(token)
+    session = session_store.pop(digest, revoked=True)
+    p = config.sql_placeholder()
+    config.submit_write(f"UPDATE users SET token = NULL WHERE token = {p}", (digest,)).result()
+    if session is not None:
+        logger.info(f"Oturum kapatıldı: {session.username}")
+
+
+def revoke_user(username):
+    """Kullanıcının tüm oturumlarını kapat (ör. şifre değişikliği, hesap kapatma)"""
+    session_store.pop_user(username, revoked=True)
+    p = config.sql_placeholder()
+    config.submit_write(f"UPDATE users SET token = NULL WHERE username = {p}", (username,)).result()
+    logger.info(f"Kullanıcının oturumları kapatıldı: {username}")
+
+
+def invalidate_user(username):
+    """Kullanıcının önbellekteki oturumlarını at; bir sonraki istek rolü veritabanından yeniden okur"""
+    return session_store.pop_user(username)
@@ -0,0 +1,241 @@
+# benchmarks/datagen.py
+"""Benchmark'lar için deterministik sentetik veri üreteci.
+
+config.py şemasını (`employees`, `processes`, `process_scores`, `logs`,
+`innovation_ideas`, `projects`) ölçeğe göre doldurur. Aynı ölçek ve tohum
+her zaman aynı veriyi üretir. Ölçek çalışan sayısıdır; diğer tablolar
+bununla orantılıdır (bkz. TABLE_RATIOS).
+
+Hedef veritabanı config'in ortam değişkenleriyle seçilir:
+
+    EFFINOVA_SQLITE_PATH=/tmp/bench.db python -m benchmarks.datagen --scale 100k
+    EFFINOVA_DB_TYPE=mysql EFFINOVA_MYSQL_DATABASE=effinova_bench python -m benchmarks.datagen --scale 10k
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SCALES = {'1k': 1000, '10k': 10000, '100k': 100000, '1m': 1000000}
+DEFAULT_SEED = 20240601
+INSERT_CHUNK_SIZE = 50000
+
+# Çalışan başına satır (en az değerlerle birlikte)
+TABLE_RATIOS = {
+    'processes': (0.01, 10),
+    'process_scores': (2.0, 100),
+    'logs': (2.0, 100),
+    'innovation_ideas': (0.1, 10),
+    'projects': (0.01, 5),
+}
+
+FIRST_NAMES = ["Ahmet", "Mehmet", "Ayşe", "Fatma", "Mustafa", "Zeynep", "Emine", "Ali", "Hüseyin", "Hatice",
+               "İbrahim", "Şükrü", "Özlem", "Çağla", "Gülşen", "Ömer", "Ümit", "Elif", "Burak", "Deniz",
+               "Serkan", "Merve", "Yusuf", "İrem", "Kemal", "Seda", "Onur", "Büşra", "Cem", "Derya"]
+LAST_NAMES = ["Yılmaz", "Kaya", "Demir", "Şahin", "Çelik", "Yıldız", "Yıldırım", "Öztürk", "Aydın", "Özdemir",
+              "Arslan", "Doğan", "Kılıç", "Aslan", "Çetin", "Kara", "Koç", "Kurt", "Özkan", "Şimşek",
+              "Polat", "Güneş", "Erdoğan", "Işık", "Tekin", "Aksoy", "Bulut", "Karaca", "Uçar", "Ünal"]
+DEPARTMENTS = ["IT", "İNSAN KAYNAKLARI GRUP MÜDÜRLÜĞÜ", "DENETİM MÜDÜRLÜĞÜ", "İKMAL ve OPERASYON GMY",
+               "FİNANS", "SATIŞ", "PAZARLAMA", "HUKUK", "ÜRETİM", "KALİTE", "LOJİSTİK", "AR-GE"]
+POSITIONS = ["Uzman", "Kıdemli Uzman", "Uzman Yardımcısı", "Müdür", "Müdür Yardımcısı", "Şef",
+             "Mühendis", "Analist", "Teknisyen", "Direktör"]
+LOG_ACTIONS = ["login", "logout", "view", "update", "insert", "delete", "export"]
+LOG_TABLES = ["employees", "process_scores", "processes", "innovation_ideas", "projects", None]
+APPROVALS = ["Beklemede", "Onaylandı", "Reddedildi"]
+IDEA_CATEGORIES = ["Süreç", "Ürün", "Maliyet", "Müşteri", "Teknoloji"]
+PROJECT_STATUSES = ["Planning", "Active", "On Hold", "Completed"]
+
+# Sabit başlangıç: üretilen tarihler çalıştırma zamanından bağımsız olsun
+EPOCH = datetime(2024, 1, 1)
+SPAN_DAYS = 730
+
+
+def parse_scale(value):
+    """'10k', '1m' ya da tam sayı -> çalışan sayısı"""
+    value = str(value).lower()
+    if value in SCALES:
+        return SCALES[value]
+    multiplier = {'k': 1000, 'm': 1000000}.get(value[-1:], 1)
+    return int(float(value.rstrip('km')) * multiplier)
+
+
+def table_sizes(scale):
+    sizes = {'employees': scale}
+    for table, (ratio, minimum) in TABLE_RATIOS.items():
+        sizes[table] = max(minimum, int(scale * ratio))
+    return sizes
+
+
+def _pick(rng, values, n):
+    return np.asarray(values, dtype=object)[rng.integers(0, len(values), n)]
+
+
+def _dates(rng, n, fmt="%Y-%m-%d %H:%M:%S", sort=False):
+    seconds = rng.integers(0, SPAN_DAYS * 86400, n)
+    if sort:
+        seconds.sort()
+    stamps = np.datetime64(EPOCH, 's') + seconds.astype('timedelta64[s]')
+    if fmt == "%Y-%m-%d":
+        return np.datetime_as_string(stamps, unit='D').astype(object)
+    return np.char.replace(np.datetime_as_string(stamps, unit='s'), 'T', ' ').astype(object)
+
+
+def employee_rows(rng, n):
+    names = _pick(rng, FIRST_NAMES, n) + " " + _pick(rng, LAST_NAMES, n)
+    sicil = np.char.add("S", np.char.zfill(np.arange(1, n + 1).astype(str), 7)).astype(object)
+    managers = _pick(rng, FIRST_NAMES, n) + " " + _pick(rng, LAST_NAMES, n)
+    emails = np.char.add(np.char.lower(sicil.astype(str)), "@effinova.com").astype(object)
+    return list(zip(names, _pick(rng, POSITIONS, n), _pick(rng, DEPARTMENTS, n), managers, emails, sicil,
+                    _dates(rng, n, "%Y-%m-%d")))
+
+
+def process_rows(rng, n):
+    departments = _pick(rng, DEPARTMENTS, n)
+    weights = np.round(rng.uniform(0.5, 1.5, n), 2)
+    return [(f"Süreç {i + 1}", f"{dept} süreci", dept, float(w))
+            for i, (dept, w) in enumerate(zip(departments, weights))]
+
+
+def score_rows(rng, n, employees, processes):
+    import scoring
+
+    picks = rng.integers(0, len(employees), n)
+    process_ids = rng.integers(1, processes + 1, n)
+    components = np.column_stack([
+        rng.integers(0, 101, n), rng.integers(0, 101, n), rng.integers(0, 101, n),
+        rng.integers(0, 101, n), np.round(rng.uniform(0, 100, n), 1), rng.integers(0, 11, n),
+    ])
+    weights = np.array([scoring.DEFAULT_WEIGHTS[c] for c in scoring.SCORE_COMPONENTS])
+    totals = np.round(components @ weights, scoring.SCORE_DECIMALS)
+    created = _dates(rng, n, sort=True)
+    rows = []
+    for i in range(n):
+        emp = employees[picks[i]]
+        c = components[i]
+        rows.append((int(process_ids[i]), emp[0], emp[5], int(c[0]), int(c[1]), int(c[2]), int(c[3]),
+                     float(c[4]), int(c[5]), float(totals[i]), created[i][:10], APPROVALS[i % 3], created[i]))
+    return rows
+
+
+def log_rows(rng, n, employees):
+    users = np.asarray([e[5] for e in employees], dtype=object)[rng.integers(0, len(employees), n)]
+    record_ids = rng.integers(1, len(employees) + 1, n).astype(str).astype(object)
+    return list(zip(users, _pick(rng, LOG_ACTIONS, n), _dates(rng, n, sort=True),
+                    np.full(n, "sentetik kayıt", dtype=object), np.full(n, "127.0.0.1", dtype=object),
+                    _pick(rng, LOG_TABLES, n), record_ids))
+
+
+def idea_rows(rng, n, employees):
+    picks = rng.integers(0, len(employees), n)
+    return [(employees[p][5], employees[p][0], f"Fikir {i + 1}", "Sentetik inovasyon fikri",
+             IDEA_CATEGORIES[i % len(IDEA_CATEGORIES)], created[:10], APPROVALS[i % 3], int(score))
+            for i, (p, created, score) in enumerate(zip(picks, _dates(rng, n), rng.integers(0, 101, n)))]
+
+
+def project_rows(rng, n, employees):
+    starts = _dates(rng, n, "%Y-%m-%d")
+    return [(f"Proje {i + 1}", "Sentetik proje", start,
+             (datetime.strptime(start, "%Y-%m-%d") + timedelta(days=int(days))).strftime("%Y-%m-%d"),
+             PROJECT_STATUSES[i % len(PROJECT_STATUSES)], float(budget), employees[int(m)][5])
+            for i, (start, days, budget, m) in enumerate(zip(
+                starts, rng.integers(30, 365, n), np.round(rng.uniform(1e4, 1e6, n), 2),
+                rng.integers(0, len(employees), n)))]
+
+
+def _insert(config, table, columns, rows):
+    ph = config.sql_placeholder()
+    cols = ", ".join(f"`{c}`" if config.DATABASE_TYPE == 'mysql' else c for c in columns)
+    query = f"INSERT INTO {table} ({cols}) VALUES ({', '.join([ph] * len(columns))})"
+    for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+        config.execute_many(query, rows[start:start + INSERT_CHUNK_SIZE])
+
+
+def generated_tables():
+    return ['employees', *TABLE_RATIOS]
+
+
+def clear_tables(config):
+    with config.score_summary_bulk_mode(), config.employee_search_bulk_mode():
+        for table in reversed(generated_tables()):
+            config.execute_query(f"DELETE FROM {table}", fetch=False)
+
+
+def generate(scale, seed=DEFAULT_SEED, progress=None):
+    """Boş veritabanını `scale` çalışanlı sentetik veriyle doldur; tablo -> satır sayısı"""
+    import config
+
+    config.run_migrations()
+    sizes = table_sizes(scale)
+    rng = np.random.default_rng(seed)
+    report = progress or (lambda table, rows: None)
+
+    employees = employee_rows(rng, sizes['employees'])
+    with config.employee_search_bulk_mode():
+        _insert(config, "employees", ("Ad_Soyad", "Pozisyon", "Departman", "Yonetici_Adi", "Email", "Sicil_No",
+                                      "İşe_Giriş_Tarihi"), employees)
+    report("employees", len(employees))
+
+    _insert(config, "processes", ("process_name", "description", "department", "weight"),
+            process_rows(rng, sizes['processes']))
+    report("processes", sizes['processes'])
+
+    with config.score_summary_bulk_mode():
+        for start in range(0, sizes['process_scores'], INSERT_CHUNK_SIZE):
+            n = min(INSERT_CHUNK_SIZE, sizes['process_scores'] - start)
+            _insert(config, "process_scores",
+                    ("process_id", "employee_name", "employee_sicil_no", "cikti", "kalite", "strateji",
+                     "inovasyon", "zaman", "ekstra", "toplam_skor", "tarih", "onay", "created_at"),
+                    score_rows(rng, n, employees, sizes['processes']))
+    report("process_scores", sizes['process_scores'])
+
+    _insert(config, "logs", ("username", "action", "timestamp", "details", "ip_address", "table_name",
+                             "record_id"), log_rows(rng, sizes['logs'], employees))
+    report("logs", sizes['logs'])
+
+    _insert(config, "innovation_ideas", ("employee_sicil_no", "employee_name", "idea", "description",
+                                         "category", "created_at", "status", "score"),
+            idea_rows(rng, sizes['innovation_ideas'], employees))
+    report("innovation_ideas", sizes['innovation_ideas'])
+
+    _insert(config, "projects", ("name", "description", "start_date", "end_date", "status", "budget",
+                                 "manager_sicil_no"), project_rows(rng, sizes['projects'], employees))
+    report("projects", sizes['projects'])
+
+    import rollups
+    rollups.refresh_rollups(full=True)
+    config.invalidate_tables(*generated_tables())
+    return sizes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sentetik benchmark verisi üret")
+    parser.add_argument('--scale', default='10k', help="Çalışan sayısı: 1k, 10k, 100k, 1m ya da tam sayı")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--clear', action='store_true', help="Üretmeden önce tabloları boşalt")
+    args = parser.parse_args(argv)
+
+    import config
+
+    config.run_migrations()
+    existing = config.fetch_scalar("SELECT COUNT(*) FROM employees", default=0)
+    if existing and not args.clear:
+        print(f"Veritabanında zaten {existing} çalışan var; --clear ile boşaltın.", file=sys.stderr)
+        return 2
+    if args.clear:
+        clear_tables(config)
+
+    started = time.perf_counter()
+    generate(parse_scale(args.scale), args.seed,
+             progress=lambda table, rows: print(f"{table}: {rows} satır", flush=True))
+    print(f"Tamamlandı: {time.perf_counter() - started:.1f} sn ({config.database_key()})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+# benchmarks/mysql_pool_load.py
+"""MySQL bağlantı havuzu yük testi.
+
+Yerel bir MySQL/MariaDB örneğine karşı farklı havuz boyutlarında eşzamanlı
+sorgu çalıştırır ve saniyedeki sorgu sayısını raporlar. Bağlantı bilgileri
+config.MYSQL_CONFIG'den okunur.
+
+    python -m benchmarks.mysql_pool_load --pool-sizes 1,2,4,8,16 --threads 32
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+
+
+def run_load(pool_size, threads, duration, query):
+    manager = config.MySQLManager(pool_size=pool_size)
+    counts = [0] * threads
+    errors = [0] * threads
+    deadline = time.perf_counter() + duration
+
+    def worker(i):
+        while time.perf_counter() < deadline:
+            if manager.execute_query(query) is None:
+                errors[i] += 1
+            else:
+                counts[i] += 1
+
+    workers = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(threads)]
+    started = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    elapsed = time.perf_counter() - started
+    stats = manager.pool.stats()
+    manager.close()
+    return {
+        'pool_size': pool_size,
+        'threads': threads,
+        'queries': sum(counts),
+        'errors': sum(errors),
+        'qps': round(sum(counts) / elapsed, 1),
+        'avg_wait_ms': round(stats['avg_wait'] * 1000, 3),
+        'max_wait_ms': round(stats['max_wait'] * 1000, 3),
+        'peak_in_use': stats['peak_in_use'],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="MySQL havuz boyutu / throughput yük testi")
+    parser.add_argument('--pool-sizes', default='1,2,4,8,16')
+    parser.add_argument('--threads', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=5.0, help="Her havuz boyutu için süre (sn)")
+    parser.add_argument('--query', default="SELECT SLEEP(0.002) AS s",
+                        help="Sunucu tarafında gecikme simüle eden sorgu")
+    parser.add_argument('--json', action='store_true', help="Sonuçları JSON olarak yaz")
+    args = parser.parse_args(argv)
+
+    if not config.MYSQL_AVAILABLE:
+        print("MySQL connector kurulu değil.", file=sys.stderr)
+        return 2
+
+    results = [
+        run_load(int(size), args.threads, args.duration, args.query)
+        for size in args.pool_sizes.split(',')
+    ]
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'havuz':>6} {'qps':>10} {'hata':>6} {'ort.bekleme ms':>15} {'tepe':>6}")
+        for r in results:
+            print(f"{r['pool_size']:>6} {r['qps']:>10} {r['errors']:>6} {r['avg_wait_ms']:>15} {r['peak_in_use']:>6}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,180 @@
+# benchmarks/orm_vs_raw.py
+"""Depo katmanı (repository.py) ile ham SQL yolunun karşılaştırması.
+
+Aynı sentetik veritabanında (bkz. suite.py) toplu ekleme, toplu güncelleme
+ve ilişkili okuma işlemlerini üç yoldan ölçer: ham SQL (`config.execute_many`
+/ `get_dataframe`), depo katmanının toplu yolları ve karşılaştırma için ORM
+birim-iş / tembel yükleme yolu. İlişkili okumalarda sorgu sayısı da yazılır.
+
+    python -m benchmarks.orm_vs_raw --scale 10k --rows 10000
+    python -m benchmarks.orm_vs_raw --scale 10k --output orm.json --baseline orm_onceki.json
+"""
+
+import argparse
+import json
+import os
+import sys
+from datetime import date, datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import suite
+
+BENCH_MARKER = "orm-benchmark"
+DEFAULT_ROWS = 10000
+DEFAULT_PROCESSES = 20
+SCORE_COLUMNS = ("process_id", "employee_name", "employee_sicil_no", "cikti", "kalite", "strateji",
+                 "inovasyon", "zaman", "ekstra", "toplam_skor", "tarih", "onay")
+
+
+def benchmark_rows(n, process_count):
+    # Her satır ayrı çalışan anahtarı: özet tetikleyicisi aynı anahtarı tekrar tekrar hesaplamasın
+    return [{
+        'process_id': 1 + i % process_count, 'employee_name': BENCH_MARKER, 'employee_sicil_no': f"ORM{i:07d}",
+        'cikti': i % 101, 'kalite': (i * 7) % 101, 'strateji': (i * 11) % 101, 'inovasyon': (i * 13) % 101,
+        'zaman': float(i % 100), 'ekstra': i % 11, 'toplam_skor': float(i % 100), 'tarih': date(2025, 6, 1),
+        'onay': "Beklemede",
+    } for i in range(n)]
+
+
+def build_benchmarks(config, args):
+    import models
+    import repository
+    from sqlalchemy import event, select
+    from sqlalchemy.orm import lazyload
+
+    ph = config.sql_placeholder()
+    rows = benchmark_rows(args.rows, args.processes)
+    tuples = [tuple(str(r[c]) if c == 'tarih' else r[c] for c in SCORE_COLUMNS) for r in rows]
+    insert_sql = f"INSERT INTO process_scores ({', '.join(SCORE_COLUMNS)}) VALUES ({', '.join([ph] * len(SCORE_COLUMNS))})"
+    update_sql = f"UPDATE process_scores SET toplam_skor = {ph}, onay = {ph} WHERE id = {ph}"
+    process_count = min(args.processes, config.fetch_scalar("SELECT COUNT(*) FROM processes", default=0))
+    process_ids = list(range(1, process_count + 1))
+    ids = []
+    counter = {'queries': 0}
+    event.listen(models.get_engine(), "before_cursor_execute",
+                 lambda *a: counter.__setitem__('queries', counter['queries'] + 1))
+
+    def cleanup():
+        config.execute_query(f"DELETE FROM process_scores WHERE employee_name = {ph}", (BENCH_MARKER,), fetch=False)
+
+    def seed_rows():
+        cleanup()
+        config.execute_many(insert_sql, tuples)
+        ids[:] = [r['id'] for r in config.fetch_dicts(
+            f"SELECT id FROM process_scores WHERE employee_name = {ph} ORDER BY id", (BENCH_MARKER,))]
+
+    def insert_orm_unit_of_work():
+        with repository.session_scope() as session:
+            session.add_all(models.ProcessScore(**r) for r in rows)
+
+    def update_raw():
+        config.execute_many(update_sql, [(float(i % 50), "Onaylandı", id_) for i, id_ in enumerate(ids)])
+
+    def update_repository():
+        repository.process_scores.bulk_update(
+            [{'id': id_, 'toplam_skor': float(i % 50), 'onay': "Onaylandı"} for i, id_ in enumerate(ids)])
+
+    def read_raw():
+        return config.get_dataframe(f"""
+            SELECT p.id AS process_id, p.process_name, ps.id, ps.employee_sicil_no, ps.toplam_skor
+            FROM processes p
+            JOIN process_scores ps ON ps.process_id = p.id
+            WHERE p.id IN ({', '.join([ph] * len(process_ids))})
+            ORDER BY p.id, ps.id
+        """, tuple(process_ids))
+
+    def read_selectin():
+        found = repository.processes.with_scores(models.Process.id.in_(process_ids))
+        return [(p.process_name, s.toplam_skor) for p in found for s in p.scores]
+
+    def read_lazy():
+        # Karşılaştırma için bilerek N+1: her süreç için ayrı skor sorgusu
+        with repository.session_scope() as session:
+            stmt = select(models.Process).where(models.Process.id.in_(process_ids)).options(
+                lazyload(models.Process.scores))
+            return [(p.process_name, s.toplam_skor) for p in session.scalars(stmt) for s in p.scores]
+
+    benchmarks = [
+        suite.Benchmark("insert.raw", lambda: config.execute_many(insert_sql, tuples), setup=cleanup,
+                        repeat=args.repeat, ops=args.rows),
+        suite.Benchmark("insert.repository", lambda: repository.process_scores.bulk_insert(rows), setup=cleanup,
+                        repeat=args.repeat, ops=args.rows),
+        suite.Benchmark("insert.orm_unit_of_work", insert_orm_unit_of_work, setup=cleanup,
+                        repeat=args.repeat, ops=args.rows),
+        suite.Benchmark("update.raw", update_raw, setup=lambda: ids or seed_rows(), repeat=args.repeat,
+                        ops=args.rows),
+        suite.Benchmark("update.repository", update_repository, setup=lambda: ids or seed_rows(),
+                        repeat=args.repeat, ops=args.rows),
+        suite.Benchmark("read.raw_join", read_raw, repeat=args.repeat),
+        suite.Benchmark("read.repository_selectin", read_selectin, repeat=args.repeat),
+        suite.Benchmark("read.orm_lazy_n_plus_1", read_lazy, repeat=args.repeat),
+    ]
+    return benchmarks, counter, cleanup
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Depo katmanı / ham SQL karşılaştırması")
+    suite.add_database_arguments(parser)
+    parser.add_argument('--rows', type=int, default=DEFAULT_ROWS, help="Toplu yazma başına satır")
+    parser.add_argument('--processes', type=int, default=DEFAULT_PROCESSES, help="İlişkili okumadaki süreç sayısı")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', default=None, help="Sonuçların yazılacağı JSON dosyası")
+    parser.add_argument('--baseline', default=None, help="Karşılaştırılacak önceki sonuç dosyası")
+    parser.add_argument('--threshold', type=float, default=suite.REGRESSION_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    config, scale = suite.prepare_database(args)
+    if not config.SQLALCHEMY_AVAILABLE:
+        print("SQLAlchemy kurulu değil.", file=sys.stderr)
+        return 2
+
+    benchmarks, counter, cleanup = build_benchmarks(config, args)
+    results = {}
+    try:
+        for bench in benchmarks:
+            print(f"{bench.name}...", end=" ", file=sys.stderr, flush=True)
+            results[bench.name] = suite.measure(bench, args.repeat)
+            if bench.name.startswith("read.") and "raw" not in bench.name:
+                counter['queries'] = 0
+                bench.fn()
+                results[bench.name]['queries'] = counter['queries']
+            print(f"{results[bench.name]['median_ms']:.2f} ms", file=sys.stderr)
+    finally:
+        cleanup()
+
+    report = {
+        'format': suite.RESULT_FORMAT_VERSION,
+        'meta': {
+            'created_at': datetime.now().isoformat(timespec="seconds"),
+            'backend': config.DATABASE_TYPE,
+            'database': config.database_key(),
+            'scale': scale,
+            'rows': args.rows,
+            'processes': args.processes,
+        },
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+    print(f"\n{'benchmark':<28} {'medyan ms':>10} {'satır/sn':>12} {'sorgu':>6}", file=sys.stderr)
+    for name, result in results.items():
+        rate = f"{result['ops_per_sec']:,.0f}" if 'ops_per_sec' in result else "-"
+        print(f"{name:<28} {result['median_ms']:>10.2f} {rate:>12} {result.get('queries', '-'):>6}",
+              file=sys.stderr)
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = [row[0] for row in suite.compare(report, baseline, args.threshold) if row[4] == "YAVAŞLAMA"]
+    if regressions:
+        print(f"\n{len(regressions)} benchmark yavaşladı: {', '.join(regressions)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,325 @@
+# benchmarks/suite.py
+"""Veri erişimi ve panel fonksiyonları için benchmark takımı.
+
+Sentetik veriyle (bkz. datagen.py) doldurulmuş ayrı bir veritabanında panelin
+sıcak yollarını ölçer ve sonuçları JSON olarak yazar. `--baseline` verilirse
+medyan süreleri kayıtlı sonuçla karşılaştırır; eşiği aşan yavaşlama varsa
+çıkış kodu 1'dir.
+
+    python -m benchmarks.suite --scale 10k --output bench.json
+    python -m benchmarks.suite --scale 100k --baseline bench.json
+    python -m benchmarks.suite --backend mysql --mysql-database effinova_bench --scale 10k
+
+Varsayılan hedef benchmarks/data/ altındaki SQLite dosyasıdır ve tamamen
+çevrimdışı çalışır. Veri ölçek başına bir kez üretilir, sonraki
+çalıştırmalar aynı dosyayı kullanır (`--regenerate` yeniden üretir).
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import datagen
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(BENCH_DIR, "data")
+RESULT_FORMAT_VERSION = 1
+
+DEFAULT_REPEAT = 20
+REGRESSION_THRESHOLD = 0.25   # Medyan bu orandan fazla artarsa yavaşlama sayılır
+NOISE_FLOOR_MS = 1.0          # Bundan küçük mutlak farklar yok sayılır
+LOG_ACTION_CALLS = 5000
+LOG_ACTION_THREADS = 4
+LOOKUP_SAMPLE_SIZE = 200
+BENCH_USERNAME = "benchmark"
+
+# =============================================================================
+# ÖLÇÜM
+# =============================================================================
+
+class Benchmark:
+    """Ölçülecek bir işlem: `setup` her ölçümden önce, süreye dahil edilmeden çalışır"""
+
+    def __init__(self, name, fn, setup=None, repeat=None, ops=1):
+        self.name = name
+        self.fn = fn
+        self.setup = setup
+        self.repeat = repeat
+        self.ops = ops
+
+
+def measure(bench, repeat, warmup=1):
+    for _ in range(warmup):
+        if bench.setup:
+            bench.setup()
+        bench.fn()
+
+    timings = []
+    rows = None
+    for _ in range(bench.repeat or repeat):
+        if bench.setup:
+            bench.setup()
+        started = time.perf_counter()
+        result = bench.fn()
+        timings.append((time.perf_counter() - started) * 1000)
+        if hasattr(result, '__len__'):
+            rows = len(result)
+
+    timings.sort()
+    median = statistics.median(timings)
+    summary = {
+        'runs': len(timings),
+        'min_ms': round(timings[0], 3),
+        'median_ms': round(median, 3),
+        'mean_ms': round(statistics.fmean(timings), 3),
+        'p95_ms': round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 3),
+        'max_ms': round(timings[-1], 3),
+    }
+    if bench.ops > 1:
+        summary['ops_per_sec'] = round(bench.ops / (median / 1000), 1)
+    if rows is not None:
+        summary['rows'] = rows
+    return summary
+
+
+# =============================================================================
+# BENCHMARK'LAR
+# =============================================================================
+
+def _cold_initialize_database():
+    """Boş bir SQLite dosyasında ilk açılış (migrasyonlar dahil), ayrı süreçte"""
+    script = (
+        "import time, config\n"
+        "t = time.perf_counter()\n"
+        "assert config.initialize_database()\n"
+        "print((time.perf_counter() - t) * 1000)\n"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, EFFINOVA_SQLITE_PATH=os.path.join(tmp, "cold.db"), EFFINOVA_DB_TYPE="sqlite")
+        proc = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, env=env,
+                              cwd=os.path.dirname(BENCH_DIR))
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr[-2000:])
+    return float(proc.stdout.strip().splitlines()[-1])
+
+
+def build_benchmarks(config, panel, seed):
+    rng = random.Random(seed)
+    sample = config.fetch_dicts(
+        "SELECT Sicil_No, Ad_Soyad FROM employees ORDER BY id LIMIT 5000")
+    sicils = [row['Sicil_No'] for row in rng.sample(sample, min(LOOKUP_SAMPLE_SIZE, len(sample)))]
+    names = [row['Ad_Soyad'].split()[-1] for row in rng.sample(sample, min(LOOKUP_SAMPLE_SIZE, len(sample)))]
+    cursor = {'sicil': 0, 'name': 0}
+
+    def next_value(kind, values):
+        value = values[cursor[kind] % len(values)]
+        cursor[kind] += 1
+        return value
+
+    def log_action_burst():
+        per_thread = LOG_ACTION_CALLS // LOG_ACTION_THREADS
+
+        def worker(i):
+            for n in range(per_thread):
+                config.log_action(BENCH_USERNAME, "benchmark", f"thread {i}", "employees", str(n))
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(LOG_ACTION_THREADS)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        # Grup commit kuyruğu boşalana kadar: ölçülen süre diske yazılmış satırlar içindir
+        config.write_queue.flush()
+
+    return [
+        Benchmark("initialize_database.warm", config.initialize_database),
+        Benchmark("fast_get_employees.cold", panel.fast_get_employees,
+                  setup=lambda: config.invalidate_tables("employees")),
+        Benchmark("fast_get_employees.warm", panel.fast_get_employees),
+        Benchmark("get_employees_from_db", panel.get_employees_from_db, repeat=5),
+        Benchmark("get_employee_scores.cold", panel.get_employee_scores,
+                  setup=lambda: config.invalidate_tables("employee_score_summary"), repeat=5),
+        Benchmark("get_employee_scores.warm", panel.get_employee_scores),
+        Benchmark("show_employee_details.sicil",
+                  lambda: panel.show_employee_details(next_value('sicil', sicils))),
+        Benchmark("show_employee_details.name",
+                  lambda: panel.show_employee_details(next_value('name', names))),
+        Benchmark("log_action.throughput", log_action_burst, repeat=3, ops=LOG_ACTION_CALLS),
+    ]
+
+
+# =============================================================================
+# SONUÇLAR
+# =============================================================================
+
+def _git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=BENCH_DIR, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def compare(current, baseline, threshold=REGRESSION_THRESHOLD, noise_floor=NOISE_FLOOR_MS):
+    """Ortak benchmark'lar için medyan karşılaştırması; [(ad, eski, yeni, oran, durum)]"""
+    rows = []
+    for name, result in current['results'].items():
+        old = baseline.get('results', {}).get(name)
+        if old is None:
+            continue
+        before, after = old['median_ms'], result['median_ms']
+        ratio = after / before if before else float('inf')
+        if after - before > noise_floor and ratio > 1 + threshold:
+            status = "YAVAŞLAMA"
+        elif before - after > noise_floor and ratio < 1 / (1 + threshold):
+            status = "iyileşme"
+        else:
+            status = "ok"
+        rows.append((name, before, after, ratio, status))
+    return rows
+
+
+def add_database_arguments(parser):
+    """Hedef veritabanı ve sentetik veri seçenekleri (diğer benchmark betikleri de kullanır)"""
+    parser.add_argument('--scale', default='10k', help="Çalışan sayısı: 1k, 10k, 100k, 1m ya da tam sayı")
+    parser.add_argument('--seed', type=int, default=datagen.DEFAULT_SEED)
+    parser.add_argument('--backend', choices=['sqlite', 'mysql'], default='sqlite')
+    parser.add_argument('--db', default=None, help="SQLite dosyası (varsayılan: benchmarks/data/)")
+    parser.add_argument('--mysql-database', default='effinova_bench',
+                        help="MySQL hedefi için veritabanı adı (diğer ayarlar config.MYSQL_CONFIG'den)")
+    parser.add_argument('--regenerate', action='store_true', help="Sentetik veriyi baştan üret")
+
+
+def prepare_database(args):
+    """Ortam değişkenlerini ayarla, config'i yükle ve veriyi gerekiyorsa üret"""
+    scale = datagen.parse_scale(args.scale)
+    if args.backend == 'mysql':
+        os.environ['EFFINOVA_DB_TYPE'] = 'mysql'
+        os.environ['EFFINOVA_MYSQL_DATABASE'] = args.mysql_database
+    else:
+        os.makedirs(DATA_DIR, exist_ok=True)
+        path = args.db or os.path.join(DATA_DIR, f"bench_{args.scale}_{args.seed}.db")
+        if args.regenerate:
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+        os.environ['EFFINOVA_DB_TYPE'] = 'sqlite'
+        os.environ['EFFINOVA_SQLITE_PATH'] = path
+
+    import config
+
+    if args.backend == 'mysql' and config.DATABASE_TYPE != 'mysql':
+        raise RuntimeError("MySQL connector kurulu değil.")
+    if not config.initialize_database():
+        raise RuntimeError(f"Veritabanı başlatılamadı: {config.database_key()}")
+
+    existing = config.fetch_scalar("SELECT COUNT(*) FROM employees", default=0)
+    if existing != scale:
+        if existing:
+            if not args.regenerate:
+                raise RuntimeError(f"{config.database_key()} içinde {existing} çalışan var, ölçek {scale}; "
+                                   f"--regenerate kullanın.")
+            datagen.clear_tables(config)
+        print(f"Sentetik veri üretiliyor ({scale} çalışan)...", file=sys.stderr, flush=True)
+        started = time.perf_counter()
+        datagen.generate(scale, args.seed)
+        print(f"Veri hazır: {time.perf_counter() - started:.1f} sn", file=sys.stderr)
+    return config, scale
+
+
+def run(args):
+    config, scale = prepare_database(args)
+    import effinova_panel as panel
+
+    results = {}
+    selected = [b for b in build_benchmarks(config, panel, args.seed)
+                if not args.only or any(o in b.name for o in args.only)]
+    try:
+        for bench in selected:
+            print(f"{bench.name}...", end=" ", file=sys.stderr, flush=True)
+            results[bench.name] = measure(bench, args.repeat)
+            print(f"{results[bench.name]['median_ms']:.2f} ms", file=sys.stderr)
+
+        if config.DATABASE_TYPE == 'sqlite' and (not args.only or any(o in "initialize_database.cold"
+                                                                        for o in args.only)):
+            timings = sorted(_cold_initialize_database() for _ in range(args.cold_repeat))
+            results["initialize_database.cold"] = {
+                'runs': len(timings),
+                'min_ms': round(timings[0], 3),
+                'median_ms': round(statistics.median(timings), 3),
+                'max_ms': round(timings[-1], 3),
+            }
+    finally:
+        # Benchmark'ın yazdığı loglar sonraki çalıştırmaları etkilemesin
+        ph = config.sql_placeholder()
+        config.execute_query(f"DELETE FROM logs WHERE username = {ph}", (BENCH_USERNAME,), fetch=False)
+
+    return {
+        'format': RESULT_FORMAT_VERSION,
+        'meta': {
+            'created_at': datetime.now().isoformat(timespec="seconds"),
+            'git_revision': _git_revision(),
+            'backend': config.DATABASE_TYPE,
+            'database': config.database_key(),
+            'scale': scale,
+            'seed': args.seed,
+            'table_sizes': datagen.table_sizes(scale),
+            'repeat': args.repeat,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+        },
+        'results': results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="EFFINOVA veri erişimi benchmark takımı")
+    add_database_arguments(parser)
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    parser.add_argument('--cold-repeat', type=int, default=3, help="Soğuk initialize_database tekrar sayısı")
+    parser.add_argument('--only', nargs='*', help="Yalnızca adında bu ifadeler geçen benchmark'lar")
+    parser.add_argument('--output', default=None, help="Sonuçların yazılacağı JSON dosyası")
+    parser.add_argument('--baseline', default=None, help="Karşılaştırılacak önceki sonuç dosyası")
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD,
+                        help="Yavaşlama eşiği (0.25 = medyan %%25'ten fazla arttı)")
+    args = parser.parse_args(argv)
+
+    report = run(args)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    else:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get('meta', {}).get('scale') != report['meta']['scale']:
+        print(f"Uyarı: temel çizgi ölçeği {baseline.get('meta', {}).get('scale')}, bu çalıştırma "
+              f"{report['meta']['scale']}", file=sys.stderr)
+    rows = compare(report, baseline, args.threshold)
+    print(f"\n{'benchmark':<32} {'önce ms':>10} {'sonra ms':>10} {'oran':>7}  durum", file=sys.stderr)
+    for name, before, after, ratio, status in rows:
+        print(f"{name:<32} {before:>10.2f} {after:>10.2f} {ratio:>7.2f}  {status}", file=sys.stderr)
+    regressions = [row[0] for row in rows if row[4] == "YAVAŞLAMA"]
+    if regressions:
+        print(f"\n{len(regressions)} benchmark yavaşladı: {', '.join(regressions)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
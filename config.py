@@ -1,42 +1,41 @@
 # config.py
 
-import mysql.connector
-from mysql.connector import Error
 import sqlite3
 import streamlit as st
 import pandas as pd
-from datetime import datetime, date
+from datetime import datetime
 import hashlib
+import json
+import re
+import base64
+import functools
 import logging
+import logging.handlers
 import os
+import threading
+import time
+import asyncio
+import atexit
+import queue
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from contextlib import contextmanager
 
+from lazy import lazy_import, is_available
+
 # --- Logging setup ---
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-# --- MySQL connector import with error handling ---
-try:
-    import mysql.connector
-    from mysql.connector import Error
-    MYSQL_AVAILABLE = True
-except ImportError:
-    MYSQL_AVAILABLE = False
+# --- Ağır bağımlılıklar ilk kullanımda yüklenir (bkz. lazy.py) ---
+# MySQL connector yalnızca MySQL seçiliyse, SQLAlchemy yalnızca models.py kullanılınca import edilir
+MYSQL_AVAILABLE = is_available("mysql.connector")
+if not MYSQL_AVAILABLE:
     logger.warning("⚠️ MySQL connector kurulu değil. Sadece SQLite kullanılabilir.")
+mysql_connector = lazy_import("mysql.connector")
 
-# --- SQLAlchemy imports ---
-try:
-    from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Date, Float
-    try:
-        from sqlalchemy.orm import declarative_base
-    except ImportError:
-        from sqlalchemy.ext.declarative import declarative_base
-    from sqlalchemy.orm import sessionmaker, relationship
-    SQLALCHEMY_AVAILABLE = True
-    Base = declarative_base()
-except ImportError:
-    SQLALCHEMY_AVAILABLE = False
-    Base = None
+SQLALCHEMY_AVAILABLE = is_available("sqlalchemy")
+if not SQLALCHEMY_AVAILABLE:
     logger.warning("⚠️ SQLAlchemy kurulu değil. ORM özellikleri kullanılamayacak.")
 
 # =============================================================================
@@ -49,6 +48,10 @@ if MYSQL_AVAILABLE:
 else:
     DATABASE_TYPE = 'sqlite'  # MySQL yoksa zorla SQLite
 
+# Ortam değişkenleri yukarıdakileri geçersiz kılar (benchmark'lar ve ayrı test veritabanları için)
+if os.environ.get('EFFINOVA_DB_TYPE') in ('mysql', 'sqlite'):
+    DATABASE_TYPE = os.environ['EFFINOVA_DB_TYPE'] if MYSQL_AVAILABLE else 'sqlite'
+
 # MySQL Konfigürasyonu
 MYSQL_CONFIG = {
     'host': 'localhost',
@@ -60,220 +63,1081 @@ MYSQL_CONFIG = {
     'collation': 'utf8mb4_unicode_ci',
     'autocommit': True
 }
+if os.environ.get('EFFINOVA_MYSQL_DATABASE'):
+    MYSQL_CONFIG['database'] = os.environ['EFFINOVA_MYSQL_DATABASE']
+
+# Grup commit yazma kuyruğu ayarları
+WRITE_QUEUE_CONFIG = {
+    'enabled': True,
+    'max_batch': 500,      # Tek transaction'daki azami ifade sayısı
+    'max_delay': 0.05,     # İlk ifadeden sonra commit için azami bekleme (sn)
+    'max_pending': 10000,  # Kuyruk doluysa ifade çağıranın thread'inde hemen yazılır
+}
+
+# iter_dataframe() varsayılan parça boyutu (satır)
+DATAFRAME_CHUNK_SIZE = 10000
+IN_CLAUSE_CHUNK_SIZE = 500   # IN (...) listesi başına azami değer (SQLite değişken sınırının altında)
+
+# get_dataframe(optimize_dtypes=True) ve önbellekli yükleyiciler için sütun türü politikası
+DTYPE_POLICY_CONFIG = {
+    'enabled': True,
+    'category_max_ratio': 0.5,   # Benzersiz değer / satır oranı bunu aşmayan metin sütunları category olur
+    'category_min_rows': 32,     # Daha küçük sonuçlarda kategori sözlüğü kazandırmaz
+    'downcast_floats': True,     # REAL skorlar float32'ye (yalnızca göreli hata 1e-6 altındaysa)
+    'arrow_strings': os.environ.get('EFFINOVA_ARROW_STRINGS') == '1',  # Kalan metinler string[pyarrow]
+}
+
+# run_queries() ile eşzamanlı çalıştırılan bağımsız okumalar
+QUERY_BATCH_CONFIG = {
+    'max_workers': 4,   # Tüm oturumlar için ortak; okuma havuzu boyutunu aşmaz
+    'timeout': 60.0,    # Grubun tamamı için azami bekleme (sn)
+}
+
+# MySQL bağlantı havuzu ayarları
+MYSQL_POOL_CONFIG = {
+    'pool_size': 10,
+    'checkout_timeout': 30.0,
+    'health_check_interval': 30.0,  # Bu kadar boşta kalan bağlantı checkout'ta ping'lenir (0 = her seferinde)
+    'max_idle_time': 300.0,         # Daha uzun boşta kalan bağlantılar kapatılır
+    'max_lifetime': 3600.0,         # wait_timeout'a takılmadan önce yenile
+}
+
+# Sorgu ölçümü ve yavaş sorgu günlüğü (logs/slow_queries.log)
+QUERY_STATS_CONFIG = {
+    'enabled': True,
+    'slow_query_ms': 250,      # Bu süreyi aşan ifadeler yavaş sorgu günlüğüne yazılır
+    'explain_slow': True,      # SQLite: yavaş okuma sorgusunun planı parmak izi başına bir kez alınır
+    'max_fingerprints': 500,   # Aşılırsa en az toplam süreli ifade atılır
+}
 
 # SQLite Konfigürasyonu
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-SQLITE_DB_PATH = os.path.join(BASE_DIR, "effinova.db")
+SQLITE_DB_PATH = os.environ.get('EFFINOVA_SQLITE_PATH') or os.path.join(BASE_DIR, "effinova.db")
 
-# SQLAlchemy Konfigürasyonu
-SQLITE_ENGINE = None
-SQLiteSessionLocal = None
+# SQLite bağlantı havuzu ayarları
+SQLITE_POOL_CONFIG = {
+    'max_connections': 8,        # Okuma (query_only) bağlantı sayısı
+    'max_write_connections': 2,  # Yazma bağlantı sayısı (WAL'de tek yazar kilidi var)
+    'checkout_timeout': 30.0,    # Boş bağlantı beklerken azami süre (sn)
+    'busy_timeout_ms': 5000,
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size_kb': 16 * 1024,  # Bağlantı başına sayfa önbelleği
+    'temp_store': 'MEMORY',
+}
 
-if SQLALCHEMY_AVAILABLE:
-    SQLITE_ENGINE = create_engine(f"sqlite:///{SQLITE_DB_PATH}")
+# SQLAlchemy motorları ve ORM modelleri models.py'de, ilk kullanımda yüklenir
+_MODELS_EXPORTS = {
+    'Base', 'User', 'Employee', 'Process', 'ProcessScore', 'InnovationIdea', 'Project',
+    'get_mysql_engine',
+}
 
-    def get_mysql_engine():
-        if not MYSQL_AVAILABLE:
-            return None
-        mysql_url = f"mysql+mysqlconnector://{MYSQL_CONFIG['user']}:{MYSQL_CONFIG['password']}@{MYSQL_CONFIG['host']}:{MYSQL_CONFIG['port']}/{MYSQL_CONFIG['database']}"
-        return create_engine(mysql_url, echo=False)
+def __getattr__(name):
+    """Eski `config.SQLITE_ENGINE`, `config.User` vb. erişimlerini models.py'ye yönlendir"""
+    if SQLALCHEMY_AVAILABLE and (name in _MODELS_EXPORTS or name in ('SQLITE_ENGINE', 'SQLiteSessionLocal')):
+        import models
+        if name == 'SQLITE_ENGINE':
+            return models.get_sqlite_engine()
+        if name == 'SQLiteSessionLocal':
+            return models.get_session_factory()
+        return getattr(models, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# =============================================================================
+# BAĞLANTI HAVUZU
+# =============================================================================
+
+class PoolTimeoutError(Exception):
+    """Havuzda süresi içinde boş bağlantı bulunamadı"""
+
+
+class ConnectionPool:
+    """Sınırlı, thread-safe bağlantı havuzu.
+
+    Bağlantılar Streamlit rerun'ları boyunca açık kalır. Bir thread mümkünse
+    en son kullandığı bağlantıyı geri alır; havuz doluysa `checkout_timeout`
+    kadar beklenir. `validate` verilmişse `health_check_interval` saniyeden
+    uzun boşta kalan bağlantılar checkout sırasında doğrulanır; `max_idle_time`
+    ve `max_lifetime` aşan bağlantılar kapatılıp yenisi açılır. Bekleme ve
+    kullanım istatistikleri `stats()` ile okunur.
+    """
+
+    def __init__(self, factory, max_size, checkout_timeout=30.0, name="pool",
+                 validate=None, health_check_interval=None, max_idle_time=None, max_lifetime=None):
+        self._factory = factory
+        self.max_size = max(1, int(max_size))
+        self.checkout_timeout = checkout_timeout
+        self.name = name
+        self._validate = validate
+        self.health_check_interval = health_check_interval
+        self.max_idle_time = max_idle_time
+        self.max_lifetime = max_lifetime
+        self._idle = []          # [(conn, owner_thread_id, last_used, created_at)]
+        self._created_at = {}    # id(conn) -> oluşturulma zamanı
+        self._size = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._stats = {
+            'created': 0,
+            'checkouts': 0,
+            'in_use': 0,
+            'peak_in_use': 0,
+            'waits': 0,
+            'total_wait': 0.0,
+            'max_wait': 0.0,
+            'timeouts': 0,
+            'discarded': 0,
+            'recycled': 0,
+            'health_checks': 0,
+            'health_check_failures': 0,
+        }
+
+    def _take_idle(self):
+        thread_id = threading.get_ident()
+        for i in range(len(self._idle) - 1, -1, -1):
+            if self._idle[i][1] == thread_id:
+                return self._idle.pop(i)
+        return self._idle.pop()
+
+    def _is_expired(self, last_used, created_at, now):
+        if self.max_idle_time is not None and now - last_used > self.max_idle_time:
+            return True
+        if self.max_lifetime is not None and now - created_at > self.max_lifetime:
+            return True
+        return False
+
+    def _needs_health_check(self, last_used, now):
+        if self._validate is None or self.health_check_interval is None:
+            return False
+        return now - last_used >= self.health_check_interval
+
+    def _drop(self, conn, counter):
+        """Checkout edilmiş ama kullanılamaz bağlantının slotunu serbest bırak"""
+        with self._cond:
+            self._size -= 1
+            self._created_at.pop(id(conn), None)
+            self._stats[counter] += 1
+            self._cond.notify()
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def acquire(self):
+        start = time.perf_counter()
+        waited = False
+        while True:
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise PoolTimeoutError(f"{self.name} havuzu kapatıldı")
+                    if self._idle:
+                        conn, _, last_used, created_at = self._take_idle()
+                        break
+                    if self._size < self.max_size:
+                        self._size += 1
+                        conn = None
+                        break
+                    remaining = self.checkout_timeout - (time.perf_counter() - start)
+                    if remaining <= 0:
+                        self._stats['timeouts'] += 1
+                        raise PoolTimeoutError(
+                            f"{self.name} havuzunda {self.checkout_timeout} sn içinde boş bağlantı bulunamadı "
+                            f"(boyut: {self.max_size})"
+                        )
+                    waited = True
+                    self._cond.wait(remaining)
+
+            if conn is None:
+                try:
+                    conn = self._factory()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+                with self._cond:
+                    self._created_at[id(conn)] = time.monotonic()
+                    self._stats['created'] += 1
+                break
+
+            now = time.monotonic()
+            if self._is_expired(last_used, created_at, now):
+                self._drop(conn, 'recycled')
+                continue
+            if self._needs_health_check(last_used, now):
+                with self._cond:
+                    self._stats['health_checks'] += 1
+                try:
+                    healthy = self._validate(conn)
+                except Exception:
+                    healthy = False
+                if not healthy:
+                    logger.info(f"{self.name}: sağlıksız bağlantı atıldı, yenisi açılıyor.")
+                    self._drop(conn, 'health_check_failures')
+                    continue
+            break
+
+        wait = time.perf_counter() - start
+        with self._cond:
+            self._stats['checkouts'] += 1
+            self._stats['in_use'] += 1
+            self._stats['peak_in_use'] = max(self._stats['peak_in_use'], self._stats['in_use'])
+            if waited:
+                self._stats['waits'] += 1
+            self._stats['total_wait'] += wait
+            self._stats['max_wait'] = max(self._stats['max_wait'], wait)
+        return conn
+
+    def release(self, conn, discard=False):
+        now = time.monotonic()
+        expired = []
+        with self._cond:
+            self._stats['in_use'] -= 1
+            if discard or self._closed:
+                self._size -= 1
+                self._created_at.pop(id(conn), None)
+                self._stats['discarded'] += 1
+                expired.append(conn)
+            else:
+                created_at = self._created_at.get(id(conn), now)
+                self._idle.append((conn, threading.get_ident(), now, created_at))
+            if self.max_idle_time is not None:
+                keep = []
+                for entry in self._idle:
+                    if now - entry[2] > self.max_idle_time:
+                        self._size -= 1
+                        self._created_at.pop(id(entry[0]), None)
+                        self._stats['recycled'] += 1
+                        expired.append(entry[0])
+                    else:
+                        keep.append(entry)
+                self._idle = keep
+            self._cond.notify_all() if expired else self._cond.notify()
+        for old in expired:
+            try:
+                old.close()
+            except Exception as e:
+                logger.warning(f"{self.name} bağlantısı kapatılamadı: {e}")
+
+    @contextmanager
+    def connection(self):
+        conn = self.acquire()
+        discard = False
+        try:
+            yield conn
+        except BaseException:
+            discard = not self._safe_rollback(conn)
+            raise
+        else:
+            discard = not self._reset(conn)
+        finally:
+            self.release(conn, discard=discard)
+
+    def _safe_rollback(self, conn):
+        try:
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    def _reset(self, conn):
+        # Commit edilmemiş iş bir sonraki kullanıcıya sızmasın
+        if getattr(conn, 'in_transaction', False):
+            return self._safe_rollback(conn)
+        return True
+
+    def stats(self):
+        with self._cond:
+            data = dict(self._stats)
+            data['size'] = self._size
+            data['idle'] = len(self._idle)
+            data['max_size'] = self.max_size
+        data['avg_wait'] = data['total_wait'] / data['checkouts'] if data['checkouts'] else 0.0
+        return data
+
+    def clear(self):
+        """Boştaki bağlantıları kapat; havuz kullanılmaya devam eder"""
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            for conn, *_ in idle:
+                self._created_at.pop(id(conn), None)
+            self._cond.notify_all()
+        for conn, *_ in idle:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def close_all(self):
+        with self._cond:
+            self._closed = True
+        self.clear()
+
+# =============================================================================
+# SORGU ÖLÇÜMÜ
+# =============================================================================
+
+_FP_COMMENT_RE = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+_FP_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_FP_NUMBER_RE = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?![\w.])")
+_FP_PLACEHOLDER_RE = re.compile(r"%s|\?")
+_FP_IN_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_FP_VALUES_RE = re.compile(r"(VALUES\s*\(\?\+?\))(?:\s*,\s*\(\?\+?\))+", re.I)
+_FP_SPACE_RE = re.compile(r"\s+")
+
+@functools.lru_cache(maxsize=2048)
+def query_fingerprint(query):
+    """Sabitleri ve yer tutucuları '?' ile değiştirip ifadeyi normalize et.
+
+    Aynı ifadenin farklı parametrelerle çalışmaları (ve farklı uzunluktaki
+    IN listeleri) tek parmak izinde toplanır.
+    """
+    text = _FP_COMMENT_RE.sub(" ", query)
+    text = _FP_STRING_RE.sub("?", text)
+    text = _FP_NUMBER_RE.sub("?", text)
+    text = _FP_PLACEHOLDER_RE.sub("?", text)
+    text = _FP_IN_LIST_RE.sub("(?+)", text)
+    text = _FP_VALUES_RE.sub(r"\1", text)
+    return _FP_SPACE_RE.sub(" ", text).strip()
+
+
+class QueryStats:
+    """Süreç ömrü boyunca parmak izi başına toplanan sorgu istatistikleri"""
+
+    def __init__(self, max_fingerprints=500):
+        self.max_fingerprints = max_fingerprints
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.started_at = datetime.now()
+
+    def record(self, query, elapsed, rows=0, nbytes=0, wait=0.0, error=False):
+        fingerprint = query_fingerprint(query)
+        slow = elapsed * 1000 >= QUERY_STATS_CONFIG['slow_query_ms']
+        with self._lock:
+            entry = self._entries.get(fingerprint)
+            if entry is None:
+                if len(self._entries) >= self.max_fingerprints:
+                    # En az toplam süreli ifade yer açar
+                    victim = min(self._entries, key=lambda fp: self._entries[fp]['total_time'])
+                    del self._entries[victim]
+                entry = self._entries[fingerprint] = {
+                    'fingerprint': fingerprint, 'calls': 0, 'errors': 0, 'slow': 0,
+                    'total_time': 0.0, 'max_time': 0.0, 'rows': 0, 'bytes': 0,
+                    'wait_time': 0.0, 'plan': None,
+                }
+            entry['calls'] += 1
+            entry['total_time'] += elapsed
+            entry['max_time'] = max(entry['max_time'], elapsed)
+            entry['rows'] += rows or 0
+            entry['bytes'] += nbytes or 0
+            entry['wait_time'] += wait
+            if error:
+                entry['errors'] += 1
+            if slow:
+                entry['slow'] += 1
+            needs_plan = slow and entry['plan'] is None
+        return slow, needs_plan
+
+    def set_plan(self, query, plan):
+        with self._lock:
+            entry = self._entries.get(query_fingerprint(query))
+            if entry is not None:
+                entry['plan'] = plan
+
+    def top(self, limit=20, key='total_time'):
+        with self._lock:
+            entries = [dict(entry) for entry in self._entries.values()]
+        entries.sort(key=lambda entry: entry[key], reverse=True)
+        return entries[:limit]
+
+    def reset(self):
+        with self._lock:
+            self._entries.clear()
+            self.started_at = datetime.now()
+
+
+query_stats = QueryStats(QUERY_STATS_CONFIG['max_fingerprints'])
+
+_slow_logger = None
+
+def _get_slow_logger():
+    global _slow_logger
+    if _slow_logger is None:
+        slow_logger = logging.getLogger("effinova.slow_query")
+        if not slow_logger.handlers:
+            log_dir = os.path.join(BASE_DIR, "logs")
+            os.makedirs(log_dir, exist_ok=True)
+            handler = logging.handlers.RotatingFileHandler(
+                os.path.join(log_dir, "slow_queries.log"), maxBytes=5 * 1024 * 1024,
+                backupCount=3, encoding="utf-8",
+            )
+            handler.setFormatter(logging.Formatter('%(asctime)s - %(message)s'))
+            slow_logger.addHandler(handler)
+            slow_logger.setLevel(logging.INFO)
+        _slow_logger = slow_logger
+    return _slow_logger
+
+def record_query(query, params, elapsed, rows=0, nbytes=0, wait=0.0, error=False):
+    """Ölçümü kaydet; eşiği aşan ifadeyi yavaş sorgu günlüğüne yaz"""
+    if not QUERY_STATS_CONFIG['enabled']:
+        return
+    slow, needs_plan = query_stats.record(query, elapsed, rows, nbytes, wait, error)
+    if not slow:
+        return
+    plan = None
+    # Plan parmak izi başına bir kez çıkarılır; yazma ifadeleri çalıştırılmaz
+    if (needs_plan and QUERY_STATS_CONFIG['explain_slow'] and DATABASE_TYPE != 'mysql'
+            and not error and is_read_only_query(query)):
+        try:
+            plan = explain_query(query, params or ())
+            query_stats.set_plan(query, plan)
+        except Exception as e:
+            logger.warning(f"Yavaş sorgu planı alınamadı: {e}")
+    message = (f"{elapsed * 1000:.1f} ms | bekleme {wait * 1000:.1f} ms | {rows or 0} satır | "
+               f"{query_fingerprint(query)}")
+    if plan:
+        message += " | plan: " + "; ".join(plan)
+    _get_slow_logger().info(message)
+
+@contextmanager
+def track_query(query, params=None):
+    """İfadeyi ölç. Çağıran `sample` sözlüğüne satır/bayt/bekleme yazar"""
+    sample = {'rows': 0, 'bytes': 0, 'wait': 0.0}
+    start = time.perf_counter()
+    error = False
+    try:
+        yield sample
+    except Exception:
+        error = True
+        raise
+    finally:
+        record_query(query, params, time.perf_counter() - start,
+                     sample['rows'], sample['bytes'], sample['wait'], error)
+
+def dataframe_nbytes(df, sample_rows=1000):
+    """DataFrame'in bellekte kapladığı yaklaşık bayt (metin sütunları dahil).
+
+    `deep=True` her hücreyi dolaştığı için büyük sonuçlarda ilk
+    `sample_rows` satırın ortalamasından tahmin edilir. Category
+    sütunlarında sözlük bir kez, kodlar satır başına sayılır.
+    """
+    try:
+        if len(df) <= sample_rows:
+            return int(df.memory_usage(index=False, deep=True).sum())
+        sample = df.iloc[:sample_rows]
+        total = 0
+        for position in range(df.shape[1]):
+            column = df.iloc[:, position]
+            if isinstance(column.dtype, pd.CategoricalDtype):
+                total += column.cat.codes.nbytes + column.cat.categories.memory_usage(deep=True)
+            else:
+                total += sample.iloc[:, position].memory_usage(index=False, deep=True) * len(df) / sample_rows
+        return int(total)
+    except Exception:
+        return 0
+
+# =============================================================================
+# TABLO SÜRÜMLÜ ÖNBELLEK
+# =============================================================================
+
+# Tetikleyicilerle güncellenen tablolar: kaynağa yazmak bunları da eskitir
+DERIVED_TABLES = {
+    'process_scores': ('employee_score_summary',),
+    'employees': ('employees_fts',),
+}
+
+_WRITE_TABLE_RE = re.compile(
+    r"^\s*(?:INSERT(?:\s+OR\s+\w+)?(?:\s+IGNORE)?\s+INTO|REPLACE\s+INTO|UPDATE(?:\s+OR\s+\w+)?"
+    r"|DELETE\s+FROM)\s+[`\"]?(\w+)",
+    re.I,
+)
+
+@functools.lru_cache(maxsize=1024)
+def written_tables(query):
+    """İfadenin yazdığı tablolar (türetilmişler dahil); çözümlenemezse None"""
+    match = _WRITE_TABLE_RE.match(query)
+    if not match:
+        return None
+    table = match.group(1).lower()
+    return (table,) + DERIVED_TABLES.get(table, ())
+
+
+class TableVersions:
+    """Tablo başına yazma sayacı; önbellek anahtarları bu sürümleri içerir"""
+
+    def __init__(self):
+        self._versions = {}
+        self._epoch = 0
+        self._lock = threading.Lock()
+        self._listeners = {}   # tablo -> [önbellek]
+
+    def get(self, tables):
+        with self._lock:
+            return (self._epoch,) + tuple(self._versions.get(table, 0) for table in tables)
+
+    def subscribe(self, tables, cache):
+        with self._lock:
+            for table in tables:
+                self._listeners.setdefault(table, []).append(cache)
+
+    def bump(self, tables):
+        with self._lock:
+            for table in tables:
+                self._versions[table] = self._versions.get(table, 0) + 1
+            caches = {id(c): c for table in tables for c in self._listeners.get(table, ())}
+        for cache in caches.values():
+            cache.purge_stale()
+
+    def bump_all(self):
+        with self._lock:
+            self._epoch += 1
+            caches = {id(c): c for listeners in self._listeners.values() for c in listeners}
+        for cache in caches.values():
+            cache.purge_stale()
+
+
+table_versions = TableVersions()
+_versioned_caches = {}   # (modül, ad) -> VersionedCache
+
+def note_write(query, rowcount=None):
+    """Commit edilmiş yazmadan sonra etkilenen tabloların sürümünü artır.
+
+    Hiç satır değiştirmeyen yazmalar (ör. INSERT OR IGNORE) sürüm artırmaz;
+    tablosu çözümlenemeyen ifadeler (DDL, PRAGMA...) tüm önbellekleri eskitir.
+    """
+    if rowcount == 0:
+        return
+    tables = written_tables(query)
+    if tables is None:
+        table_versions.bump_all()
+    else:
+        table_versions.bump(tables)
+
+def invalidate_tables(*tables):
+    """Sürüm takibi dışında (ör. başka bir süreçte) değişen tabloları eskit"""
+    if tables:
+        table_versions.bump(tables)
+    else:
+        table_versions.bump_all()
+
+
+class VersionedCache:
+    """Okuduğu tabloların sürümüne bağlı, LRU sınırlı sonuç önbelleği.
+
+    Yazma o tablonun sürümünü artırır; eski sürümle hesaplanmış girdiler
+    hemen atılır, diğer tablolara bağlı önbellekler etkilenmez. `ttl`
+    yalnızca bu sürecin görmediği yazmalar (ör. manage.py) için güvenlik
+    ağıdır. Dönen nesneler paylaşılır; çağıranlar değiştirmemelidir.
+    """
+
+    def __init__(self, func, tables, maxsize=128, max_bytes=None, ttl=None):
+        self.func = func
+        self.tables = tuple(tables)
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()   # anahtar -> (sürümler, değer, bayt, zaman)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'invalidations': 0}
+        functools.update_wrapper(self, func)
+        table_versions.subscribe(self.tables, self)
+
+    @staticmethod
+    def _sizeof(value):
+        if isinstance(value, pd.DataFrame):
+            return dataframe_nbytes(value)
+        if isinstance(value, dict):
+            return sum(VersionedCache._sizeof(v) for v in value.values())
+        if isinstance(value, (list, tuple)):
+            return sum(VersionedCache._sizeof(v) for v in value[:100]) * max(1, len(value) // 100)
+        return 64
+
+    @staticmethod
+    def _frames(value):
+        if isinstance(value, pd.DataFrame):
+            return [value]
+        if isinstance(value, dict):
+            return [v for v in value.values() if isinstance(v, pd.DataFrame)]
+        return []
+
+    def frames(self):
+        """Önbellekteki DataFrame'ler: (çağrı argümanları, DataFrame) çiftleri"""
+        with self._lock:
+            entries = [(key, entry[1]) for key, entry in self._entries.items()]
+        result = []
+        for (args, kwargs), value in entries:
+            label = ", ".join([repr(a) for a in args] + [f"{k}={v!r}" for k, v in kwargs])
+            result.extend((label, frame) for frame in self._frames(value))
+        return result
+
+    def _drop(self, key):
+        _, _, nbytes, _ = self._entries.pop(key)
+        self._bytes -= nbytes
+
+    def __call__(self, *args, **kwargs):
+        key = (args, tuple(sorted(kwargs.items())))
+        versions = table_versions.get(self.tables)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] == versions and (self.ttl is None or now - entry[3] < self.ttl):
+                    self._entries.move_to_end(key)
+                    self.stats['hits'] += 1
+                    return entry[1]
+                self._drop(key)
+                self.stats['invalidations'] += 1
+            self.stats['misses'] += 1
+
+        # Sürümler çalıştırmadan önce alınır: arada gelen yazma girdiyi zaten eskitir
+        value = self.func(*args, **kwargs)
+        nbytes = self._sizeof(value) if self.max_bytes else 0
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (versions, value, nbytes, now)
+            self._bytes += nbytes
+            while self._entries and (len(self._entries) > self.maxsize
+                                     or (self.max_bytes and self._bytes > self.max_bytes)):
+                self._drop(next(iter(self._entries)))
+                self.stats['evictions'] += 1
+        return value
+
+    def purge_stale(self):
+        versions = table_versions.get(self.tables)
+        with self._lock:
+            stale = [key for key, entry in self._entries.items() if entry[0] != versions]
+            for key in stale:
+                self._drop(key)
+            self.stats['invalidations'] += len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def info(self):
+        with self._lock:
+            data = dict(self.stats)
+            data['size'] = len(self._entries)
+            data['bytes'] = self._bytes
+            reports = [frame.attrs.get('dtype_policy') for entry in self._entries.values()
+                       for frame in self._frames(entry[1])]
+        data['saved_bytes'] = sum(r['before'] - r['after'] for r in reports if r)
+        calls = data['hits'] + data['misses']
+        data['hit_rate'] = data['hits'] / calls if calls else 0.0
+        return data
 
-    SQLiteSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=SQLITE_ENGINE)
+
+def versioned_cache(tables, maxsize=128, max_bytes=None, ttl=None):
+    """Sonucu `tables` sürümlerine bağlı olarak önbelleğe alan dekoratör.
+
+    Streamlit her rerun'da script'i yeniden çalıştırır; aynı modül/ad ile
+    tekrar tanımlanan fonksiyon mevcut önbelleği (ve girdilerini) devralır.
+    """
+    def decorator(func):
+        key = (func.__module__, func.__qualname__)
+        cache = _versioned_caches.get(key)
+        if cache is None or cache.tables != tuple(tables):
+            cache = _versioned_caches[key] = VersionedCache(func, tables, maxsize, max_bytes, ttl)
+        else:
+            cache.func = func
+        return cache
+    return decorator
+
+def cache_stats():
+    """Tüm sürümlü önbelleklerin isabet/boyut istatistikleri"""
+    return {name: cache.info() for (_, name), cache in _versioned_caches.items()}
+
+def cache_frame_report():
+    """Önbellekteki her DataFrame için satır, bellek ve tür politikasının kazandırdığı bayt"""
+    report = []
+    for (_, name), cache in _versioned_caches.items():
+        for key, frame in cache.frames():
+            before, after = _dtype_policy_bytes(frame)
+            report.append({'cache': name, 'key': key, 'rows': len(frame), 'columns': len(frame.columns),
+                           'bytes': after, 'saved_bytes': before - after})
+    return report
 
 # =============================================================================
-# SQLALCHEMY ORM MODELLER
+# DATAFRAME TÜR POLİTİKASI
 # =============================================================================
 
-if SQLALCHEMY_AVAILABLE:
-    class User(Base):
-        __tablename__ = 'users'
-        id = Column(Integer, primary_key=True, autoincrement=True)
-        username = Column(String(50), unique=True, nullable=False)
-        password = Column(String(255), nullable=False)
-        role = Column(String(20), default='calisan')
-        email = Column(String(100))
-        score = Column(Integer, default=0)
-        last_login = Column(DateTime)
-        token = Column(String(255))
-        employee_sicil_no = Column(String(20))
-        department = Column(String(100))
-        deleted = Column(Boolean, default=False)
-        created_at = Column(DateTime, default=datetime.now)
-
-    class Employee(Base):
-        __tablename__ = 'employees'
-        id = Column(Integer, primary_key=True, autoincrement=True)
-        Ad_Soyad = Column(String(100), nullable=False)
-        Pozisyon = Column(String(100), nullable=False)
-        Departman = Column(String(100), nullable=False)
-        Yonetici_Adi = Column(String(100))
-        IK_Yonetici_Adi = Column(String(100))
-        Email = Column(String(100))
-        Sicil_No = Column(String(20), unique=True, nullable=False)
-        İşe_Giriş_Tarihi = Column(Date)
-        Telefon = Column(String(20))
-        Adres = Column(Text)
-        Dogum_Tarihi = Column(Date)
-        Egitim = Column(Text)
-        Sertifikalar = Column(Text)
-        Yetenekler = Column(Text)
-        deleted = Column(Boolean, default=False)
-        created_at = Column(DateTime, default=datetime.now)
-        updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
-
-    class Process(Base):
-        __tablename__ = 'processes'
-        id = Column(Integer, primary_key=True, autoincrement=True)
-        process_name = Column(String(200), nullable=False)
-        description = Column(Text)
-        department = Column(String(100))
-        created_at = Column(DateTime, default=datetime.now)
-        score = Column(Integer, default=0)
-        weight = Column(Float, default=1.0)
-        deleted = Column(Boolean, default=False)
-
-    class ProcessScore(Base):
-        __tablename__ = 'process_scores'
-        id = Column(Integer, primary_key=True, autoincrement=True)
-        process_id = Column(Integer, ForeignKey('processes.id'))
-        employee_name = Column(String(100), nullable=False)
-        employee_sicil_no = Column(String(20))
-        cikti = Column(Integer, default=0)
-        kalite = Column(Integer, default=0)
-        strateji = Column(Integer, default=0)
-        inovasyon = Column(Integer, default=0)
-        zaman = Column(Float, default=0)
-        ekstra = Column(Integer, default=0)
-        ekstra_aciklama = Column(Text)
-        toplam_skor = Column(Float, default=0)
-        tarih = Column(Date, default=date.today())
-        onay = Column(String(50), default='Beklemede')
-        created_at = Column(DateTime, default=datetime.now)
-        process = relationship("Process", backref="scores")
-
-    class InnovationIdea(Base):
-        __tablename__ = 'innovation_ideas'
-        id = Column(Integer, primary_key=True, autoincrement=True)
-        employee_sicil_no = Column(String(20))
-        employee_name = Column(String(100), nullable=False)
-        idea = Column(Text, nullable=False)
-        description = Column(Text)
-        category = Column(String(100))
-        created_at = Column(Date, default=date.today())
-        status = Column(String(50), default='Beklemede')
-        score = Column(Integer, default=0)
-        reviewed_by = Column(String(50))
-        reviewed_at = Column(DateTime)
-
-    class Project(Base):
-        __tablename__ = 'projects'
-        id = Column(Integer, primary_key=True, autoincrement=True)
-        name = Column(String(200), nullable=False)
-        description = Column(Text)
-        start_date = Column(Date, default=date.today())
-        end_date = Column(Date, default=date.today())
-        status = Column(String(50), default='Planning')
-        budget = Column(Float, default=0)
-        manager_sicil_no = Column(String(20))
-        created_at = Column(DateTime, default=datetime.now)
+# Şema bilgisi eşleşmeyen takma adlarda (ör. son_tarih) tarih sütunu ipucu
+_DATETIME_NAME_RE = re.compile(r"tarih|_at$|_date$|^timestamp$", re.I)
+_ARROW_STRINGS_AVAILABLE = is_available("pyarrow")
+_schema_dtype_families = None
+
+def _sql_type_family(sql_type):
+    """Bildirilen SQL türünü politika ailesine çevir (SQLite tür yakınlığı sırasıyla)"""
+    sql_type = (sql_type or "").upper()
+    if "INT" in sql_type:
+        return 'integer'
+    if "DATE" in sql_type or "TIME" in sql_type:
+        return 'datetime'
+    if any(token in sql_type for token in ("CHAR", "TEXT", "CLOB", "ENUM")):
+        return 'text'
+    if any(token in sql_type for token in ("REAL", "FLOA", "DOUB", "DEC", "NUM")):
+        return 'float'
+    return None
+
+def schema_dtype_families():
+    """Şemadaki sütun adı (küçük harf) -> tür ailesi.
+
+    Aynı ad farklı tablolarda farklı ailedeyse ad eşlemeden çıkarılır ve
+    sütunun pandas türüne bakılır. Sonuç migrasyonlara kadar saklanır.
+    """
+    global _schema_dtype_families
+    if _schema_dtype_families is not None:
+        return _schema_dtype_families
+    if DATABASE_TYPE == 'mysql':
+        query = """
+            SELECT TABLE_NAME AS table_name, COLUMN_NAME AS column_name, DATA_TYPE AS column_type
+            FROM information_schema.COLUMNS WHERE TABLE_SCHEMA = DATABASE()
+        """
+    else:
+        query = """
+            SELECT m.name AS table_name, p.name AS column_name, p.type AS column_type
+            FROM sqlite_master m JOIN pragma_table_info(m.name) p
+            WHERE m.type = 'table' AND m.name NOT LIKE 'sqlite_%'
+        """
+    try:
+        rows = fetch_dicts(query)
+    except Exception as e:
+        logger.warning(f"Şema sütun türleri okunamadı, yalnızca pandas türleri kullanılacak: {e}")
+        return {}
+
+    families, conflicts = {}, set()
+    for row in rows:
+        name = row['column_name'].lower()
+        family = _sql_type_family(row['column_type'])
+        if families.setdefault(name, family) != family:
+            conflicts.add(name)
+    for name in conflicts:
+        families.pop(name)
+    _schema_dtype_families = families
+    return families
+
+def _column_family(name, column, families):
+    family = families.get(str(name).lower())
+    if family:
+        return family
+    if pd.api.types.is_integer_dtype(column):
+        return 'integer'
+    if pd.api.types.is_float_dtype(column):
+        return 'float'
+    if column.dtype == object:
+        return 'datetime' if _DATETIME_NAME_RE.search(str(name)) else 'text'
+    return None
+
+def _convert_column(column, family, policy):
+    """Sütunu politikaya göre dönüştür; uygun değilse aynı nesneyi döndür"""
+    if family == 'integer' and pd.api.types.is_integer_dtype(column):
+        return pd.to_numeric(column, downcast='integer')
+
+    if family in ('integer', 'float') and policy['downcast_floats']:
+        if column.dtype == object:
+            # MySQL DECIMAL sütunları Decimal nesnesi olarak gelir
+            try:
+                column = pd.to_numeric(column)
+            except (TypeError, ValueError):
+                return column
+        if pd.api.types.is_float_dtype(column) and column.dtype != 'float32':
+            narrow = column.astype('float32')
+            error = (narrow.astype('float64') - column).abs()
+            if (error.isna() == column.isna()).all() and (error <= column.abs() * 1e-6).all():
+                return narrow
+        return column
+
+    if column.dtype != object:
+        return column
+    values = column.dropna()
+    if values.empty:
+        return column
+
+    if family == 'datetime':
+        # SQLite ISO metin, MySQL date/datetime nesnesi döndürür
+        iso = isinstance(values.iloc[0], str)
+        parsed = pd.to_datetime(column, errors='coerce', format='ISO8601' if iso else None)
+        return parsed if parsed.notna().sum() == len(values) else column
+
+    if family == 'text' and pd.api.types.infer_dtype(values, skipna=False) == 'string':
+        if (len(column) >= policy['category_min_rows']
+                and values.nunique() <= len(column) * policy['category_max_ratio']):
+            return column.astype('category')
+        if policy['arrow_strings'] and _ARROW_STRINGS_AVAILABLE:
+            return column.astype('string[pyarrow]')
+    return column
+
+def apply_dtype_policy(df, **overrides):
+    """DataFrame sütunlarını şemadan türetilen politikaya göre daralt.
+
+    Düşük kardinaliteli metinler category, tamsayılar en küçük tamsayı türü,
+    REAL skorlar float32, tarih sütunları datetime64 olur; istenirse kalan
+    metinler Arrow destekli string'e çevrilir. Kaynak DataFrame değiştirilmez.
+    Önceki/sonraki bellek `df.attrs['dtype_policy']` içinde tutulur.
+    """
+    policy = {**DTYPE_POLICY_CONFIG, **overrides}
+    if not policy['enabled'] or df.empty:
+        return df
+    families = schema_dtype_families()
+    before = dataframe_nbytes(df)
+    result = df.copy(deep=False)
+    for position, name in enumerate(df.columns):
+        column = df.iloc[:, position]
+        converted = _convert_column(column, _column_family(name, column, families), policy)
+        if converted is not column:
+            result.isetitem(position, converted)
+    result.attrs['dtype_policy'] = {'before': before, 'after': dataframe_nbytes(result)}
+    return result
+
+def _dtype_policy_bytes(df):
+    """(politika öncesi, şimdiki) bayt; politika uygulanmamışsa ikisi eşittir"""
+    report = df.attrs.get('dtype_policy')
+    if report:
+        return report['before'], report['after']
+    nbytes = dataframe_nbytes(df)
+    return nbytes, nbytes
 
 # =============================================================================
 # VERİTABANI YÖNETİM SINIFLARI
 # =============================================================================
 
 class MySQLManager:
-    def __init__(self):
+    def __init__(self, pool_size=None):
         if not MYSQL_AVAILABLE:
             return
-        self.connection = None
-        self.cursor = None
+        cfg = MYSQL_POOL_CONFIG
+        self.pool = ConnectionPool(
+            self._open_connection,
+            pool_size or cfg['pool_size'],
+            cfg['checkout_timeout'],
+            name="mysql",
+            validate=self._ping,
+            health_check_interval=cfg['health_check_interval'],
+            max_idle_time=cfg['max_idle_time'],
+            max_lifetime=cfg['max_lifetime'],
+        )
+
+    def _open_connection(self):
+        return mysql_connector.connect(**MYSQL_CONFIG)
+
+    @staticmethod
+    def _ping(conn):
+        try:
+            conn.ping(reconnect=False, attempts=1)
+            return True
+        except mysql_connector.Error:
+            return False
+
+    @contextmanager
+    def get_connection(self, readonly=False):
+        with self.pool.connection() as conn:
+            yield conn
+
+    def pool_stats(self):
+        return {'mysql': self.pool.stats()}
+
+    def read_capacity(self):
+        """Aynı anda çalışabilecek okuma sorgusu sayısı (havuz yazmalarla ortak)"""
+        return self.pool.max_size if MYSQL_AVAILABLE else 1
 
     def connect(self):
+        """Havuzdan sağlıklı bir bağlantı alınabildiğini doğrula"""
         if not MYSQL_AVAILABLE:
             st.error("MySQL connector kurulu değil!")
             logger.error("MySQL connector kurulu değil!")
             return False
         try:
-            self.connection = mysql.connector.connect(**MYSQL_CONFIG)
-            self.cursor = self.connection.cursor(dictionary=True, buffered=True)
+            with self.get_connection() as conn:
+                if not self._ping(conn):
+                    raise mysql_connector.Error("ping başarısız")
             logger.info("MySQL bağlantısı başarılı.")
             return True
-        except Error as e:
+        except mysql_connector.Error as e:
             st.error(f"MySQL bağlantı hatası: {e}")
             logger.error(f"MySQL bağlantı hatası: {e}")
-            self.connection = None
             return False
         except Exception as e:
             st.error(f"MySQL bağlantısı bilinmeyen bir hata nedeniyle başarısız: {e}")
             logger.error(f"MySQL bağlantısı bilinmeyen bir hata nedeniyle başarısız: {e}")
-            self.connection = None
             return False
 
     def disconnect(self):
+        """Boştaki havuz bağlantılarını kapat"""
         if not MYSQL_AVAILABLE:
             return
         try:
-            if self.cursor:
-                self.cursor.close()
-                self.cursor = None
-            if self.connection and self.connection.is_connected():
-                self.connection.close()
-                self.connection = None
-                logger.info("MySQL bağlantısı kapatıldı.")
+            self.pool.clear()
+            logger.info("MySQL bağlantıları kapatıldı.")
         except Exception as e:
             logger.error(f"MySQL disconnect error: {e}")
 
+    def close(self):
+        if MYSQL_AVAILABLE:
+            self.pool.close_all()
+
     def execute_query(self, query, params=None, fetch=True):
         if not MYSQL_AVAILABLE:
             logger.error("MySQL mevcut değil, sorgu çalıştırılamaz.")
             return None
         try:
-            if not self.connection or not self.connection.is_connected():
-                logger.info("MySQL bağlantısı kesilmiş, yeniden bağlanılıyor.")
-                if not self.connect():
-                    return None
-
-            self.cursor.execute(query, params or ())
-
-            if fetch:
-                result = self.cursor.fetchall()
-                return result
-            else:
-                if not MYSQL_CONFIG.get('autocommit', False):
-                    self.connection.commit()
-                return self.cursor.rowcount
+            with track_query(query, params) as sample:
+                requested = time.perf_counter()
+                with self.get_connection() as conn:
+                    sample['wait'] = time.perf_counter() - requested
+                    cursor = conn.cursor(dictionary=True)
+                    try:
+                        cursor.execute(query, params or ())
+                        if fetch:
+                            result = cursor.fetchall()
+                            sample['rows'] = len(result)
+                            return result
+                        if not MYSQL_CONFIG.get('autocommit', False):
+                            conn.commit()
+                        note_write(query, cursor.rowcount)
+                        sample['rows'] = cursor.rowcount
+                        return cursor.rowcount
+                    finally:
+                        cursor.close()
 
-        except Error as e:
+        except mysql_connector.Error as e:
             st.error(f"MySQL sorgu hatası: {e}")
             logger.error(f"MySQL sorgu hatası (SQL: {query[:100]}..., Params: {params}): {e}")
-            if self.connection and not MYSQL_CONFIG.get('autocommit', False):
-                self.connection.rollback()
             return None
         except Exception as e:
             st.error(f"MySQL genel sorgu hatası: {e}")
             logger.error(f"MySQL genel sorgu hatası (SQL: {query[:100]}..., Params: {params}): {e}")
             return None
 
+    def run_write_batch(self, groups):
+        """[(query, [params, ...]), ...] gruplarını tek transaction'da çalıştır.
+
+        Her grup için etkilenen satır sayısını döndürür; hata durumunda
+        tüm batch geri alınır ve hata yükseltilir.
+        """
+        requested = time.perf_counter()
+        with self.get_connection() as conn:
+            wait = time.perf_counter() - requested
+            if conn.autocommit:
+                conn.start_transaction()
+            cursor = conn.cursor()
+            try:
+                rowcounts = []
+                for query, param_rows in groups:
+                    with track_query(query, param_rows[0]) as sample:
+                        sample['wait'], wait = wait, 0.0
+                        if len(param_rows) == 1:
+                            cursor.execute(query, param_rows[0] or ())
+                        else:
+                            cursor.executemany(query, param_rows)
+                        sample['rows'] = cursor.rowcount
+                    rowcounts.append(cursor.rowcount)
+                with track_query("COMMIT"):
+                    conn.commit()
+                for (query, _), rowcount in zip(groups, rowcounts):
+                    note_write(query, rowcount)
+                return rowcounts
+            finally:
+                cursor.close()
+
     def get_dataframe(self, query, params=None):
         if not MYSQL_AVAILABLE:
             logger.error("MySQL mevcut değil, DataFrame alınamaz.")
             return pd.DataFrame()
         try:
-            if not self.connection or not self.connection.is_connected():
-                logger.info("MySQL bağlantısı kesilmiş, yeniden bağlanılıyor.")
-                if not self.connect():
-                    return pd.DataFrame()
-
-            return pd.read_sql(query, self.connection, params=params)
+            with track_query(query, params) as sample:
+                requested = time.perf_counter()
+                with self.get_connection(readonly=True) as conn:
+                    sample['wait'] = time.perf_counter() - requested
+                    df = pd.read_sql(query, conn, params=params)
+                sample['rows'] = len(df)
+                sample['bytes'] = dataframe_nbytes(df)
+                return df
         except Exception as e:
             st.error(f"MySQL DataFrame hatası: {e}")
             logger.error(f"MySQL DataFrame hatası (SQL: {query[:100]}..., Params: {params}): {e}")
             return pd.DataFrame()
 
+    def iter_dataframe(self, query, params=None, chunk_size=None):
+        """Sonucu DataFrame parçaları halinde akıt (tamponsuz, sunucu tarafı cursor).
+
+        Bağlantı iterator boyunca havuzdan alınmış kalır. Iterator erken
+        kapatılırsa okunmamış satırlar bağlantıda kalacağı için bağlantı
+        havuza geri konmaz, kapatılır.
+        """
+        if not MYSQL_AVAILABLE:
+            logger.error("MySQL mevcut değil, DataFrame alınamaz.")
+            return
+        chunk_size = chunk_size or DATAFRAME_CHUNK_SIZE
+        requested = time.perf_counter()
+        conn = self.pool.acquire()
+        # Ölçüm yalnızca veritabanında geçen süreyi sayar, tüketicinin işini değil
+        sample = {'rows': 0, 'bytes': 0, 'wait': time.perf_counter() - requested}
+        db_time = 0.0
+        finished = False
+        error = False
+        try:
+            started = time.perf_counter()
+            cursor = conn.cursor(buffered=False)
+            cursor.execute(query, params or ())
+            columns = [d[0] for d in cursor.description]
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    db_time += time.perf_counter() - started
+                    break
+                df = pd.DataFrame.from_records(rows, columns=columns, coerce_float=True)
+                db_time += time.perf_counter() - started
+                sample['rows'] += len(df)
+                sample['bytes'] += dataframe_nbytes(df)
+                yield df
+                started = time.perf_counter()
+            cursor.close()
+            if conn.in_transaction:
+                conn.rollback()
+            finished = True
+        except mysql_connector.Error as e:
+            error = True
+            logger.error(f"MySQL DataFrame akış hatası (SQL: {query[:100]}..., Params: {params}): {e}")
+            raise
+        finally:
+            self.pool.release(conn, discard=not finished)
+            record_query(query, params, db_time, sample['rows'], sample['bytes'], sample['wait'], error)
+
+def open_sqlite_connection(path=None, readonly=False):
+    """Yeni SQLite bağlantısı aç ve PRAGMA'ları bir kez uygula (havuzlar ve SQLAlchemy motoru için)"""
+    cfg = SQLITE_POOL_CONFIG
+    conn = sqlite3.connect(path or SQLITE_DB_PATH, check_same_thread=False, timeout=cfg['busy_timeout_ms'] / 1000)
+    conn.execute(f"PRAGMA busy_timeout = {int(cfg['busy_timeout_ms'])}")
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.execute(f"PRAGMA mmap_size = {int(cfg['mmap_size'])}")
+    conn.execute(f"PRAGMA cache_size = -{int(cfg['cache_size_kb'])}")
+    conn.execute(f"PRAGMA temp_store = {cfg['temp_store']}")
+    if readonly:
+        conn.execute("PRAGMA query_only = ON")
+    return conn
+
 class SQLiteManager:
     def __init__(self):
         self.db_path = SQLITE_DB_PATH
         self.ensure_directories()
+        self.read_pool = ConnectionPool(
+            lambda: self._open_connection(readonly=True),
+            SQLITE_POOL_CONFIG['max_connections'],
+            SQLITE_POOL_CONFIG['checkout_timeout'],
+            name="sqlite-read",
+        )
+        self.write_pool = ConnectionPool(
+            lambda: self._open_connection(readonly=False),
+            SQLITE_POOL_CONFIG['max_write_connections'],
+            SQLITE_POOL_CONFIG['checkout_timeout'],
+            name="sqlite-write",
+        )
 
     def ensure_directories(self):
         dirs_to_create = ["uploads", "logs", "exports"]
@@ -283,54 +1147,137 @@ class SQLiteManager:
                 os.makedirs(dir_path)
                 logger.info(f"Klasör oluşturuldu: {dir_path}")
 
+    def _open_connection(self, readonly=False):
+        return open_sqlite_connection(self.db_path, readonly)
+
     @contextmanager
-    def get_connection(self):
-        conn = None
+    def get_connection(self, readonly=False):
+        pool = self.read_pool if readonly else self.write_pool
         try:
-            conn = sqlite3.connect(self.db_path, check_same_thread=False)
-            conn.execute("PRAGMA foreign_keys = ON")
-            yield conn
+            with pool.connection() as conn:
+                yield conn
         except sqlite3.Error as e:
             logger.error(f"SQLite bağlantı hatası: {e}")
-            if conn:
-                conn.rollback()
             raise
         except Exception as e:
             logger.error(f"SQLite bilinmeyen bağlantı hatası: {e}")
-            if conn:
-                conn.rollback()
             raise
-        finally:
-            if conn:
-                conn.close()
+
+    def pool_stats(self):
+        return {'read': self.read_pool.stats(), 'write': self.write_pool.stats()}
+
+    def read_capacity(self):
+        """Aynı anda çalışabilecek okuma sorgusu sayısı (WAL'de okumalar birbirini beklemez)"""
+        return self.read_pool.max_size
+
+    def close(self):
+        self.read_pool.close_all()
+        self.write_pool.close_all()
 
     def execute_query(self, query, params=None, fetch=True):
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                if params:
-                    cursor.execute(query, params)
-                else:
-                    cursor.execute(query)
-
-                if fetch:
-                    result = cursor.fetchall()
-                    return result
-                else:
-                    conn.commit()
-                    return cursor.rowcount
+            readonly = fetch and is_read_only_query(query)
+            with track_query(query, params) as sample:
+                requested = time.perf_counter()
+                with self.get_connection(readonly=readonly) as conn:
+                    sample['wait'] = time.perf_counter() - requested
+                    cursor = conn.cursor()
+                    if params:
+                        cursor.execute(query, params)
+                    else:
+                        cursor.execute(query)
+
+                    if fetch:
+                        result = cursor.fetchall()
+                        sample['rows'] = len(result)
+                        if conn.in_transaction:
+                            # Sonuç döndüren yazma (WITH ... INSERT, RETURNING) de kalıcı olmalı
+                            conn.commit()
+                            note_write(query, cursor.rowcount)
+                        return result
+                    else:
+                        conn.commit()
+                        note_write(query, cursor.rowcount)
+                        sample['rows'] = cursor.rowcount
+                        return cursor.rowcount
         except Exception as e:
             logger.error(f"SQLite sorgu hatası (SQL: {query[:100]}..., Params: {params}): {e}")
             raise
 
+    def run_write_batch(self, groups):
+        """[(query, [params, ...]), ...] gruplarını tek transaction'da çalıştır.
+
+        Her grup için etkilenen satır sayısını döndürür; hata durumunda
+        tüm batch geri alınır ve hata yükseltilir.
+        """
+        requested = time.perf_counter()
+        with self.get_connection() as conn:
+            wait = time.perf_counter() - requested
+            cursor = conn.cursor()
+            rowcounts = []
+            for query, param_rows in groups:
+                with track_query(query, param_rows[0]) as sample:
+                    sample['wait'], wait = wait, 0.0
+                    if len(param_rows) == 1:
+                        cursor.execute(query, param_rows[0] or ())
+                    else:
+                        cursor.executemany(query, param_rows)
+                    sample['rows'] = cursor.rowcount
+                rowcounts.append(cursor.rowcount)
+            with track_query("COMMIT"):
+                conn.commit()
+            for (query, _), rowcount in zip(groups, rowcounts):
+                note_write(query, rowcount)
+            return rowcounts
+
     def get_dataframe(self, query, params=None):
         try:
-            with self.get_connection() as conn:
-                return pd.read_sql_query(query, conn, params=params)
+            with track_query(query, params) as sample:
+                requested = time.perf_counter()
+                with self.get_connection(readonly=True) as conn:
+                    sample['wait'] = time.perf_counter() - requested
+                    df = pd.read_sql_query(query, conn, params=params)
+                sample['rows'] = len(df)
+                sample['bytes'] = dataframe_nbytes(df)
+                return df
         except Exception as e:
             logger.error(f"SQLite DataFrame hatası (SQL: {query[:100]}..., Params: {params}): {e}")
             return pd.DataFrame()
 
+    def iter_dataframe(self, query, params=None, chunk_size=None):
+        """Sonucu DataFrame parçaları halinde akıt; bağlantı iterator boyunca tutulur"""
+        chunk_size = chunk_size or DATAFRAME_CHUNK_SIZE
+        requested = time.perf_counter()
+        sample = {'rows': 0, 'bytes': 0, 'wait': 0.0}
+        db_time = 0.0
+        error = False
+        try:
+            with self.get_connection(readonly=is_read_only_query(query)) as conn:
+                sample['wait'] = time.perf_counter() - requested
+                # Ölçüm yalnızca veritabanında geçen süreyi sayar, tüketicinin işini değil
+                started = time.perf_counter()
+                cursor = conn.execute(query, params or ())
+                try:
+                    columns = [d[0] for d in cursor.description]
+                    while True:
+                        rows = cursor.fetchmany(chunk_size)
+                        if not rows:
+                            db_time += time.perf_counter() - started
+                            break
+                        df = pd.DataFrame.from_records(rows, columns=columns, coerce_float=True)
+                        db_time += time.perf_counter() - started
+                        sample['rows'] += len(df)
+                        sample['bytes'] += dataframe_nbytes(df)
+                        yield df
+                        started = time.perf_counter()
+                finally:
+                    cursor.close()
+        except Exception:
+            error = True
+            raise
+        finally:
+            record_query(query, params, db_time, sample['rows'], sample['bytes'], sample['wait'], error)
+
 # =============================================================================
 # GLOBAL VERİTABANI YÖNETİCİSİ
 # =============================================================================
@@ -340,24 +1287,421 @@ if DATABASE_TYPE == 'mysql' and MYSQL_AVAILABLE:
 else:
     DATABASE_TYPE = 'sqlite'
     db_manager = SQLiteManager()
+atexit.register(db_manager.close)
 
 # =============================================================================
-# YARDIMCI FONKSİYONLAR
+# GRUP COMMIT YAZMA KUYRUĞU
 # =============================================================================
 
-def get_connection():
-    if DATABASE_TYPE == 'mysql':
-        if not db_manager.connection or not db_manager.connection.is_connected():
-            db_manager.connect()
-        return db_manager.connection
+class _WriteItem:
+    __slots__ = ('query', 'params', 'future', 'want_result')
+
+    def __init__(self, query, params, want_result):
+        self.query = query
+        self.params = params
+        self.future = Future()
+        self.want_result = want_result
+
+
+class GroupCommitWriter:
+    """Tek yazar thread'i ile grup commit.
+
+    Her oturumdan gelen yazma ifadeleri kuyrukta toplanır; `max_batch` ifadeye
+    ya da ilk ifadeden sonra `max_delay` saniyeye ulaşılınca tek transaction'da
+    commit edilir. Aynı SQL'e sahip ardışık fire-and-forget ifadeler
+    `executemany` ile gönderilir. Sonuç isteyen çağıranlar satır sayısını
+    `Future` üzerinden bekler.
+
+    `submit` kuyrukta beklemez: kuyruk `max_pending` ile doluysa ifade
+    çağıranın thread'inde tek başına yazılır (sıra garantisi yoktur) ve
+    `overflow` sayacı artar.
+    """
+
+    _FLUSH = object()
+    _STOP = object()
+
+    def __init__(self, manager, max_batch=500, max_delay=0.05, max_pending=10000):
+        self.manager = manager
+        self.max_batch = max(1, int(max_batch))
+        self.max_delay = max_delay
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._thread = None
+        self._lock = threading.Lock()
+        self.stats = {'submitted': 0, 'batches': 0, 'statements': 0, 'failed': 0, 'overflow': 0}
+
+    def _count(self, **deltas):
+        with self._lock:
+            for key, delta in deltas.items():
+                self.stats[key] += delta
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="effinova-writer", daemon=True)
+                self._thread.start()
+
+    def submit(self, query, params=None, want_result=False):
+        """Yazma ifadesini kuyruğa ekle; satır sayısı için Future döndürür"""
+        item = _WriteItem(query, params, want_result)
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self._count(submitted=1, overflow=1)
+            self._commit_individually([item])
+            return item.future
+        self._count(submitted=1)
+        return item.future
+
+    def flush(self, timeout=None):
+        """Kuyruktaki tüm ifadeler commit edilene kadar bekle"""
+        if self._thread is None or not self._thread.is_alive():
+            return True
+        done = threading.Event()
+        self._queue.put((self._FLUSH, done))
+        return done.wait(timeout)
+
+    def stop(self, timeout=5.0):
+        if self._thread is None or not self._thread.is_alive():
+            return
+        self._queue.put((self._STOP, None))
+        self._thread.join(timeout)
+
+    def pending(self):
+        return self._queue.qsize()
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            batch, control = [], None
+            if isinstance(first, tuple):
+                control = first
+            else:
+                batch.append(first)
+                deadline = time.monotonic() + self.max_delay
+                while len(batch) < self.max_batch:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = self._queue.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+                    if isinstance(item, tuple):
+                        control = item
+                        break
+                    batch.append(item)
+
+            if batch:
+                try:
+                    self._commit(batch)
+                except Exception as e:
+                    # Yazar thread'i hiçbir koşulda ölmemeli
+                    logger.error(f"Yazma kuyruğu beklenmeyen hata: {e}")
+                    for item in batch:
+                        if not item.future.done():
+                            item.future.set_exception(e)
+            if control is not None:
+                marker, done = control
+                if marker is self._FLUSH:
+                    done.set()
+                elif marker is self._STOP:
+                    self._drain()
+                    return
+
+    def _drain(self):
+        batch = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(item, tuple):
+                if item[1] is not None:
+                    item[1].set()
+                continue
+            batch.append(item)
+            if len(batch) >= self.max_batch:
+                self._commit(batch)
+                batch = []
+        if batch:
+            self._commit(batch)
+
+    @staticmethod
+    def _group(batch):
+        """Aynı SQL'e sahip ardışık fire-and-forget ifadeleri birleştir"""
+        groups = []
+        for item in batch:
+            head = groups[-1][0] if groups else None
+            if (head is not None and not item.want_result and not head.want_result
+                    and head.query == item.query and item.params):
+                groups[-1].append(item)
+            else:
+                groups.append([item])
+        return groups
+
+    def _commit(self, batch):
+        groups = self._group(batch)
+        try:
+            rowcounts = self.manager.run_write_batch(
+                [(g[0].query, [item.params for item in g]) for g in groups]
+            )
+        except Exception as e:
+            logger.warning(f"Grup commit başarısız ({len(batch)} ifade), tek tek deneniyor: {e}")
+            self._commit_individually(batch)
+            return
+        self._count(batches=1, statements=len(batch))
+        for group, rowcount in zip(groups, rowcounts):
+            for item in group:
+                item.future.set_result(rowcount if item.want_result else None)
+
+    def _commit_individually(self, batch):
+        for item in batch:
+            try:
+                rowcount = self.manager.run_write_batch([(item.query, [item.params])])[0]
+                self._count(statements=1)
+                item.future.set_result(rowcount)
+            except Exception as e:
+                self._count(failed=1)
+                logger.error(f"Yazma kuyruğu hatası (SQL: {item.query[:100]}..., Params: {item.params}): {e}")
+                item.future.set_exception(e)
+
+
+write_queue = GroupCommitWriter(
+    db_manager,
+    WRITE_QUEUE_CONFIG['max_batch'],
+    WRITE_QUEUE_CONFIG['max_delay'],
+    WRITE_QUEUE_CONFIG['max_pending'],
+)
+atexit.register(write_queue.stop)
+
+# =============================================================================
+# EŞZAMANLI SORGU GRUBU
+# =============================================================================
+
+try:
+    from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+except ImportError:
+    add_script_run_ctx = get_script_run_ctx = None
+
+_batch_executor = None
+_batch_executor_lock = threading.Lock()
+_batch_local = threading.local()
+
+
+def _get_batch_executor():
+    global _batch_executor
+    with _batch_executor_lock:
+        if _batch_executor is None:
+            workers = max(1, min(QUERY_BATCH_CONFIG['max_workers'], db_manager.read_capacity()))
+            _batch_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="query-batch")
+            atexit.register(_batch_executor.shutdown, wait=False, cancel_futures=True)
+        return _batch_executor
+
+
+def _normalize_batch(tasks):
+    """Liste/sözlük görevleri -> (anahtarlar, [(fn, args)])"""
+    if isinstance(tasks, dict):
+        keys, tasks = list(tasks), list(tasks.values())
     else:
-        return db_manager.get_connection()
+        tasks = list(tasks)
+        keys = None
+    calls = [(task, ()) if callable(task) else (task[0], tuple(task[1:])) for task in tasks]
+    return keys, calls
+
+
+def _current_script_ctx():
+    if get_script_run_ctx is None:
+        return None
+    return get_script_run_ctx(suppress_warning=True)
+
 
-def execute_query(query, params=None, fetch=True):
+def _run_batch_task(ctx, fn, args):
+    # Görevdeki st.* çağrıları çağıran oturuma bağlansın
+    thread = threading.current_thread()
+    if ctx is not None:
+        add_script_run_ctx(thread, ctx)
+    _batch_local.active = True
+    try:
+        return fn(*args)
+    finally:
+        _batch_local.active = False
+        if ctx is not None:
+            add_script_run_ctx(thread, None)
+
+
+def _batch_results(keys, results):
+    return dict(zip(keys, results)) if keys is not None else results
+
+
+def run_queries(tasks, return_exceptions=False, timeout=None):
+    """Bağımsız okuma fonksiyonlarını eşzamanlı çalıştır, sonuçları birlikte döndür.
+
+    `tasks` liste ya da sözlüktür; her görev bir çağrılabilir veya
+    `(fn, arg1, arg2, ...)` demetidir. Sonuçlar aynı sırayla (sözlükte aynı
+    anahtarlarla) döner:
+
+        total_users, filters = config.run_queries([get_user_count, get_employee_filters])
+
+    Gecikme sorguların toplamı değil en yavaşı kadardır. Tüm oturumlar
+    `QUERY_BATCH_CONFIG['max_workers']` iş parçacığını paylaşır ve bu sayı
+    okuma havuzunu aşmaz; fazla görevler havuzu tüketmek yerine sırada bekler.
+    Bir görev hata verirse diğerleri bitince ilk hata yükseltilir;
+    `return_exceptions=True` ile hata sonucun yerine konur. Bir görevin içinden
+    çağrılırsa görevler sırayla çalışır (iş parçacıkları birbirini beklemesin).
+    """
+    keys, calls = _normalize_batch(tasks)
+    timeout = QUERY_BATCH_CONFIG['timeout'] if timeout is None else timeout
+
+    if len(calls) <= 1 or getattr(_batch_local, 'active', False):
+        results = []
+        for fn, args in calls:
+            try:
+                results.append(fn(*args))
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                results.append(e)
+        return _batch_results(keys, results)
+
+    ctx = _current_script_ctx()
+    executor = _get_batch_executor()
+    futures = [executor.submit(_run_batch_task, ctx, fn, args) for fn, args in calls]
+    _, pending = wait(futures, timeout=timeout)
+    if pending:
+        for future in pending:
+            future.cancel()
+        logger.error(f"Sorgu grubu zaman aşımı: {len(pending)}/{len(futures)} görev {timeout} sn içinde bitmedi")
+        raise TimeoutError(f"{len(pending)} sorgu {timeout} sn içinde tamamlanamadı")
+
+    results = []
+    for future in futures:
+        error = future.exception()
+        if error is not None and not return_exceptions:
+            raise error
+        results.append(error if error is not None else future.result())
+    return _batch_results(keys, results)
+
+
+async def gather_queries(tasks, return_exceptions=False, timeout=None):
+    """run_queries'in asyncio sürümü: olay döngüsünü bloklamadan aynı iş havuzunda çalıştırır"""
+    keys, calls = _normalize_batch(tasks)
+    timeout = QUERY_BATCH_CONFIG['timeout'] if timeout is None else timeout
+    loop = asyncio.get_running_loop()
+    ctx = _current_script_ctx()
+    executor = _get_batch_executor()
+    futures = [loop.run_in_executor(executor, _run_batch_task, ctx, fn, args) for fn, args in calls]
+    results = await asyncio.wait_for(asyncio.gather(*futures, return_exceptions=return_exceptions), timeout)
+    return _batch_results(keys, results)
+
+# =============================================================================
+# YARDIMCI FONKSİYONLAR
+# =============================================================================
+
+_READ_ONLY_PREFIXES = ("SELECT", "EXPLAIN")
+_STATEMENT_KEYWORDS = {"SELECT", "VALUES", "INSERT", "REPLACE", "UPDATE", "DELETE"}
+# Metin/tanımlayıcı/yorumlar tek parça eşlenir, içlerindeki sözcükler sayılmaz
+_SQL_TOKEN_RE = re.compile(r"'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|`[^`]*`|--[^\n]*|/\*.*?\*/|[()]|\w+", re.S)
+
+@functools.lru_cache(maxsize=1024)
+def _cte_main_statement(query):
+    """WITH sorgusunun ana ifadesi: CTE tanımlarından sonra en dış düzeydeki ilk komut"""
+    depth = 0
+    for match in _SQL_TOKEN_RE.finditer(query):
+        token = match.group()
+        if token == "(":
+            depth += 1
+        elif token == ")":
+            depth -= 1
+        elif depth == 0 and token.upper() in _STATEMENT_KEYWORDS:
+            return token.upper()
+    return None
+
+def is_read_only_query(query):
+    """Sorgu salt okunur bir bağlantıda çalıştırılabilir mi?
+
+    WITH yalnızca ana ifadesi SELECT ise salt okunurdur; `WITH ... INSERT/UPDATE/DELETE`
+    yazma bağlantısına gider.
+    """
+    head = query.lstrip().lstrip("(").upper()
+    if head.startswith("WITH"):
+        return _cte_main_statement(query) in ("SELECT", "VALUES")
+    return head.startswith(_READ_ONLY_PREFIXES)
+
+def get_connection(readonly=False):
+    """Havuzdan bağlantı al (context manager)"""
+    return db_manager.get_connection(readonly=readonly)
+
+def execute_query(query, params=None, fetch=True, queued=False):
+    """Sorguyu çalıştır; `fetch=False, queued=True` ile yazma grup commit kuyruğuna gider.
+
+    Kuyruğa giden yazma için satır sayısını taşıyan Future döner (bkz. submit_write).
+    """
+    if queued and not fetch:
+        return submit_write(query, params, want_result=True)
     return db_manager.execute_query(query, params, fetch)
 
-def get_dataframe(query, params=None):
-    return db_manager.get_dataframe(query, params)
+def get_dataframe(query, params=None, optimize_dtypes=False):
+    """Sorgu sonucu DataFrame; `optimize_dtypes` ile sütunlar tür politikasına göre daraltılır.
+
+    Daraltılmış sonuç (category, float32, datetime64) önbellek ve gösterim
+    içindir; veritabanına geri yazılacak sonuçlarda kullanılmamalıdır.
+    """
+    df = db_manager.get_dataframe(query, params)
+    return apply_dtype_policy(df) if optimize_dtypes else df
+
+def iter_dataframe(query, params=None, chunk_size=None):
+    """Büyük sonuçları `chunk_size` satırlık DataFrame parçaları halinde akıt.
+
+    Bellek kullanımı tablo boyutundan bağımsızdır. Bağlantı ilk parçada
+    havuzdan alınır ve iterator tükenince ya da kapatılınca geri verilir.
+    Döngüden `break` ile çıkılınca iterator hemen kapanır; bir değişkende
+    tutuluyorsa `close()` çağrılmalı ya da `contextlib.closing` kullanılmalıdır.
+    """
+    return db_manager.iter_dataframe(query, params, chunk_size)
+
+def fetch_scalar(query, params=None, default=None):
+    """Tek değer döndüren sorgu (MySQL dict, SQLite tuple satırlarını destekler)"""
+    result = execute_query(query, params)
+    if not result:
+        return default
+    row = result[0]
+    value = next(iter(row.values())) if isinstance(row, dict) else row[0]
+    return default if value is None else value
+
+def sql_placeholder():
+    return '%s' if DATABASE_TYPE == 'mysql' else '?'
+
+def execute_many(query, seq_of_params):
+    """Aynı ifadeyi birden çok parametre setiyle tek transaction'da çalıştır"""
+    seq_of_params = list(seq_of_params)
+    if not seq_of_params:
+        return 0
+    return db_manager.run_write_batch([(query, seq_of_params)])[0]
+
+def chunked(items, size=IN_CLAUSE_CHUNK_SIZE):
+    """Diziyi `size` elemanlık listelere böl (IN listeleri, executemany parçaları)"""
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def submit_write(query, params=None, want_result=False):
+    """Yazma ifadesini grup commit kuyruğuna gönder.
+
+    Kuyruk kapalıysa ifade hemen çalıştırılır. Her durumda satır sayısını
+    taşıyan bir Future döner; sonucu gerekmeyen çağıranlar beklemek zorunda değildir.
+    """
+    if WRITE_QUEUE_CONFIG['enabled']:
+        return write_queue.submit(query, params, want_result)
+    future = Future()
+    try:
+        future.set_result(db_manager.run_write_batch([(query, [params])])[0])
+    except Exception as e:
+        logger.error(f"Yazma hatası (SQL: {query[:100]}..., Params: {params}): {e}")
+        future.set_exception(e)
+    return future
 
 def log_action(username, action, details=None, table_name=None, record_id=None):
     try:
@@ -371,7 +1715,7 @@ def log_action(username, action, details=None, table_name=None, record_id=None):
                 INSERT INTO logs (username, action, details, table_name, record_id)
                 VALUES (?, ?, ?, ?, ?)
             """
-        execute_query(query, (username, action, details, table_name, record_id), fetch=False)
+        submit_write(query, (username, action, details, table_name, record_id))
         logger.info(f"Log: User='{username}', Action='{action}', Table='{table_name}', Record='{record_id}'")
     except Exception as e:
         logger.error(f"Log kaydetme hatası: {e}")
@@ -379,13 +1723,9 @@ def log_action(username, action, details=None, table_name=None, record_id=None):
 def test_connection():
     try:
         if DATABASE_TYPE == 'mysql':
-            if db_manager.connect():
-                db_manager.disconnect()
-                return True
-            else:
-                return False
+            return db_manager.connect()
         else:
-            with db_manager.get_connection() as conn:
+            with db_manager.get_connection(readonly=True) as conn:
                 cursor = conn.cursor()
                 cursor.execute("SELECT 1")
                 return True
@@ -393,100 +1733,1486 @@ def test_connection():
         logger.error(f"Bağlantı test hatası: {e}")
         return False
 
-def create_sqlite_tables():
-    """SQLite tabloları oluştur"""
-    db_manager.ensure_directories()
-    success = False
+# =============================================================================
+# ŞEMA MİGRASYONLARI
+# =============================================================================
+#
+# Her migrasyon sırayla ve bir kez uygulanır; uygulanan sürümler
+# `schema_version` tablosunda tutulur. Adımlar idempotent yazılır (IF NOT
+# EXISTS / information_schema kontrolü) ki yarım kalmış bir migrasyon güvenle
+# yeniden çalıştırılabilsin. Bir adım SQL metni ya da `cursor` alan bir
+# fonksiyon olabilir. Yeni şema değişiklikleri listenin sonuna eklenir.
+
+def _mysql_index_exists(cursor, table, index_name):
+    cursor.execute(
+        "SELECT 1 FROM information_schema.statistics "
+        "WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s LIMIT 1",
+        (table, index_name),
+    )
+    return cursor.fetchone() is not None
+
+def _mysql_create_index(table, index_name, columns, kind="INDEX"):
+    """MySQL'de CREATE INDEX IF NOT EXISTS yok; information_schema'ya bakan adım üret"""
+    def step(cursor):
+        if not _mysql_index_exists(cursor, table, index_name):
+            cursor.execute(f"ALTER TABLE `{table}` ADD {kind} `{index_name}` ({columns})")
+    return step
+
+_MYSQL_TABLE_OPTIONS = "ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci"
+
+def _sqlite_add_column(table, column, definition):
+    """SQLite'ta ADD COLUMN IF NOT EXISTS yok; PRAGMA table_info'ya bakan adım üret"""
+    def step(cursor):
+        cursor.execute(f"PRAGMA table_xinfo({table})")
+        if column not in {row[1] for row in cursor.fetchall()}:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+    return step
+
+def _mysql_add_column(table, column, definition):
+    def step(cursor):
+        cursor.execute(
+            "SELECT 1 FROM information_schema.columns "
+            "WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s LIMIT 1",
+            (table, column),
+        )
+        if cursor.fetchone() is None:
+            cursor.execute(f"ALTER TABLE `{table}` ADD COLUMN `{column}` {definition}")
+    return step
+
+# --- Liderlik tablosu özeti ---
+# employee_score_summary, process_scores'un çalışan başına özetidir ve
+# tetikleyicilerle güncel tutulur. Anahtar sicil numarasıdır; sicili olmayan
+# eski kayıtlar için çalışan adına düşülür (process_scores.employee_key).
+# score_count/score_sum yalnızca NULL olmayan toplam_skor değerlerini sayar,
+# böylece ortalama AVG(toplam_skor) ile aynıdır. last_* alanları (tarih, id)
+# sırasına göre en son skor kaydını gösterir.
+
+_SCORE_SUMMARY_COLUMNS = (
+    "employee_sicil_no, employee_name, score_count, score_sum, score_max, last_tarih, last_onay, last_score_id"
+)
+
+def _score_summary_refresh_sql(key_expr):
+    """Tek çalışanın özet satırını process_scores'tan yeniden hesaplayan ifadeler"""
+    return [
+        f"DELETE FROM employee_score_summary WHERE employee_sicil_no = {key_expr}",
+        f"""
+        INSERT INTO employee_score_summary ({_SCORE_SUMMARY_COLUMNS})
+        SELECT latest.employee_key, latest.employee_name, agg.cnt, agg.total, agg.mx,
+               latest.tarih, latest.onay, latest.id
+        FROM (
+            SELECT COUNT(toplam_skor) AS cnt, COALESCE(SUM(toplam_skor), 0) AS total, MAX(toplam_skor) AS mx
+            FROM process_scores WHERE employee_key = {key_expr}
+        ) agg,
+        (
+            SELECT employee_key, employee_name, tarih, onay, id
+            FROM process_scores WHERE employee_key = {key_expr}
+            ORDER BY tarih DESC, id DESC
+            LIMIT 1
+        ) latest
+        """,
+    ]
+
+SCORE_SUMMARY_REBUILD_SQL = f"""
+    INSERT INTO employee_score_summary ({_SCORE_SUMMARY_COLUMNS})
+    SELECT employee_key, employee_name, cnt, total, mx, tarih, onay, id
+    FROM (
+        SELECT employee_key, employee_name, tarih, onay, id,
+               COUNT(toplam_skor) OVER w AS cnt,
+               COALESCE(SUM(toplam_skor) OVER w, 0) AS total,
+               MAX(toplam_skor) OVER w AS mx,
+               ROW_NUMBER() OVER (PARTITION BY employee_key ORDER BY tarih DESC, id DESC) AS rn
+        FROM process_scores
+        WHERE employee_key IS NOT NULL
+        WINDOW w AS (PARTITION BY employee_key)
+    ) ranked
+    WHERE rn = 1
+"""
+
+def _rebuild_score_summary(cursor):
+    cursor.execute("DELETE FROM employee_score_summary")
+    cursor.execute(SCORE_SUMMARY_REBUILD_SQL)
+
+def _sqlite_score_summary_triggers():
+    refresh_old = ";\n".join(_score_summary_refresh_sql("OLD.employee_key"))
+    refresh_new = ";\n".join(_score_summary_refresh_sql("NEW.employee_key"))
+    return [
+        # Ekleme artımlı: sayaç/toplam/max güncellenir, yeni kayıt daha yeniyse last_* değişir
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_process_scores_summary_ins
+        AFTER INSERT ON process_scores
+        WHEN NEW.employee_key IS NOT NULL
+        BEGIN
+            INSERT INTO employee_score_summary ({_SCORE_SUMMARY_COLUMNS})
+            VALUES (NEW.employee_key, NEW.employee_name, NEW.toplam_skor IS NOT NULL,
+                    COALESCE(NEW.toplam_skor, 0), NEW.toplam_skor, NEW.tarih, NEW.onay, NEW.id)
+            ON CONFLICT(employee_sicil_no) DO UPDATE SET
+                score_count = score_count + excluded.score_count,
+                score_sum = score_sum + excluded.score_sum,
+                score_max = CASE
+                    WHEN excluded.score_max IS NULL THEN score_max
+                    WHEN score_max IS NULL OR excluded.score_max > score_max THEN excluded.score_max
+                    ELSE score_max END,
+                employee_name = CASE WHEN (COALESCE(excluded.last_tarih, ''), excluded.last_score_id)
+                    >= (COALESCE(last_tarih, ''), last_score_id) THEN excluded.employee_name ELSE employee_name END,
+                last_onay = CASE WHEN (COALESCE(excluded.last_tarih, ''), excluded.last_score_id)
+                    >= (COALESCE(last_tarih, ''), last_score_id) THEN excluded.last_onay ELSE last_onay END,
+                last_score_id = CASE WHEN (COALESCE(excluded.last_tarih, ''), excluded.last_score_id)
+                    >= (COALESCE(last_tarih, ''), last_score_id) THEN excluded.last_score_id ELSE last_score_id END,
+                last_tarih = CASE WHEN (COALESCE(excluded.last_tarih, ''), excluded.last_score_id)
+                    >= (COALESCE(last_tarih, ''), last_score_id) THEN excluded.last_tarih ELSE last_tarih END;
+        END
+        """,
+        # Güncelleme/silmede max ve "en son" geri alınamaz; etkilenen çalışan(lar) yeniden hesaplanır
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_process_scores_summary_upd
+        AFTER UPDATE OF employee_sicil_no, employee_name, toplam_skor, tarih, onay ON process_scores
+        BEGIN
+            {refresh_old};
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_process_scores_summary_move
+        AFTER UPDATE OF employee_sicil_no, employee_name ON process_scores
+        WHEN NEW.employee_key IS NOT OLD.employee_key
+        BEGIN
+            {refresh_new};
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_process_scores_summary_del
+        AFTER DELETE ON process_scores
+        BEGIN
+            {refresh_old};
+        END
+        """,
+    ]
+
+def _mysql_score_summary_triggers():
+    refresh_old = ";\n".join(_score_summary_refresh_sql("OLD.employee_key"))
+    refresh_new = ";\n".join(_score_summary_refresh_sql("NEW.employee_key"))
+    newer = "(COALESCE(VALUES(last_tarih), '1000-01-01'), VALUES(last_score_id)) >= (COALESCE(last_tarih, '1000-01-01'), last_score_id)"
+    return [
+        "DROP TRIGGER IF EXISTS trg_process_scores_summary_ins",
+        f"""
+        CREATE TRIGGER trg_process_scores_summary_ins
+        AFTER INSERT ON process_scores FOR EACH ROW
+        BEGIN
+            IF NEW.employee_key IS NOT NULL THEN
+                INSERT INTO employee_score_summary ({_SCORE_SUMMARY_COLUMNS})
+                VALUES (NEW.employee_key, NEW.employee_name, NEW.toplam_skor IS NOT NULL,
+                        COALESCE(NEW.toplam_skor, 0), NEW.toplam_skor, NEW.tarih, NEW.onay, NEW.id)
+                ON DUPLICATE KEY UPDATE
+                    employee_name = IF({newer}, VALUES(employee_name), employee_name),
+                    last_onay = IF({newer}, VALUES(last_onay), last_onay),
+                    last_tarih = IF({newer}, VALUES(last_tarih), last_tarih),
+                    last_score_id = IF({newer}, VALUES(last_score_id), last_score_id),
+                    score_count = score_count + VALUES(score_count),
+                    score_sum = score_sum + VALUES(score_sum),
+                    score_max = CASE
+                        WHEN VALUES(score_max) IS NULL THEN score_max
+                        WHEN score_max IS NULL OR VALUES(score_max) > score_max THEN VALUES(score_max)
+                        ELSE score_max END;
+            END IF;
+        END
+        """,
+        "DROP TRIGGER IF EXISTS trg_process_scores_summary_upd",
+        f"""
+        CREATE TRIGGER trg_process_scores_summary_upd
+        AFTER UPDATE ON process_scores FOR EACH ROW
+        BEGIN
+            {refresh_old};
+            IF NOT (NEW.employee_key <=> OLD.employee_key) THEN
+                {refresh_new};
+            END IF;
+        END
+        """,
+        "DROP TRIGGER IF EXISTS trg_process_scores_summary_del",
+        f"""
+        CREATE TRIGGER trg_process_scores_summary_del
+        AFTER DELETE ON process_scores FOR EACH ROW
+        BEGIN
+            {refresh_old};
+        END
+        """,
+    ]
+
+# --- Türkçe arama indeksi ---
+# employees.Ad_Soyad_norm, Ad_Soyad'ın Türkçe harfleri ASCII karşılıklarına
+# indirgenmiş, ASCII harfleri küçültülmüş kopyasıdır (İ/I/ı -> i, Ş -> s, ...).
+# Arama terimi Python tarafında fold_turkish() ile aynı şekilde normalize edilir.
+# MySQL'de LOWER() utf8mb4 harflerinin tamamını (É, Ø, ...) küçültürken SQLite
+# yalnızca ASCII'yi küçültür; bu yüzden MySQL ifadesi LOWER yerine A-Z için de
+# REPLACE kullanır ve sütun iki veritabanında birebir aynı olur. Tablodaki
+# harfler dışındakiler her iki tarafta da olduğu gibi kalır. (SQLite'ta iç içe
+# REPLACE derinliği ayrıştırıcı yığınıyla ~28'e sınırlı; A-Z orada LOWER ile yapılır.)
+
+_TR_FOLD_MAP = {
+    'İ': 'i', 'I': 'i', 'ı': 'i', 'Î': 'i', 'î': 'i',
+    'Ş': 's', 'ş': 's',
+    'Ğ': 'g', 'ğ': 'g',
+    'Ü': 'u', 'ü': 'u', 'Û': 'u', 'û': 'u',
+    'Ö': 'o', 'ö': 'o',
+    'Ç': 'c', 'ç': 'c',
+    'Â': 'a', 'â': 'a',
+}
+_TR_FOLD_TABLE = str.maketrans(_TR_FOLD_MAP)
+_ASCII_UPPER = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+def fold_turkish(text):
+    """Arama için Türkçe harf ve ASCII büyük/küçük harf katlama (SQL ifadesiyle birebir)"""
+    folded = (text or "").translate(_TR_FOLD_TABLE)
+    return "".join(ch.lower() if ch.isascii() else ch for ch in folded)
+
+def turkish_fold_sql(column, backend=None):
+    backend = backend or ('mysql' if DATABASE_TYPE == 'mysql' else 'sqlite')
+    expr = column
+    for source, target in _TR_FOLD_MAP.items():
+        expr = f"REPLACE({expr}, '{source}', '{target}')"
+    if backend != 'mysql':
+        return f"LOWER({expr})"
+    # MySQL REPLACE büyük/küçük harfe duyarlıdır; LOWER'ın ASCII dışı etkisi olmadan küçültür
+    for letter in _ASCII_UPPER:
+        if letter not in _TR_FOLD_MAP:
+            expr = f"REPLACE({expr}, '{letter}', '{letter.lower()}')"
+    return expr
+
+_EMPLOYEE_FTS_TRIGGERS = ("trg_employees_fts_ins", "trg_employees_fts_del", "trg_employees_fts_upd")
+
+def _sqlite_create_employee_fts(cursor):
+    """FTS5 dış içerik tablosu ve senkron tetikleyicileri (FTS5 yoksa atlanır)"""
+    try:
+        cursor.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS employees_fts USING fts5(
+                Ad_Soyad_norm,
+                content='employees',
+                content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2',
+                prefix='1 2 3'
+            )
+        """)
+    except sqlite3.OperationalError as e:
+        logger.warning(f"FTS5 kullanılamıyor, arama indeks aralığına düşecek: {e}")
+        return
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_employees_fts_ins AFTER INSERT ON employees
+        BEGIN
+            INSERT INTO employees_fts (rowid, Ad_Soyad_norm) VALUES (NEW.id, NEW.Ad_Soyad_norm);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_employees_fts_del AFTER DELETE ON employees
+        BEGIN
+            INSERT INTO employees_fts (employees_fts, rowid, Ad_Soyad_norm)
+            VALUES ('delete', OLD.id, OLD.Ad_Soyad_norm);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_employees_fts_upd AFTER UPDATE OF Ad_Soyad ON employees
+        BEGIN
+            INSERT INTO employees_fts (employees_fts, rowid, Ad_Soyad_norm)
+            VALUES ('delete', OLD.id, OLD.Ad_Soyad_norm);
+            INSERT INTO employees_fts (rowid, Ad_Soyad_norm) VALUES (NEW.id, NEW.Ad_Soyad_norm);
+        END
+    """)
+    cursor.execute("INSERT INTO employees_fts (employees_fts) VALUES ('rebuild')")
+
+# --- Skor özet küpü (rollups.py) ---
+# process_scores'un departman x süreç x ay ve çalışan x ay özetleri. Her
+# bileşen için toplam/sayı/min/max tutulur; ortalama toplam / {bileşen}_count'tur
+# (NULL olmayan değerler; score_count ise satır sayısıdır).
+# Artımlı yenileme durumu rollup_state tablosundadır.
+
+ROLLUP_METRICS = ("cikti", "kalite", "strateji", "inovasyon", "zaman", "ekstra", "toplam_skor")
+
+def _rollup_metric_columns(sql_type, count_type):
+    return ",\n                ".join(
+        f"{m}_sum {sql_type}, {m}_count {count_type} NOT NULL, {m}_min {sql_type}, {m}_max {sql_type}"
+        for m in ROLLUP_METRICS
+    )
+
+# --- Yönetim hiyerarşisi (org_hierarchy.py) ---
+# org_hierarchy, Yonetici_Adi / IK_Yonetici_Adi zincirlerinin kapanış tablosudur:
+# her (üst, ast) çifti için derinlik (0 = kendisi). Tetikleyiciler yalnızca
+# değişen çalışanı org_hierarchy_queue'ya yazar; kapanış `manage.py
+# refresh-org-hierarchy` ya da org_hierarchy.refresh_in_background() ile artımlı
+# güncellenir. Okumalar yenileme yapmaz.
+# employee_id NULL olan kuyruk satırı tam yeniden kurulum ister.
+
+_ORG_HIERARCHY_TRIGGERS = ("trg_employees_org_ins", "trg_employees_org_upd", "trg_employees_org_del")
+_ORG_HIERARCHY_COLUMNS = ("Ad_Soyad", "Departman", "Yonetici_Adi", "IK_Yonetici_Adi", "deleted")
+ORG_HIERARCHY_REBUILD_SQL = "INSERT INTO org_hierarchy_queue (employee_id, ad_soyad) VALUES (NULL, NULL)"
+ORG_HIERARCHY_INDEX_SQL = ("CREATE INDEX IF NOT EXISTS idx_org_hierarchy_descendant "
+                           "ON org_hierarchy (line, descendant_id, depth)")
+
+def _sqlite_org_hierarchy_triggers():
+    changed = " OR ".join(f"NEW.{c} IS NOT OLD.{c}" for c in _ORG_HIERARCHY_COLUMNS)
+    return [
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_employees_org_ins AFTER INSERT ON employees
+        BEGIN
+            INSERT INTO org_hierarchy_queue (employee_id, ad_soyad) VALUES (NEW.id, NEW.Ad_Soyad);
+        END
+        """,
+        # Eski ad da kuyruğa girer: o ada bağlı astlar yeniden eşlenir
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_employees_org_upd
+        AFTER UPDATE OF {', '.join(_ORG_HIERARCHY_COLUMNS)} ON employees
+        WHEN {changed}
+        BEGIN
+            INSERT INTO org_hierarchy_queue (employee_id, ad_soyad) VALUES (NEW.id, NEW.Ad_Soyad);
+            INSERT INTO org_hierarchy_queue (employee_id, ad_soyad)
+            SELECT OLD.id, OLD.Ad_Soyad WHERE OLD.Ad_Soyad IS NOT NEW.Ad_Soyad;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_employees_org_del AFTER DELETE ON employees
+        BEGIN
+            INSERT INTO org_hierarchy_queue (employee_id, ad_soyad) VALUES (OLD.id, OLD.Ad_Soyad);
+        END
+        """,
+    ]
+
+def _mysql_org_hierarchy_triggers():
+    unchanged = " AND ".join(f"NEW.{c} <=> OLD.{c}" for c in _ORG_HIERARCHY_COLUMNS)
+    return [
+        "DROP TRIGGER IF EXISTS trg_employees_org_ins",
+        """
+        CREATE TRIGGER trg_employees_org_ins AFTER INSERT ON employees FOR EACH ROW
+            INSERT INTO org_hierarchy_queue (employee_id, ad_soyad) VALUES (NEW.id, NEW.Ad_Soyad)
+        """,
+        "DROP TRIGGER IF EXISTS trg_employees_org_upd",
+        f"""
+        CREATE TRIGGER trg_employees_org_upd AFTER UPDATE ON employees FOR EACH ROW
+        BEGIN
+            IF NOT ({unchanged}) THEN
+                INSERT INTO org_hierarchy_queue (employee_id, ad_soyad) VALUES (NEW.id, NEW.Ad_Soyad);
+                IF NOT (NEW.Ad_Soyad <=> OLD.Ad_Soyad) THEN
+                    INSERT INTO org_hierarchy_queue (employee_id, ad_soyad) VALUES (OLD.id, OLD.Ad_Soyad);
+                END IF;
+            END IF;
+        END
+        """,
+        "DROP TRIGGER IF EXISTS trg_employees_org_del",
+        """
+        CREATE TRIGGER trg_employees_org_del AFTER DELETE ON employees FOR EACH ROW
+            INSERT INTO org_hierarchy_queue (employee_id, ad_soyad) VALUES (OLD.id, OLD.Ad_Soyad)
+        """,
+    ]
+
+MIGRATIONS = [
+    {
+        'version': 1,
+        'description': "Temel tablolar",
+        'sqlite': [
+            """
+            CREATE TABLE IF NOT EXISTS users (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                username TEXT UNIQUE NOT NULL,
+                password TEXT NOT NULL,
+                role TEXT NOT NULL DEFAULT 'calisan',
+                email TEXT,
+                score INTEGER DEFAULT 0,
+                last_login TEXT,
+                token TEXT,
+                employee_sicil_no TEXT,
+                department TEXT,
+                deleted INTEGER DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS employees (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                Ad_Soyad TEXT NOT NULL,
+                Pozisyon TEXT NOT NULL,
+                Departman TEXT NOT NULL,
+                Yonetici_Adi TEXT,
+                IK_Yonetici_Adi TEXT,
+                Email TEXT,
+                Sicil_No TEXT UNIQUE NOT NULL,
+                İşe_Giriş_Tarihi DATE,
+                Telefon TEXT,
+                Adres TEXT,
+                Dogum_Tarihi DATE,
+                Egitim TEXT,
+                Sertifikalar TEXT,
+                Yetenekler TEXT,
+                deleted INTEGER DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS processes (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                process_name TEXT NOT NULL,
+                description TEXT,
+                department TEXT,
+                created_at DATE DEFAULT CURRENT_DATE,
+                score INTEGER DEFAULT 0,
+                weight REAL DEFAULT 1.0,
+                deleted INTEGER DEFAULT 0
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS logs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                username TEXT,
+                action TEXT NOT NULL,
+                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                details TEXT,
+                ip_address TEXT,
+                user_agent TEXT,
+                table_name TEXT,
+                record_id TEXT
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS process_scores (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                process_id INTEGER REFERENCES processes(id),
+                employee_name TEXT NOT NULL,
+                employee_sicil_no TEXT,
+                cikti INTEGER DEFAULT 0,
+                kalite INTEGER DEFAULT 0,
+                strateji INTEGER DEFAULT 0,
+                inovasyon INTEGER DEFAULT 0,
+                zaman REAL DEFAULT 0,
+                ekstra INTEGER DEFAULT 0,
+                ekstra_aciklama TEXT,
+                toplam_skor REAL DEFAULT 0,
+                tarih DATE DEFAULT CURRENT_DATE,
+                onay TEXT DEFAULT 'Beklemede',
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS innovation_ideas (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                employee_sicil_no TEXT,
+                employee_name TEXT NOT NULL,
+                idea TEXT NOT NULL,
+                description TEXT,
+                category TEXT,
+                created_at DATE DEFAULT CURRENT_DATE,
+                status TEXT DEFAULT 'Beklemede',
+                score INTEGER DEFAULT 0,
+                reviewed_by TEXT,
+                reviewed_at TIMESTAMP
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS projects (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                description TEXT,
+                start_date DATE DEFAULT CURRENT_DATE,
+                end_date DATE DEFAULT CURRENT_DATE,
+                status TEXT DEFAULT 'Planning',
+                budget REAL DEFAULT 0,
+                manager_sicil_no TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """,
+        ],
+        'mysql': [
+            f"""
+            CREATE TABLE IF NOT EXISTS users (
+                id INT AUTO_INCREMENT PRIMARY KEY,
+                username VARCHAR(50) UNIQUE NOT NULL,
+                password VARCHAR(255) NOT NULL,
+                role VARCHAR(20) NOT NULL DEFAULT 'calisan',
+                email VARCHAR(100),
+                score INT DEFAULT 0,
+                last_login DATETIME,
+                token VARCHAR(255),
+                employee_sicil_no VARCHAR(20),
+                department VARCHAR(100),
+                deleted TINYINT(1) DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            ) {_MYSQL_TABLE_OPTIONS}
+            """,
+            f"""
+            CREATE TABLE IF NOT EXISTS employees (
+                id INT AUTO_INCREMENT PRIMARY KEY,
+                Ad_Soyad VARCHAR(100) NOT NULL,
+                Pozisyon VARCHAR(100) NOT NULL,
+                Departman VARCHAR(100) NOT NULL,
+                Yonetici_Adi VARCHAR(100),
+                IK_Yonetici_Adi VARCHAR(100),
+                Email VARCHAR(100),
+                Sicil_No VARCHAR(20) UNIQUE NOT NULL,
+                `İşe_Giriş_Tarihi` DATE,
+                Telefon VARCHAR(20),
+                Adres TEXT,
+                Dogum_Tarihi DATE,
+                Egitim TEXT,
+                Sertifikalar TEXT,
+                Yetenekler TEXT,
+                deleted TINYINT(1) DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+            ) {_MYSQL_TABLE_OPTIONS}
+            """,
+            f"""
+            CREATE TABLE IF NOT EXISTS processes (
+                id INT AUTO_INCREMENT PRIMARY KEY,
+                process_name VARCHAR(200) NOT NULL,
+                description TEXT,
+                department VARCHAR(100),
+                created_at DATE DEFAULT (CURRENT_DATE),
+                score INT DEFAULT 0,
+                weight DOUBLE DEFAULT 1.0,
+                deleted TINYINT(1) DEFAULT 0
+            ) {_MYSQL_TABLE_OPTIONS}
+            """,
+            f"""
+            CREATE TABLE IF NOT EXISTS logs (
+                id BIGINT AUTO_INCREMENT PRIMARY KEY,
+                username VARCHAR(50),
+                action VARCHAR(255) NOT NULL,
+                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                details TEXT,
+                ip_address VARCHAR(45),
+                user_agent VARCHAR(255),
+                table_name VARCHAR(100),
+                record_id VARCHAR(100)
+            ) {_MYSQL_TABLE_OPTIONS}
+            """,
+            f"""
+            CREATE TABLE IF NOT EXISTS process_scores (
+                id INT AUTO_INCREMENT PRIMARY KEY,
+                process_id INT,
+                employee_name VARCHAR(100) NOT NULL,
+                employee_sicil_no VARCHAR(20),
+                cikti INT DEFAULT 0,
+                kalite INT DEFAULT 0,
+                strateji INT DEFAULT 0,
+                inovasyon INT DEFAULT 0,
+                zaman DOUBLE DEFAULT 0,
+                ekstra INT DEFAULT 0,
+                ekstra_aciklama TEXT,
+                toplam_skor DOUBLE DEFAULT 0,
+                tarih DATE DEFAULT (CURRENT_DATE),
+                onay VARCHAR(50) DEFAULT 'Beklemede',
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (process_id) REFERENCES processes(id)
+            ) {_MYSQL_TABLE_OPTIONS}
+            """,
+            f"""
+            CREATE TABLE IF NOT EXISTS innovation_ideas (
+                id INT AUTO_INCREMENT PRIMARY KEY,
+                employee_sicil_no VARCHAR(20),
+                employee_name VARCHAR(100) NOT NULL,
+                idea TEXT NOT NULL,
+                description TEXT,
+                category VARCHAR(100),
+                created_at DATE DEFAULT (CURRENT_DATE),
+                status VARCHAR(50) DEFAULT 'Beklemede',
+                score INT DEFAULT 0,
+                reviewed_by VARCHAR(50),
+                reviewed_at DATETIME
+            ) {_MYSQL_TABLE_OPTIONS}
+            """,
+            f"""
+            CREATE TABLE IF NOT EXISTS projects (
+                id INT AUTO_INCREMENT PRIMARY KEY,
+                name VARCHAR(200) NOT NULL,
+                description TEXT,
+                start_date DATE DEFAULT (CURRENT_DATE),
+                end_date DATE DEFAULT (CURRENT_DATE),
+                status VARCHAR(50) DEFAULT 'Planning',
+                budget DOUBLE DEFAULT 0,
+                manager_sicil_no VARCHAR(20),
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            ) {_MYSQL_TABLE_OPTIONS}
+            """,
+        ],
+    },
+    {
+        'version': 2,
+        'description': "Sıcak sorgular için indeksler",
+        'sqlite': [
+            # fast_get_employees / get_employees_from_db: aktif çalışanlar Ad_Soyad sırasıyla
+            """
+            CREATE INDEX IF NOT EXISTS idx_employees_active_name
+            ON employees (Ad_Soyad, Sicil_No, Pozisyon, Departman, deleted)
+            WHERE deleted = 0 OR deleted IS NULL
+            """,
+            # get_employee_scores: employee_name üzerinde GROUP BY, tabloya dokunmadan
+            """
+            CREATE INDEX IF NOT EXISTS idx_process_scores_employee
+            ON process_scores (employee_name, toplam_skor, tarih, onay)
+            WHERE employee_name IS NOT NULL
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_process_scores_sicil ON process_scores (employee_sicil_no, tarih)",
+            "CREATE INDEX IF NOT EXISTS idx_logs_timestamp ON logs (timestamp)",
+            "CREATE INDEX IF NOT EXISTS idx_logs_username_timestamp ON logs (username, timestamp)",
+        ],
+        'mysql': [
+            _mysql_create_index('employees', 'idx_employees_active_name',
+                                'deleted, Ad_Soyad, Sicil_No, Pozisyon, Departman'),
+            _mysql_create_index('process_scores', 'idx_process_scores_employee',
+                                'employee_name, toplam_skor, tarih, onay'),
+            _mysql_create_index('process_scores', 'idx_process_scores_sicil', 'employee_sicil_no, tarih'),
+            _mysql_create_index('logs', 'idx_logs_timestamp', 'timestamp'),
+            _mysql_create_index('logs', 'idx_logs_username_timestamp', 'username, timestamp'),
+        ],
+    },
+    {
+        'version': 3,
+        'description': "Tetikleyicilerle güncel tutulan liderlik tablosu özeti",
+        'sqlite': [
+            _sqlite_add_column('process_scores', 'employee_key',
+                               "TEXT GENERATED ALWAYS AS (COALESCE(employee_sicil_no, employee_name)) VIRTUAL"),
+            "CREATE INDEX IF NOT EXISTS idx_process_scores_key ON process_scores (employee_key, tarih, id)",
+            """
+            CREATE TABLE IF NOT EXISTS employee_score_summary (
+                employee_sicil_no TEXT PRIMARY KEY,
+                employee_name TEXT,
+                score_count INTEGER NOT NULL DEFAULT 0,
+                score_sum REAL NOT NULL DEFAULT 0,
+                score_max REAL,
+                last_tarih DATE,
+                last_onay TEXT,
+                last_score_id INTEGER
+            )
+            """,
+            *_sqlite_score_summary_triggers(),
+            _rebuild_score_summary,
+        ],
+        'mysql': [
+            _mysql_add_column('process_scores', 'employee_key',
+                              "VARCHAR(100) AS (COALESCE(employee_sicil_no, employee_name)) STORED"),
+            _mysql_create_index('process_scores', 'idx_process_scores_key', 'employee_key, tarih, id'),
+            f"""
+            CREATE TABLE IF NOT EXISTS employee_score_summary (
+                employee_sicil_no VARCHAR(100) PRIMARY KEY,
+                employee_name VARCHAR(100),
+                score_count INT NOT NULL DEFAULT 0,
+                score_sum DOUBLE NOT NULL DEFAULT 0,
+                score_max DOUBLE,
+                last_tarih DATE,
+                last_onay VARCHAR(50),
+                last_score_id INT
+            ) {_MYSQL_TABLE_OPTIONS}
+            """,
+            *_mysql_score_summary_triggers(),
+            _rebuild_score_summary,
+        ],
+    },
+    {
+        'version': 4,
+        'description': "Sayfalı çalışan listesi için filtre indeksleri",
+        'sqlite': [
+            """
+            CREATE INDEX IF NOT EXISTS idx_employees_active_dept_name
+            ON employees (Departman, Ad_Soyad, Sicil_No, Pozisyon, deleted)
+            WHERE deleted = 0 OR deleted IS NULL
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS idx_employees_active_pos_name
+            ON employees (Pozisyon, Ad_Soyad, Sicil_No, Departman, deleted)
+            WHERE deleted = 0 OR deleted IS NULL
+            """,
+        ],
+        'mysql': [
+            _mysql_create_index('employees', 'idx_employees_active_dept_name',
+                                'Departman, deleted, Ad_Soyad, Sicil_No, Pozisyon'),
+            _mysql_create_index('employees', 'idx_employees_active_pos_name',
+                                'Pozisyon, deleted, Ad_Soyad, Sicil_No, Departman'),
+        ],
+    },
+    {
+        'version': 5,
+        'description': "Türkçe katlamalı çalışan adı arama indeksi",
+        'sqlite': [
+            _sqlite_add_column('employees', 'Ad_Soyad_norm',
+                               f"TEXT GENERATED ALWAYS AS ({turkish_fold_sql('Ad_Soyad', 'sqlite')}) VIRTUAL"),
+            "CREATE INDEX IF NOT EXISTS idx_employees_name_norm ON employees (Ad_Soyad_norm)",
+            _sqlite_create_employee_fts,
+        ],
+        'mysql': [
+            _mysql_add_column('employees', 'Ad_Soyad_norm',
+                              f"VARCHAR(100) AS ({turkish_fold_sql('Ad_Soyad', 'mysql')}) STORED"),
+            _mysql_create_index('employees', 'idx_employees_name_norm', 'Ad_Soyad_norm'),
+            _mysql_create_index('employees', 'ftx_employees_name_norm', 'Ad_Soyad_norm', kind="FULLTEXT INDEX"),
+        ],
+    },
+    {
+        'version': 6,
+        'description': "Artımlı dışa aktarım filigranları",
+        'sqlite': [
+            """
+            CREATE TABLE IF NOT EXISTS export_watermarks (
+                name TEXT PRIMARY KEY,
+                watermark TEXT,
+                rows_exported INTEGER DEFAULT 0,
+                path TEXT,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """,
+            # logs.timestamp v2'de indekslendi
+            "CREATE INDEX IF NOT EXISTS idx_employees_updated_at ON employees (updated_at)",
+            "CREATE INDEX IF NOT EXISTS idx_process_scores_created_at ON process_scores (created_at)",
+            "CREATE INDEX IF NOT EXISTS idx_innovation_ideas_created_at ON innovation_ideas (created_at)",
+        ],
+        'mysql': [
+            f"""
+            CREATE TABLE IF NOT EXISTS export_watermarks (
+                name VARCHAR(100) PRIMARY KEY,
+                watermark VARCHAR(32),
+                rows_exported BIGINT DEFAULT 0,
+                path TEXT,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+            ) {_MYSQL_TABLE_OPTIONS}
+            """,
+            _mysql_create_index('employees', 'idx_employees_updated_at', 'updated_at'),
+            _mysql_create_index('process_scores', 'idx_process_scores_created_at', 'created_at'),
+            _mysql_create_index('innovation_ideas', 'idx_innovation_ideas_created_at', 'created_at'),
+        ],
+    },
+    {
+        'version': 7,
+        'description': "Oturum belirteci indeksi",
+        # auth.py önbellekte olmayan belirteci users.token üzerinden doğrular
+        'sqlite': [
+            "CREATE INDEX IF NOT EXISTS idx_users_token ON users (token)",
+        ],
+        'mysql': [
+            _mysql_create_index('users', 'idx_users_token', 'token'),
+        ],
+    },
+    {
+        'version': 8,
+        'description': "Departman/süreç/ay ve çalışan/ay skor özetleri",
+        'sqlite': [
+            f"""
+            CREATE TABLE IF NOT EXISTS score_rollup_dept_month (
+                process_id INTEGER NOT NULL,
+                month TEXT NOT NULL,
+                department TEXT NOT NULL DEFAULT '',
+                score_count INTEGER NOT NULL,
+                {_rollup_metric_columns('REAL', 'INTEGER')},
+                PRIMARY KEY (process_id, month)
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_rollup_dept_month ON score_rollup_dept_month (department, month)",
+            "CREATE INDEX IF NOT EXISTS idx_rollup_dept_month_month ON score_rollup_dept_month (month)",
+            f"""
+            CREATE TABLE IF NOT EXISTS score_rollup_employee_month (
+                employee_key TEXT NOT NULL,
+                month TEXT NOT NULL,
+                employee_name TEXT,
+                score_count INTEGER NOT NULL,
+                {_rollup_metric_columns('REAL', 'INTEGER')},
+                PRIMARY KEY (employee_key, month)
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_rollup_employee_month_month ON score_rollup_employee_month (month)",
+            """
+            CREATE TABLE IF NOT EXISTS rollup_state (
+                name TEXT PRIMARY KEY,
+                watermark TEXT,
+                refreshed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """,
+            # Etkilenen (süreç, ay) grubunu ham satırlardan yeniden hesaplamak için
+            "CREATE INDEX IF NOT EXISTS idx_process_scores_process_tarih ON process_scores (process_id, tarih)",
+        ],
+        'mysql': [
+            f"""
+            CREATE TABLE IF NOT EXISTS score_rollup_dept_month (
+                process_id INT NOT NULL,
+                month CHAR(7) NOT NULL,
+                department VARCHAR(100) NOT NULL DEFAULT '',
+                score_count INT NOT NULL,
+                {_rollup_metric_columns('DOUBLE', 'INT')},
+                PRIMARY KEY (process_id, month),
+                INDEX idx_rollup_dept_month (department, month),
+                INDEX idx_rollup_dept_month_month (month)
+            ) {_MYSQL_TABLE_OPTIONS}
+            """,
+            f"""
+            CREATE TABLE IF NOT EXISTS score_rollup_employee_month (
+                employee_key VARCHAR(100) NOT NULL,
+                month CHAR(7) NOT NULL,
+                employee_name VARCHAR(100),
+                score_count INT NOT NULL,
+                {_rollup_metric_columns('DOUBLE', 'INT')},
+                PRIMARY KEY (employee_key, month),
+                INDEX idx_rollup_employee_month_month (month)
+            ) {_MYSQL_TABLE_OPTIONS}
+            """,
+            f"""
+            CREATE TABLE IF NOT EXISTS rollup_state (
+                name VARCHAR(100) PRIMARY KEY,
+                watermark VARCHAR(32),
+                refreshed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+            ) {_MYSQL_TABLE_OPTIONS}
+            """,
+            _mysql_create_index('process_scores', 'idx_process_scores_process_tarih', 'process_id, tarih'),
+        ],
+    },
+    {
+        'version': 9,
+        'description': "Veritabanları arası kopyalama kontrol noktaları",
+        # replicate.py: hedefte kaynak+tablo başına kopyalanan son id (parçayla aynı transaction'da yazılır)
+        # ve ilk yüklemede kaldırılıp henüz kurulmamış ikincil indeksler
+        'sqlite': [
+            """
+            CREATE TABLE IF NOT EXISTS replication_state (
+                name TEXT PRIMARY KEY,
+                last_id INTEGER NOT NULL DEFAULT 0,
+                rows_copied INTEGER NOT NULL DEFAULT 0,
+                pending_indexes TEXT,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """,
+        ],
+        'mysql': [
+            f"""
+            CREATE TABLE IF NOT EXISTS replication_state (
+                name VARCHAR(255) PRIMARY KEY,
+                last_id BIGINT NOT NULL DEFAULT 0,
+                rows_copied BIGINT NOT NULL DEFAULT 0,
+                pending_indexes TEXT,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+            ) {_MYSQL_TABLE_OPTIONS}
+            """,
+        ],
+    },
+    {
+        'version': 10,
+        'description': "Yönetim hiyerarşisi kapanış tablosu ve değişiklik kuyruğu",
+        # org_hierarchy.py: (hat, üst, ast) birincil anahtarı "X'in altındakiler" ve
+        # "Y, X'in zincirinde mi" sorgularını, (hat, ast, derinlik) indeksi üst zinciri karşılar
+        'sqlite': [
+            """
+            CREATE TABLE IF NOT EXISTS org_hierarchy (
+                line INTEGER NOT NULL,
+                ancestor_id INTEGER NOT NULL,
+                descendant_id INTEGER NOT NULL,
+                depth INTEGER NOT NULL,
+                PRIMARY KEY (line, ancestor_id, descendant_id)
+            ) WITHOUT ROWID
+            """,
+            ORG_HIERARCHY_INDEX_SQL,
+            # Döngü yüzünden bağlanamamış çalışanlar; her artımlı yenilemede yeniden denenir
+            """
+            CREATE TABLE IF NOT EXISTS org_hierarchy_cycles (
+                line INTEGER NOT NULL,
+                employee_id INTEGER NOT NULL,
+                PRIMARY KEY (line, employee_id)
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS org_hierarchy_queue (
+                id INTEGER PRIMARY KEY,
+                employee_id INTEGER,
+                ad_soyad TEXT,
+                queued_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """,
+            # Adı değişen/silinen yöneticinin astlarını bulmak için
+            """
+            CREATE INDEX IF NOT EXISTS idx_employees_active_manager ON employees (Yonetici_Adi)
+            WHERE deleted = 0 OR deleted IS NULL
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS idx_employees_active_hr_manager ON employees (IK_Yonetici_Adi)
+            WHERE deleted = 0 OR deleted IS NULL
+            """,
+            *_sqlite_org_hierarchy_triggers(),
+            ORG_HIERARCHY_REBUILD_SQL,
+        ],
+        'mysql': [
+            f"""
+            CREATE TABLE IF NOT EXISTS org_hierarchy (
+                line TINYINT NOT NULL,
+                ancestor_id INT NOT NULL,
+                descendant_id INT NOT NULL,
+                depth SMALLINT NOT NULL,
+                PRIMARY KEY (line, ancestor_id, descendant_id),
+                INDEX idx_org_hierarchy_descendant (line, descendant_id, depth)
+            ) {_MYSQL_TABLE_OPTIONS}
+            """,
+            f"""
+            CREATE TABLE IF NOT EXISTS org_hierarchy_cycles (
+                line TINYINT NOT NULL,
+                employee_id INT NOT NULL,
+                PRIMARY KEY (line, employee_id)
+            ) {_MYSQL_TABLE_OPTIONS}
+            """,
+            f"""
+            CREATE TABLE IF NOT EXISTS org_hierarchy_queue (
+                id BIGINT AUTO_INCREMENT PRIMARY KEY,
+                employee_id INT,
+                ad_soyad VARCHAR(100),
+                queued_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            ) {_MYSQL_TABLE_OPTIONS}
+            """,
+            _mysql_create_index('employees', 'idx_employees_active_manager', 'Yonetici_Adi, deleted'),
+            _mysql_create_index('employees', 'idx_employees_active_hr_manager', 'IK_Yonetici_Adi, deleted'),
+            *_mysql_org_hierarchy_triggers(),
+            ORG_HIERARCHY_REBUILD_SQL,
+        ],
+    },
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1]['version']
+
+def _ensure_schema_version_table(cursor, backend):
+    if backend == 'mysql':
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INT PRIMARY KEY,
+                description VARCHAR(255),
+                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            ) {_MYSQL_TABLE_OPTIONS}
+        """)
+    else:
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INTEGER PRIMARY KEY,
+                description TEXT,
+                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+def get_schema_version():
+    """Veritabanına uygulanmış en son migrasyon sürümü (tablo yoksa 0)"""
+    try:
+        return fetch_scalar("SELECT MAX(version) FROM schema_version", default=0)
+    except Exception:
+        return 0
+
+def apply_migrations(conn, backend, target_version=None):
+    """Verilen bağlantıda bekleyen migrasyonları uygula (etkin veritabanı dışındaki hedefler için de)"""
+    target_version = SCHEMA_VERSION if target_version is None else target_version
+    placeholder = '%s' if backend == 'mysql' else '?'
+    applied = []
+    cursor = conn.cursor()
+    _ensure_schema_version_table(cursor, backend)
+    conn.commit()
+    cursor.execute("SELECT version FROM schema_version")
+    done = {row[0] for row in cursor.fetchall()}
+
+    for migration in MIGRATIONS:
+        version = migration['version']
+        if version in done or version > target_version:
+            continue
+        logger.info(f"Migrasyon uygulanıyor: v{version} - {migration['description']}")
+        for step in migration[backend]:
+            if callable(step):
+                step(cursor)
+            else:
+                cursor.execute(step)
+        cursor.execute(
+            f"INSERT INTO schema_version (version, description) VALUES ({placeholder}, {placeholder})",
+            (version, migration['description']),
+        )
+        conn.commit()
+        applied.append(version)
+    return applied
+
+def run_migrations(target_version=None):
+    """Bekleyen migrasyonları sırayla uygula; uygulanan sürümleri döndürür"""
+    global _schema_dtype_families
+    backend = 'mysql' if DATABASE_TYPE == 'mysql' else 'sqlite'
+    with db_manager.get_connection() as conn:
+        applied = apply_migrations(conn, backend, target_version)
+    if applied:
+        _schema_dtype_families = None
+        invalidate_tables()
+    if target_version is None:
+        ensure_derived_triggers()
+    return applied
+
+def create_tables():
+    """Şemayı migrasyonlarla güncel sürüme getir"""
+    if DATABASE_TYPE == 'sqlite':
+        db_manager.ensure_directories()
+    try:
+        applied = run_migrations()
+        if applied:
+            st.success(f"✅ Veritabanı şeması güncellendi (v{applied[-1]})!")
+        logger.info(f"Veritabanı şeması güncel: v{SCHEMA_VERSION} (uygulanan: {applied or 'yok'})")
+        return True
+    except Exception as e:
+        st.error(f"❌ Tablo oluşturma/migrasyon hatası: {e}")
+        logger.error(f"Tablo oluşturma/migrasyon hatası: {e}")
+        return False
+
+# =============================================================================
+# SORGU PLANI KONTROLÜ
+# =============================================================================
+
+QUERY_PLAN_REGISTRY = {}
+
+def register_query_plan(name, query, params=(), allow_scan=()):
+    """Sıcak sorguyu plan kontrolüne kaydet; sorgu metnini aynen döndürür.
+
+    `allow_scan`, tamamının okunması beklenen küçük tablolardır (ör. özet tablolar).
+    """
+    QUERY_PLAN_REGISTRY[name] = (query, tuple(params), tuple(allow_scan))
+    return query
+
+def explain_query(query, params=()):
+    """Sorgunun planını satır listesi olarak döndür (SQLite: EXPLAIN QUERY PLAN)"""
+    if DATABASE_TYPE == 'mysql':
+        rows = execute_query("EXPLAIN " + query.replace('?', '%s'), params) or []
+        return [
+            f"{row.get('table')}: type={row.get('type')} key={row.get('key')} extra={row.get('Extra')}"
+            for row in rows
+        ]
+    with db_manager.get_connection(readonly=True) as conn:
+        rows = conn.execute("EXPLAIN QUERY PLAN " + query, params).fetchall()
+    return [row[3] for row in rows]
+
+def _is_full_scan(plan_line, allow_scan=()):
+    if DATABASE_TYPE == 'mysql':
+        table = plan_line.split(":", 1)[0]
+        return "type=ALL" in plan_line and table not in allow_scan
+    # "SCAN employees" tam tablo taraması; "SCAN ... USING INDEX" indeks taramasıdır
+    if not plan_line.startswith("SCAN ") or " USING " in plan_line:
+        return False
+    return plan_line.split()[1] not in allow_scan
+
+def check_query_plans():
+    """Kayıtlı tüm sorguların planını çıkar; tam tablo taramasına düşenleri döndür.
+
+    Dönüş: (planlar, regresyonlar) — planlar {ad: [satırlar]}, regresyonlar
+    {ad: [tam tarama satırları]}.
+    """
+    plans, regressions = {}, {}
+    for name, (query, params, allow_scan) in sorted(QUERY_PLAN_REGISTRY.items()):
+        plan = explain_query(query, params)
+        plans[name] = plan
+        scans = [line for line in plan if _is_full_scan(line, allow_scan)]
+        if scans:
+            regressions[name] = scans
+    return plans, regressions
+
+def rebuild_score_summary():
+    """Liderlik tablosu özetini process_scores'tan baştan oluştur"""
+    with db_manager.get_connection() as conn:
+        cursor = conn.cursor()
+        if DATABASE_TYPE == 'mysql' and conn.autocommit:
+            conn.start_transaction()
+        _rebuild_score_summary(cursor)
+        conn.commit()
+    invalidate_tables('employee_score_summary')
+    count = fetch_scalar("SELECT COUNT(*) FROM employee_score_summary", default=0)
+    logger.info(f"Liderlik tablosu özeti yeniden oluşturuldu: {count} çalışan")
+    return count
+
+_SCORE_SUMMARY_TRIGGERS = (
+    "trg_process_scores_summary_ins",
+    "trg_process_scores_summary_upd",
+    "trg_process_scores_summary_move",
+    "trg_process_scores_summary_del",
+)
+
+@contextmanager
+def score_summary_bulk_mode():
+    """Toplu skor yazımı süresince özet tetikleyicilerini kaldır, sonunda özeti yeniden kur.
+
+    Güncelleme tetikleyicisi her satırda çalışanın özetini baştan hesaplar;
+    milyonlarca satırlık yeniden puanlamada bu asıl maliyettir. Özet sonda
+    tek bir pencere sorgusuyla oluşturulur; bu sürede başka oturumların
+    yazdığı skorlar da dahil olur. Süreç arada ölürse tetikleyiciler sonraki
+    açılışta ensure_derived_triggers() ile geri kurulur.
+    """
+    with db_manager.get_connection() as conn:
+        cursor = conn.cursor()
+        for trigger in _SCORE_SUMMARY_TRIGGERS:
+            cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        conn.commit()
     try:
+        yield
+    finally:
         with db_manager.get_connection() as conn:
             cursor = conn.cursor()
-            
-            # Users tablosu
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS users (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    username TEXT UNIQUE NOT NULL,
-                    password TEXT NOT NULL,
-                    role TEXT NOT NULL DEFAULT 'calisan',
-                    email TEXT,
-                    score INTEGER DEFAULT 0,
-                    last_login TEXT,
-                    token TEXT,
-                    employee_sicil_no TEXT,
-                    department TEXT,
-                    deleted INTEGER DEFAULT 0,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-
-            # Employees tablosu
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS employees (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    Ad_Soyad TEXT NOT NULL,
-                    Pozisyon TEXT NOT NULL,
-                    Departman TEXT NOT NULL,
-                    Yonetici_Adi TEXT,
-                    IK_Yonetici_Adi TEXT,
-                    Email TEXT,
-                    Sicil_No TEXT UNIQUE NOT NULL,
-                    İşe_Giriş_Tarihi DATE,
-                    Telefon TEXT,
-                    Adres TEXT,
-                    Dogum_Tarihi DATE,
-                    Egitim TEXT,
-                    Sertifikalar TEXT,
-                    Yetenekler TEXT,
-                    deleted INTEGER DEFAULT 0,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-
-            # Diğer tabloları da ekle...
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS processes (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    process_name TEXT NOT NULL,
-                    description TEXT,
-                    department TEXT,
-                    created_at DATE DEFAULT CURRENT_DATE,
-                    score INTEGER DEFAULT 0,
-                    weight REAL DEFAULT 1.0,
-                    deleted INTEGER DEFAULT 0
+            if DATABASE_TYPE == 'mysql':
+                for statement in _mysql_score_summary_triggers():
+                    cursor.execute(statement)
+            else:
+                for statement in _sqlite_score_summary_triggers():
+                    cursor.execute(statement)
+            conn.commit()
+        rebuild_score_summary()
+
+# Tetikleyiciyle güncel tutulan türetilmiş tablolar. Toplu modlar tetikleyicileri
+# kaldırıp commit eder ve çıkışta geri kurar; süreç arada ölürse tetikleyiciler
+# eksik kalır ve tablo sessizce eskir. ensure_derived_triggers() açılışta eksik
+# grubun tetikleyicilerini kurar ve türetilmiş tabloyu baştan oluşturur.
+# 'setup(cursor, backend)' tetikleyicileri (yeniden) kurup tabloyu yeniden oluşturur.
+DERIVED_TRIGGER_GROUPS = [
+    {
+        'table': 'employees_fts',
+        'triggers': _EMPLOYEE_FTS_TRIGGERS,
+        'backends': ('sqlite',),
+        'setup': lambda cursor, backend: _sqlite_create_employee_fts(cursor),
+    },
+    {
+        'table': 'employee_score_summary',
+        'triggers': _SCORE_SUMMARY_TRIGGERS,
+        'backends': ('sqlite', 'mysql'),
+        'setup': lambda cursor, backend: _restore_score_summary(cursor, backend),
+    },
+    {
+        'table': 'org_hierarchy',
+        'triggers': _ORG_HIERARCHY_TRIGGERS,
+        'backends': ('sqlite', 'mysql'),
+        'setup': lambda cursor, backend: _restore_org_hierarchy_triggers(cursor, backend),
+    },
+]
+
+def _restore_org_hierarchy_triggers(cursor, backend):
+    """Hiyerarşi tetikleyicilerini kur ve tam yeniden kurulumu kuyruğa yaz (kapanış yenilemede kurulur)"""
+    statements = _mysql_org_hierarchy_triggers() if backend == 'mysql' else _sqlite_org_hierarchy_triggers()
+    for statement in statements:
+        cursor.execute(statement)
+    cursor.execute(ORG_HIERARCHY_REBUILD_SQL)
+
+def _restore_score_summary(cursor, backend):
+    statements = _mysql_score_summary_triggers() if backend == 'mysql' else _sqlite_score_summary_triggers()
+    for statement in statements:
+        cursor.execute(statement)
+    _rebuild_score_summary(cursor)
+
+def _catalog_names(cursor, backend):
+    """Veritabanındaki (tablo adları, tetikleyici adları)"""
+    if backend == 'mysql':
+        cursor.execute("SELECT TABLE_NAME FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE()")
+        tables = {row[0] for row in cursor.fetchall()}
+        cursor.execute("SELECT TRIGGER_NAME FROM information_schema.TRIGGERS WHERE TRIGGER_SCHEMA = DATABASE()")
+        return tables, {row[0] for row in cursor.fetchall()}
+    cursor.execute("SELECT type, name FROM sqlite_master WHERE type IN ('table', 'trigger')")
+    rows = cursor.fetchall()
+    return ({name for kind, name in rows if kind == 'table'},
+            {name for kind, name in rows if kind == 'trigger'})
+
+def ensure_derived_triggers():
+    """Eksik türetilmiş tablo tetikleyicilerini kur; yeniden kurulan tabloları döndür.
+
+    İdempotenttir: tüm tetikleyiciler yerindeyse yalnızca katalog okunur.
+    Başka bir süreç o anda toplu moddaysa tetikleyiciler erken geri gelir;
+    toplu mod sonunda tablo yine baştan kurulduğundan sonuç doğru kalır.
+    """
+    backend = 'mysql' if DATABASE_TYPE == 'mysql' else 'sqlite'
+    restored = []
+    with db_manager.get_connection() as conn:
+        cursor = conn.cursor()
+        tables, triggers = _catalog_names(cursor, backend)
+        for group in DERIVED_TRIGGER_GROUPS:
+            if (backend not in group['backends'] or group['table'] not in tables
+                    or set(group['triggers']) <= triggers):
+                continue
+            logger.warning(f"{group['table']} tetikleyicileri eksik (yarıda kalmış toplu işlem?), yeniden kuruluyor.")
+            group['setup'](cursor, backend)
+            restored.append(group['table'])
+        conn.commit()
+    if restored:
+        invalidate_tables(*restored)
+    return restored
+
+def drop_derived_triggers(cursor):
+    """Özet, arama ve hiyerarşi tetikleyicilerini verilen bağlantıda kaldır (etkin olmayan hedefler için, bkz. replicate.py)"""
+    for trigger in _SCORE_SUMMARY_TRIGGERS + _EMPLOYEE_FTS_TRIGGERS + _ORG_HIERARCHY_TRIGGERS:
+        cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+
+def restore_derived_triggers(cursor, backend):
+    """Tetikleyicileri yeniden kur; liderlik özetini ve (SQLite) arama indeksini baştan oluştur.
+
+    Yönetim hiyerarşisi için yalnızca tam yeniden kurulum kuyruğa yazılır;
+    kapanış hedefte `manage.py refresh-org-hierarchy` ile oluşturulur.
+    """
+    _restore_score_summary(cursor, backend)
+    _restore_org_hierarchy_triggers(cursor, backend)
+    if backend != 'mysql':
+        _sqlite_create_employee_fts(cursor)
+
+register_query_plan("logs_recent", """
+    SELECT id, username, action, timestamp, details, table_name, record_id
+    FROM logs
+    WHERE timestamp >= ?
+    ORDER BY timestamp DESC
+    LIMIT 200
+""", ("2000-01-01",))
+
+register_query_plan("logs_by_user", """
+    SELECT id, username, action, timestamp, details, table_name, record_id
+    FROM logs
+    WHERE username = ?
+    ORDER BY timestamp DESC
+    LIMIT 200
+""", ("admin",))
+
+# =============================================================================
+# SAYFALI ÇALIŞAN LİSTESİ (KEYSET)
+# =============================================================================
+#
+# OFFSET yerine (Ad_Soyad, Sicil_No) üzerinden keyset sayfalama: her sayfa
+# indeksten doğrudan okunur, sayfa numarası büyüdükçe yavaşlamaz. İmleç, son
+# satırın anahtarını taşıyan opak bir metindir.
+
+EMPLOYEE_PAGE_COLUMNS = """
+    Sicil_No as sicil_no, Ad_Soyad as ad_soyad, Pozisyon as pozisyon, Departman as departman
+"""
+
+def encode_page_cursor(ad_soyad, sicil_no):
+    payload = json.dumps([ad_soyad, sicil_no], ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii")
+
+def decode_page_cursor(cursor):
+    ad_soyad, sicil_no = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8"))
+    return ad_soyad, sicil_no
+
+def _employee_filters(departman=None, pozisyon=None):
+    ph = sql_placeholder()
+    clauses, params = ["(deleted = 0 OR deleted IS NULL)"], []
+    if departman:
+        clauses.append(f"Departman = {ph}")
+        params.append(departman)
+    if pozisyon:
+        clauses.append(f"Pozisyon = {ph}")
+        params.append(pozisyon)
+    return clauses, params
+
+def fetch_employee_page(cursor=None, page_size=50, departman=None, pozisyon=None):
+    """Aktif çalışanların bir sayfasını döndür.
+
+    Dönüş: {'rows': DataFrame, 'next_cursor': sonraki sayfanın imleci ya da None}
+    """
+    ph = sql_placeholder()
+    clauses, params = _employee_filters(departman, pozisyon)
+    if cursor:
+        last_name, last_sicil = decode_page_cursor(cursor)
+        # İlk sütunda aralık koşulu indeks taramasını başlatır, ikincisi eşitliği çözer
+        clauses.append(f"Ad_Soyad >= {ph} AND (Ad_Soyad > {ph} OR Sicil_No > {ph})")
+        params.extend([last_name, last_name, last_sicil])
+
+    query = f"""
+        SELECT {EMPLOYEE_PAGE_COLUMNS}
+        FROM employees
+        WHERE {' AND '.join(clauses)}
+        ORDER BY Ad_Soyad, Sicil_No
+        LIMIT {int(page_size) + 1}
+    """
+    df = get_dataframe(query, tuple(params), optimize_dtypes=True)
+    next_cursor = None
+    if len(df) > page_size:
+        df = df.iloc[:page_size]
+        last = df.iloc[-1]
+        next_cursor = encode_page_cursor(last['ad_soyad'], last['sicil_no'])
+    return {'rows': df, 'next_cursor': next_cursor}
+
+def estimate_employee_count(departman=None, pozisyon=None):
+    """Aktif çalışan sayısı için ucuz tahmin: (sayı, kesin_mi).
+
+    Filtresiz listede ANALYZE istatistiği (SQLite) ya da information_schema
+    (MySQL) kullanılır; filtreli sayımlar kısmi indeks üzerinden yapılır.
+    """
+    if not departman and not pozisyon:
+        try:
+            if DATABASE_TYPE == 'mysql':
+                estimate = fetch_scalar(
+                    "SELECT TABLE_ROWS FROM information_schema.TABLES "
+                    "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'employees'"
                 )
-            """)
-
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS logs (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    username TEXT,
-                    action TEXT NOT NULL,
-                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    details TEXT,
-                    ip_address TEXT,
-                    user_agent TEXT,
-                    table_name TEXT,
-                    record_id TEXT
+            elif fetch_scalar("SELECT COUNT(*) FROM sqlite_master WHERE name = 'sqlite_stat1'", default=0):
+                # sqlite_stat1 ANALYZE çalışana kadar yoktur
+                stat = fetch_scalar(
+                    "SELECT stat FROM sqlite_stat1 WHERE idx = 'idx_employees_active_name'"
                 )
-            """)
+                estimate = int(stat.split()[0]) if stat else None
+            else:
+                estimate = None
+            if estimate is not None:
+                return int(estimate), False
+        except Exception as e:
+            logger.warning(f"Çalışan sayısı tahmini alınamadı: {e}")
+    clauses, params = _employee_filters(departman, pozisyon)
+    count = fetch_scalar(f"SELECT COUNT(*) FROM employees WHERE {' AND '.join(clauses)}", tuple(params), 0)
+    return int(count), True
 
-            conn.commit()
-            st.success("✅ SQLite tabloları başarıyla oluşturuldu!")
-            logger.info("SQLite tabloları başarıyla oluşturuldu.")
-            success = True
+def get_employee_filter_options():
+    """Sayfalı liste filtreleri için departman ve pozisyon değerleri"""
+    active = "WHERE deleted = 0 OR deleted IS NULL"
+    departments = [r[0] if not isinstance(r, dict) else r['Departman'] for r in
+                   execute_query(f"SELECT DISTINCT Departman FROM employees {active} ORDER BY Departman") or []]
+    positions = [r[0] if not isinstance(r, dict) else r['Pozisyon'] for r in
+                 execute_query(f"SELECT DISTINCT Pozisyon FROM employees {active} ORDER BY Pozisyon") or []]
+    return departments, positions
 
-    except Exception as e:
-        st.error(f"❌ SQLite tablo oluşturma hatası: {e}")
-        logger.error(f"SQLite tablo oluşturma hatası: {e}")
-    return success
+register_query_plan("employee_page", f"""
+    SELECT {EMPLOYEE_PAGE_COLUMNS}
+    FROM employees
+    WHERE (deleted = 0 OR deleted IS NULL) AND Ad_Soyad >= ? AND (Ad_Soyad > ? OR Sicil_No > ?)
+    ORDER BY Ad_Soyad, Sicil_No
+    LIMIT 51
+""", ("M", "M", "0"))
+
+register_query_plan("employee_page_by_department", f"""
+    SELECT {EMPLOYEE_PAGE_COLUMNS}
+    FROM employees
+    WHERE (deleted = 0 OR deleted IS NULL) AND Departman = ? AND Ad_Soyad >= ? AND (Ad_Soyad > ? OR Sicil_No > ?)
+    ORDER BY Ad_Soyad, Sicil_No
+    LIMIT 51
+""", ("IT", "M", "M", "0"))
+
+# =============================================================================
+# ÇALIŞAN ARAMA
+# =============================================================================
+
+EMPLOYEE_DETAIL_COLUMNS = "e.Sicil_No, e.Ad_Soyad, e.Pozisyon, e.Departman, e.Email, e.Yonetici_Adi"
+MYSQL_FULLTEXT_MIN_TOKEN = 3  # innodb_ft_min_token_size
+_fts_available = None
+
+def fetch_dicts(query, params=None):
+    """Sorgu sonucunu her iki veritabanında da sözlük listesi olarak döndür"""
+    if DATABASE_TYPE == 'mysql':
+        return execute_query(query, params) or []
+    with db_manager.get_connection(readonly=True) as conn:
+        cursor = conn.execute(query, params or ())
+        columns = [c[0] for c in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+def _employee_fts_available():
+    global _fts_available
+    if _fts_available is None:
+        _fts_available = bool(fetch_scalar(
+            "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = 'employees_fts'", default=0
+        ))
+    return _fts_available
+
+def _search_tokens(term):
+    return [tok for tok in re.split(r"[^0-9a-z\u00c0-\uffff]+", fold_turkish(term)) if tok]
+
+def get_employee_by_sicil(sicil_no):
+    ph = sql_placeholder()
+    rows = fetch_dicts(f"""
+        SELECT {EMPLOYEE_DETAIL_COLUMNS}
+        FROM employees e
+        WHERE e.Sicil_No = {ph} AND (e.deleted = 0 OR e.deleted IS NULL)
+    """, (sicil_no,))
+    return rows[0] if rows else None
+
+def search_employees(term, limit=10):
+    """Çalışan adında Türkçe duyarlı arama; en iyi eşleşmeler önce.
+
+    Sıralama üç kademelidir ve her kademe yalnızca gerektiğinde çalışır:
+    1. Adın tamamı aranan metinle başlayanlar (Ad_Soyad_norm indeks aralığı),
+    2. Her kelimesi bir ad kelimesiyle başlayanlar (SQLite FTS5 bm25 / MySQL FULLTEXT
+       ilgi puanına göre),
+    3. Hiç eşleşme yoksa kelime içi arama (LIKE '%x%').
+    Kademeler LIMIT ile erken kesildiği için yazarken arama milisaniyeler içinde döner.
+    """
+    tokens = _search_tokens(term)
+    if not tokens:
+        return []
+    folded = " ".join(tokens)
+    ph = sql_placeholder()
+    limit = int(limit)
 
-def create_tables():
     if DATABASE_TYPE == 'mysql':
-        # MySQL tablo oluşturma kodu...
-        pass
+        # utf8mb4_unicode_ci sıralamasında "\uffff" üst sınırı güvenilir değil; LIKE önek aralığına çevrilir
+        prefix_filter, prefix_params = f"e.Ad_Soyad_norm LIKE {ph}", (folded + "%",)
     else:
-        return create_sqlite_tables()
+        prefix_filter, prefix_params = f"e.Ad_Soyad_norm >= {ph} AND e.Ad_Soyad_norm < {ph}", (folded, folded + "\uffff")
+    rows = fetch_dicts(f"""
+        SELECT {EMPLOYEE_DETAIL_COLUMNS}
+        FROM employees e
+        WHERE {prefix_filter}
+          AND (e.deleted = 0 OR e.deleted IS NULL)
+        ORDER BY e.Ad_Soyad_norm
+        LIMIT {limit}
+    """, prefix_params)
+
+    if len(rows) < limit:
+        word_rows = []
+        if DATABASE_TYPE == 'mysql':
+            if all(len(tok) >= MYSQL_FULLTEXT_MIN_TOKEN for tok in tokens):
+                match = " ".join(f"+{tok}*" for tok in tokens)
+                word_rows = fetch_dicts(f"""
+                    SELECT {EMPLOYEE_DETAIL_COLUMNS}
+                    FROM employees e
+                    WHERE MATCH(e.Ad_Soyad_norm) AGAINST ({ph} IN BOOLEAN MODE)
+                      AND (e.deleted = 0 OR e.deleted IS NULL)
+                    ORDER BY MATCH(e.Ad_Soyad_norm) AGAINST ({ph} IN BOOLEAN MODE) DESC, e.Ad_Soyad_norm
+                    LIMIT {limit * 2}
+                """, (match, match))
+        elif _employee_fts_available():
+            word_rows = fetch_dicts(f"""
+                SELECT {EMPLOYEE_DETAIL_COLUMNS}
+                FROM employees_fts f
+                JOIN employees e ON e.id = f.rowid
+                WHERE employees_fts MATCH {ph} AND (e.deleted = 0 OR e.deleted IS NULL)
+                ORDER BY bm25(employees_fts), e.Ad_Soyad_norm
+                LIMIT {limit * 2}
+            """, (" ".join(f'"{tok}"*' for tok in tokens),))
+        seen = {row['Sicil_No'] for row in rows}
+        for row in word_rows:
+            if len(rows) >= limit:
+                break
+            if row['Sicil_No'] not in seen:
+                seen.add(row['Sicil_No'])
+                rows.append(row)
+
+    if rows:
+        return rows
+    return fetch_dicts(f"""
+        SELECT {EMPLOYEE_DETAIL_COLUMNS}
+        FROM employees e
+        WHERE e.Ad_Soyad_norm LIKE {ph} AND (e.deleted = 0 OR e.deleted IS NULL)
+        ORDER BY e.Ad_Soyad_norm
+        LIMIT {limit}
+    """, (f"%{folded}%",))
+
+@contextmanager
+def employee_search_bulk_mode():
+    """Toplu yazma süresince FTS ve hiyerarşi tetikleyicilerini kaldır, sonunda toplu kur.
+
+    Satır satır FTS güncellemesi toplu aktarımda asıl maliyettir; 'rebuild'
+    tüm tabloyu tek geçişte indeksler. Bu sürede başka oturumların yaptığı
+    değişiklikler de rebuild'e dahil olur. MySQL FULLTEXT için gerek yoktur.
+    Hiyerarşi kuyruğuna satır başına kayıt yerine sonda tek bir tam yeniden
+    kurulum isteği yazılır. Süreç arada ölürse tetikleyiciler sonraki açılışta
+    ensure_derived_triggers() ile geri kurulur.
+    """
+    backend = 'mysql' if DATABASE_TYPE == 'mysql' else 'sqlite'
+    fts = backend == 'sqlite' and _employee_fts_available()
+    with db_manager.get_connection() as conn:
+        cursor = conn.cursor()
+        for trigger in _ORG_HIERARCHY_TRIGGERS + (_EMPLOYEE_FTS_TRIGGERS if fts else ()):
+            cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        conn.commit()
+    try:
+        yield
+    finally:
+        with db_manager.get_connection() as conn:
+            cursor = conn.cursor()
+            _restore_org_hierarchy_triggers(cursor, backend)
+            if fts:
+                _sqlite_create_employee_fts(cursor)
+            conn.commit()
+        if fts:
+            invalidate_tables('employees_fts')
+            logger.info("Çalışan arama indeksi yeniden oluşturuldu.")
+
+register_query_plan("employee_search_prefix", f"""
+    SELECT {EMPLOYEE_DETAIL_COLUMNS}
+    FROM employees e
+    WHERE e.Ad_Soyad_norm >= ? AND e.Ad_Soyad_norm < ? AND (e.deleted = 0 OR e.deleted IS NULL)
+    ORDER BY e.Ad_Soyad_norm
+    LIMIT 10
+""", ("ali", "ali\uffff"))
+
+# =============================================================================
+# VERİTABANI BAŞLATMA
+# =============================================================================
 
 def insert_default_data():
     try:
@@ -497,32 +3223,51 @@ def insert_default_data():
             ("gmy", hashlib.sha256("gmy123".encode()).hexdigest(), "gmy", "gmy@effinova.com", "GMY001", "İKMAL ve OPERASYON GMY")
         ]
 
-        for username, password, role, email, employee_sicil_no, department in default_users:
-            try:
-                if DATABASE_TYPE == 'mysql':
-                    query = "INSERT IGNORE INTO users (username, password, role, email, employee_sicil_no, department) VALUES (%s, %s, %s, %s, %s, %s)"
-                else:
-                    query = "INSERT OR IGNORE INTO users (username, password, role, email, employee_sicil_no, department) VALUES (?, ?, ?, ?, ?, ?)"
-                execute_query(query, (username, password, role, email, employee_sicil_no, department), fetch=False)
-                logger.info(f"Varsayılan kullanıcı eklendi/güncellendi: {username}")
-            except Exception as e:
-                logger.warning(f"Kullanıcı eklenirken hata: {e}")
+        if DATABASE_TYPE == 'mysql':
+            query = "INSERT IGNORE INTO users (username, password, role, email, employee_sicil_no, department) VALUES (%s, %s, %s, %s, %s, %s)"
+        else:
+            query = "INSERT OR IGNORE INTO users (username, password, role, email, employee_sicil_no, department) VALUES (?, ?, ?, ?, ?, ?)"
+        try:
+            inserted = execute_many(query, default_users)
+        except Exception as e:
+            inserted = 0
+            logger.warning(f"Kullanıcılar eklenirken hata: {e}")
 
-        st.success("✅ Varsayılan veriler eklendi!")
-        logger.info("Varsayılan veriler eklendi.")
+        if inserted:
+            st.success("✅ Varsayılan veriler eklendi!")
+            logger.info(f"Varsayılan kullanıcılar eklendi: {inserted}")
 
     except Exception as e:
         st.error(f"❌ Varsayılan veri ekleme hatası: {e}")
         logger.error(f"Varsayılan veri ekleme hatası: {e}")
 
+def database_key():
+    """Bağlı veritabanının kimliği (önbellek anahtarları için)"""
+    if DATABASE_TYPE == 'mysql':
+        return f"mysql://{MYSQL_CONFIG['host']}:{MYSQL_CONFIG['port']}/{MYSQL_CONFIG['database']}"
+    return f"sqlite://{SQLITE_DB_PATH}"
+
 def initialize_database():
-    if test_connection():
-        create_tables_success = create_tables()
-        if create_tables_success:
-            insert_default_data()
-            return True
-        else:
-            logger.error("Tablolar oluşturulamadığı için veritabanı başlatılamadı.")
-            return False
-    logger.error("Veritabanı bağlantı testi başarısız olduğu için başlatılamadı.")
-    return False
\ No newline at end of file
+    """Bağlantıyı doğrula, şemayı güncelle ve varsayılan verileri ekle.
+
+    Şema zaten güncel sürümdeyse migrasyon adımları hiç çalıştırılmaz; yalnızca
+    türetilmiş tablo tetikleyicileri denetlenir (bkz. ensure_derived_triggers).
+    Panel bunu süreç başına bir kez çağırır (bkz. effinova_panel.bootstrap_database).
+    """
+    if not test_connection():
+        logger.error("Veritabanı bağlantı testi başarısız olduğu için başlatılamadı.")
+        return False
+    current = get_schema_version()
+    if current >= SCHEMA_VERSION:
+        logger.info(f"Veritabanı şeması zaten v{current}, migrasyon atlandı.")
+        ensure_derived_triggers()
+    elif not create_tables():
+        logger.error("Tablolar oluşturulamadığı için veritabanı başlatılamadı.")
+        return False
+    insert_default_data()
+    return True
+
+@versioned_cache(("users",), maxsize=1)
+def get_user_count():
+    """Toplam kullanıcı sayısı; users tablosuna yazılınca yenilenir"""
+    return fetch_scalar("SELECT COUNT(*) FROM users", default=0)
\ No newline at end of file
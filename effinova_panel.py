@@ -9,62 +9,38 @@ import random
 import json
 import uuid
 import pandas as pd
-import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-import time as time_module
 import hashlib
-try:
-    import psutil
-    PSUTIL_AVAILABLE = True
-except ImportError:
-    PSUTIL_AVAILABLE = False
-    psutil = None
+import functools
 
 # config.py'den import ediyoruz - TÜM VERİTABANI KODLARI ORADA
 import config
+import auth
+from lazy import lazy_import
+
+# Ağır kütüphaneler ve isteğe bağlı modüller ilk kullanıldıkları sekmede yüklenir.
+# `if not modul:` yalnızca kurulu olup olmadığına bakar, import etmez.
+np = lazy_import("numpy")
+px = lazy_import("plotly.express")
+go = lazy_import("plotly.graph_objects")
+psutil = lazy_import("psutil", optional=True)
+PSUTIL_AVAILABLE = bool(psutil)
 
 # Diğer modüller
-try:
-    import excel_to_db
-except ImportError:
-    excel_to_db = None
-try:
-    import employees
-except ImportError:
-    employees = None
-try:
-    import badges
-except ImportError:
-    badges = None
-try:
-    import users
-except ImportError:
-    users = None
-try:
-    import pdf_utils
-except ImportError:
-    pdf_utils = None
-try:
-    import permissions
-except ImportError:
-    permissions = None
-try:
-    import enhanced_project_management
-except ImportError:
-    enhanced_project_management = None
-try:
-    from enhanced_innovation import manage_innovation as _manage_innovation_func
-    innovation_module_available = True
-except ImportError:
-    innovation_module_available = False
-    _manage_innovation_func = None
-try:
-    from yasayan_surec_ekosistemi import YasayanSurecEkosistemi
-    yasayan_surec_available = True
-except ImportError:
-    yasayan_surec_available = False
-    YasayanSurecEkosistemi = None
+excel_to_db = lazy_import("excel_to_db", optional=True)
+exports = lazy_import("exports", optional=True)
+rollups = lazy_import("rollups", optional=True)
+org_hierarchy = lazy_import("org_hierarchy", optional=True)
+log_archive = lazy_import("log_archive", optional=True)
+employees = lazy_import("employees", optional=True)
+badges = lazy_import("badges", optional=True)
+users = lazy_import("users", optional=True)
+pdf_utils = lazy_import("pdf_utils", optional=True)
+permissions = lazy_import("permissions", optional=True)
+enhanced_project_management = lazy_import("enhanced_project_management", optional=True)
+enhanced_innovation = lazy_import("enhanced_innovation", optional=True)
+yasayan_surec_ekosistemi = lazy_import("yasayan_surec_ekosistemi", optional=True)
+innovation_module_available = bool(enhanced_innovation)
+yasayan_surec_available = bool(yasayan_surec_ekosistemi)
 
 # STREAMLIT CONFIG
 st.set_page_config(page_title="EFFINOVA Panel", layout="wide", page_icon="⭐")
@@ -104,8 +80,8 @@ DB_SYSTEM_CONFIGURED = False
 total_users = 0
 
 # PERFORMANCE PATCH
-if "performance_mode" not in st.session_state:
-    st.session_state.performance_mode = True
+if "employee_page_size" not in st.session_state:
+    st.session_state.employee_page_size = 50
 
 # SESSION STATE INIT
 if "user_role" not in st.session_state:
@@ -115,40 +91,72 @@ if "username" not in st.session_state:
 if "user_department" not in st.session_state:
     st.session_state["user_department"] = "IT"
 
+# SICAK SORGULAR - config.check_query_plans() ile plan regresyonu kontrol edilir
+# Tetikleyicilerle güncel tutulan özetten okur: O(çalışan), O(skor) değil
+EMPLOYEE_SCORES_QUERY = config.register_query_plan("get_employee_scores", """
+    SELECT employee_name as '[Ad Soyad]',
+            last_tarih AS son_tarih,
+            score_max AS son_skor,
+            ROUND(score_sum / NULLIF(score_count, 0), 2) AS ort_skor,
+            last_onay AS onay_durumu
+    FROM employee_score_summary
+    ORDER BY ort_skor DESC
+""", allow_scan=("employee_score_summary",))
+
+EMPLOYEE_LIST_QUERY = config.register_query_plan("get_employees_from_db", """
+    SELECT
+        Sicil_No as sicil_no,
+        Ad_Soyad as ad_soyad,
+        Pozisyon as pozisyon,
+        Departman as departman,
+        COALESCE(Yonetici_Adi, '') as yonetici,
+        COALESCE(Email, '') as email,
+        STRFTIME('%Y-%m-%d', İşe_Giriş_Tarihi) as ise_giris,
+        CASE WHEN deleted = 0 THEN 1 ELSE 0 END as aktif
+    FROM employees
+    WHERE deleted = 0 OR deleted IS NULL
+    ORDER BY Ad_Soyad
+""")
+
 # CACHE'Lİ FONKSİYONLAR
-@st.cache_data(ttl=300, max_entries=20)
-def fast_get_employees():
-    """Hızlı çalışan listesi - Cache'li"""
+# Sonuçlar okunan tabloların sürümüne bağlıdır: yazma yalnızca o tabloya bağlı
+# girdileri eskitir. TTL sadece başka süreçlerin (manage.py) yazmaları içindir.
+@config.versioned_cache(("employees",), maxsize=200, max_bytes=64 * 1024 * 1024, ttl=3600)
+def get_employee_page(cursor=None, page_size=50, departman=None, pozisyon=None):
+    """Çalışan listesinin bir sayfası - imleç başına cache'li"""
     try:
-        query = """
-            SELECT Sicil_No as sicil_no, Ad_Soyad as ad_soyad, Pozisyon as pozisyon, Departman as departman
-            FROM employees
-            WHERE deleted = 0 OR deleted IS NULL
-            ORDER BY Ad_Soyad
-            LIMIT 50
-        """
-        df = get_dataframe(query)
-        return df
+        return config.fetch_employee_page(cursor, page_size, departman, pozisyon)
     except Exception as e:
-        logger.error(f"Hızlı çalışan çekme hatası: {e}")
-        return pd.DataFrame()
+        logger.error(f"Çalışan sayfası çekme hatası: {e}")
+        return {'rows': pd.DataFrame(), 'next_cursor': None}
+
+@config.versioned_cache(("employees",), maxsize=50, ttl=3600)
+def get_employee_count(departman=None, pozisyon=None):
+    """Toplam çalışan sayısı tahmini - Cache'li"""
+    try:
+        return config.estimate_employee_count(departman, pozisyon)
+    except Exception as e:
+        logger.error(f"Çalışan sayısı çekme hatası: {e}")
+        return 0, False
+
+@config.versioned_cache(("employees",), maxsize=1, ttl=3600)
+def get_employee_filters():
+    """Departman/pozisyon filtre seçenekleri - Cache'li"""
+    try:
+        return config.get_employee_filter_options()
+    except Exception as e:
+        logger.error(f"Filtre seçenekleri çekme hatası: {e}")
+        return [], []
+
+def fast_get_employees():
+    """Hızlı çalışan listesi - ilk sayfa"""
+    return get_employee_page(None, 50)['rows']
 
-@st.cache_data(ttl=300)
+@config.versioned_cache(("employee_score_summary",), maxsize=1, ttl=3600)
 def get_employee_scores():
     """Çalışan skorlarını çek"""
     try:
-        query = """
-            SELECT employee_name as '[Ad Soyad]',
-                    MAX(tarih) AS son_tarih,
-                    MAX(toplam_skor) AS son_skor,
-                    ROUND(AVG(toplam_skor), 2) AS ort_skor,
-                    onay AS onay_durumu
-            FROM process_scores
-            WHERE employee_name IS NOT NULL
-            GROUP BY employee_name
-            ORDER BY ort_skor DESC
-        """
-        df = get_dataframe(query)
+        df = get_dataframe(EMPLOYEE_SCORES_QUERY, optimize_dtypes=True)
         return df
     except Exception as e:
         logger.error(f"Skor çekme hatası: {e}")
@@ -178,9 +186,10 @@ def has_access(feature, user_role, user_dept=None, target_dept=None):
         "calisan": ["inovasyon", "rozetler", "canli_surec_yonetimi"]
     }
 
-    if permissions and hasattr(permissions, 'has_access'):
+    if permissions:
         try:
-            return permissions.has_access(feature, user_role, user_dept, target_dept)
+            if hasattr(permissions, 'has_access'):
+                return permissions.has_access(feature, user_role, user_dept, target_dept)
         except Exception as e:
             logger.error(f"Permissions modülü hatası: {e}. Varsayılan kurallar kullanılıyor.")
             pass
@@ -190,76 +199,177 @@ def has_access(feature, user_role, user_dept=None, target_dept=None):
         return True
     return "all" in user_permissions or feature in user_permissions
 
+# KISMİ YENİDEN ÇALIŞTIRMA
+# Fragment içindeki bir etkileşim yalnızca o fonksiyonu yeniden çalıştırır;
+# bootstrap ve diğer bölümlerin sorguları tekrarlanmaz. Kenar çubuğuna yazan
+# fragment'lar `with st.sidebar:` içinde çağrılır.
+def _rerun_counts():
+    return st.session_state.setdefault("rerun_counts", {"full": 0, "partial": 0, "fragments": {}})
+
+def panel_fragment(func=None, *, run_every=None):
+    """Bölümü st.fragment olarak sar ve kısmi yeniden çalıştırmaları say"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            # Tam çalıştırma sırasında çağrılan fragment kısmi sayılmaz
+            if not st.session_state.get("full_run_active"):
+                counts = _rerun_counts()
+                counts["partial"] += 1
+                counts["fragments"][func.__name__] = counts["fragments"].get(func.__name__, 0) + 1
+            return func(*args, **kwargs)
+        return st.fragment(wrapper, run_every=run_every)
+    return decorator(func) if func is not None else decorator
+
+@panel_fragment
 def add_performance_controls():
-    """Performans kontrolleri - Sidebar'a eklenecek"""
-    st.sidebar.markdown("---")
-    st.sidebar.subheader("⚡ Performans")
-
-    performance_mode = st.sidebar.toggle(
-        "🚀 Hızlı Mod",
-        value=st.session_state.get('performance_mode', True),
-        key=f"perf_toggle_{st.session_state.get('username', 'guest')}_{int(time_module.time())}"
-    )
-    st.session_state.performance_mode = performance_mode
-
-    if performance_mode:
-        st.sidebar.success("⚡ Hızlı mod aktif")
-        st.sidebar.caption("• 50 çalışan limit\n• 5dk cache\n• Hızlı yükleme")
-    else:
-        st.sidebar.info("🎨 Tam mod aktif")
-        st.sidebar.caption("• Tüm çalışanlar\n• Tam özellikler")
-
-    if st.sidebar.button("🧹 Cache Temizle", key=f"sidebar_cache_clear_{st.session_state.get('username', 'guest')}_{int(time_module.time())}", use_container_width=True):
-        st.cache_data.clear()
-        st.sidebar.success("✅ Temizlendi!")
-        st.rerun()
+    """Performans özeti - `with st.sidebar:` içinde çağrılır"""
+    st.markdown("---")
+    st.subheader("⚡ Performans")
+
+    cache_info = config.cache_stats().values()
+    hits = sum(info['hits'] for info in cache_info)
+    calls = hits + sum(info['misses'] for info in cache_info)
+    hit_rate = f"%{hits * 100 / calls:.0f}" if calls else "-"
+    counts = _rerun_counts()
+    st.caption(f"• Sayfa başına {st.session_state.employee_page_size} çalışan\n"
+               f"• Yazmaya duyarlı cache (isabet {hit_rate})\n• İmleçli sayfalama\n"
+               f"• Yeniden çalıştırma: {counts['full']} tam · {counts['partial']} kısmi")
+    if counts["fragments"]:
+        st.caption(" · ".join(f"{name}: {n}" for name, n in sorted(counts["fragments"].items())))
+    st.button("↻ Yenile", key="performance_refresh")
+
+@panel_fragment
+def show_query_profiler():
+    """Bu sunucu sürecindeki en pahalı SQL ifadeleri (toplam süreye göre)"""
+    if not has_access("loglar", st.session_state.get("user_role"), st.session_state.get("user_department")):
+        return
+
+    with st.expander("🔬 Sorgu Profili"):
+        top = config.query_stats.top(limit=15)
+        if not top:
+            st.caption("Henüz ölçülmüş sorgu yok.")
+        else:
+            profile = pd.DataFrame([{
+                "İfade": entry['fingerprint'][:120],
+                "Çağrı": entry['calls'],
+                "Toplam ms": round(entry['total_time'] * 1000, 1),
+                "Ort. ms": round(entry['total_time'] * 1000 / entry['calls'], 2),
+                "Maks. ms": round(entry['max_time'] * 1000, 1),
+                "Satır": entry['rows'],
+                "MB": round(entry['bytes'] / (1024 * 1024), 2),
+                "Bekleme ms": round(entry['wait_time'] * 1000, 1),
+                "Yavaş": entry['slow'],
+                "Hata": entry['errors'],
+            } for entry in top])
+            st.dataframe(profile, use_container_width=True, hide_index=True)
+
+            planned = [entry for entry in top if entry['plan']]
+            for entry in planned[:3]:
+                st.caption(f"📋 {entry['fingerprint'][:80]}")
+                st.code("\n".join(entry['plan']), language="text")
+
+        threshold = config.QUERY_STATS_CONFIG['slow_query_ms']
+        st.caption(f"Ölçüm başlangıcı: {config.query_stats.started_at:%H:%M:%S} · yavaş eşiği {threshold} ms "
+                   f"(logs/slow_queries.log)")
+        for name, info in config.cache_stats().items():
+            st.caption(f"🗃️ {name}: isabet %{info['hit_rate'] * 100:.0f} · {info['size']} girdi · "
+                       f"{info['invalidations']} geçersiz · {info['evictions']} tahliye · "
+                       f"tür politikası -{info['saved_bytes'] / (1024 * 1024):.2f} MB")
+        frames = config.cache_frame_report()
+        if frames:
+            st.dataframe(pd.DataFrame([{
+                "Önbellek": frame['cache'],
+                "Argümanlar": frame['key'][:80],
+                "Satır": frame['rows'],
+                "KB": round(frame['bytes'] / 1024, 1),
+                "Kazanç KB": round(frame['saved_bytes'] / 1024, 1),
+                "Kazanç %": round(frame['saved_bytes'] * 100 / (frame['bytes'] + frame['saved_bytes']), 1)
+                            if frame['bytes'] + frame['saved_bytes'] else 0.0,
+            } for frame in frames]), use_container_width=True, hide_index=True)
+        for name, stats in config.db_manager.pool_stats().items():
+            st.caption(f"🔌 {name}: {stats['in_use']}/{stats['max_size']} kullanımda · "
+                       f"ort. bekleme {stats['avg_wait'] * 1000:.1f} ms · zaman aşımı {stats['timeouts']}")
+        if st.button("↺ Sıfırla", key="query_profiler_reset"):
+            config.query_stats.reset()
+            st.rerun(scope="fragment")
+
+def _employee_page_next(next_cursor):
+    st.session_state["employee_page_cursors"].append(next_cursor)
+
+def _employee_page_prev():
+    if len(st.session_state["employee_page_cursors"]) > 1:
+        st.session_state["employee_page_cursors"].pop()
+
+@panel_fragment
+def show_employee_table(filters=None):
+    """Sayfalı çalışan tablosu (keyset sayfalama) - filtre ve sayfa geçişleri yalnızca tabloyu yeniler"""
+    departments, positions = filters if filters is not None else get_employee_filters()
+
+    page_size_options = [25, 50, 100, 200]
+    current_size = st.session_state.get('employee_page_size', 50)
+    col1, col2, col3 = st.columns([2, 2, 1])
+    with col1:
+        departman = st.selectbox("🏢 Departman", ["Tümü"] + departments, key="employee_filter_department")
+    with col2:
+        pozisyon = st.selectbox("💼 Pozisyon", ["Tümü"] + positions, key="employee_filter_position")
+    with col3:
+        page_size = st.session_state.employee_page_size = st.selectbox(
+            "📄 Sayfa boyutu",
+            page_size_options,
+            index=page_size_options.index(current_size) if current_size in page_size_options else 1,
+            key="employee_page_size_select"
+        )
+    departman = None if departman == "Tümü" else departman
+    pozisyon = None if pozisyon == "Tümü" else pozisyon
+
+    # Filtre ya da sayfa boyutu değişince ilk sayfaya dön
+    filter_key = (departman, pozisyon, page_size)
+    if st.session_state.get("employee_page_filter") != filter_key:
+        st.session_state["employee_page_filter"] = filter_key
+        st.session_state["employee_page_cursors"] = [None]
+    cursors = st.session_state["employee_page_cursors"]
+
+    page, (total, exact) = config.run_queries([
+        (get_employee_page, cursors[-1], page_size, departman, pozisyon),
+        (get_employee_count, departman, pozisyon),
+    ])
+
+    st.dataframe(page['rows'], use_container_width=True, hide_index=True)
+
+    col_prev, col_info, col_next = st.columns([1, 2, 1])
+    with col_prev:
+        st.button("⬅️ Önceki", key="employee_page_prev", disabled=len(cursors) == 1,
+                  on_click=_employee_page_prev)
+    with col_info:
+        st.caption(f"Sayfa {len(cursors)} · {'' if exact else '~'}{total} çalışan")
+    with col_next:
+        st.button("Sonraki ➡️", key="employee_page_next", disabled=page['next_cursor'] is None,
+                  on_click=_employee_page_next, args=(page['next_cursor'],))
 
 def get_employees_from_db():
     """Çalışan listesini getir"""
     try:
-        query = """
-            SELECT
-                Sicil_No as sicil_no,
-                Ad_Soyad as ad_soyad,
-                Pozisyon as pozisyon,
-                Departman as departman,
-                COALESCE(Yonetici_Adi, '') as yonetici,
-                COALESCE(Email, '') as email,
-                STRFTIME('%Y-%m-%d', İşe_Giriş_Tarihi) as ise_giris,
-                CASE WHEN deleted = 0 THEN 1 ELSE 0 END as aktif
-            FROM employees
-            WHERE deleted = 0 OR deleted IS NULL
-            ORDER BY Ad_Soyad
-        """
-        df = get_dataframe(query)
+        df = get_dataframe(EMPLOYEE_LIST_QUERY, optimize_dtypes=True)
         return df
     except Exception as e:
         logger.error(f"Çalışan listesi çekme hatası: {e}")
         st.error(f"❌ Çalışan listesi yüklenemedi: {e}")
         return pd.DataFrame()
 
+ORG_REPORTS_LIMIT = 200
+
 def show_employee_details(search_value):
     """Çalışan detaylarını göster"""
     try:
         if search_value.isdigit():
-            query = """
-                SELECT Sicil_No, Ad_Soyad, Pozisyon, Departman, Email, Yonetici_Adi
-                FROM employees
-                WHERE Sicil_No = ? AND (deleted = 0 OR deleted IS NULL)
-            """
-            params = (search_value,)
+            emp_data = config.get_employee_by_sicil(search_value)
+            matches = [emp_data] if emp_data else []
         else:
-            query = """
-                SELECT Sicil_No, Ad_Soyad, Pozisyon, Departman, Email, Yonetici_Adi
-                FROM employees
-                WHERE LOWER(Ad_Soyad) LIKE LOWER(?) AND (deleted = 0 OR deleted IS NULL)
-            """
-            params = (f"%{search_value}%",)
-
-        result = execute_query(query, params)
+            # Türkçe harf/büyük-küçük harf duyarsız, indeksli arama (en iyi eşleşme önce)
+            matches = config.search_employees(search_value, limit=10)
 
-        if result:
-            emp_data = result[0]
+        if matches:
+            emp_data = matches[0]
             sicil = emp_data['Sicil_No']
             ad_soyad = emp_data['Ad_Soyad']
             pozisyon = emp_data['Pozisyon']
@@ -289,6 +399,23 @@ def show_employee_details(search_value):
                 st.metric("📊 Performans", f"{performance}/100", delta="5")
                 st.metric("🚀 Projeler", projects)
 
+            if len(matches) > 1:
+                others = ", ".join(f"{m['Ad_Soyad']} ({m['Sicil_No']})" for m in matches[1:])
+                st.caption(f"Diğer eşleşmeler: {others}")
+
+            if org_hierarchy:
+                with st.expander("🧭 Organizasyon"):
+                    # Okuma yenileme beklemez; bekleyen değişiklikler arka planda uygulanır
+                    if org_hierarchy.refresh_in_background() or org_hierarchy.has_pending():
+                        st.caption("⏳ Hiyerarşi güncelleniyor; son değişiklikler henüz yansımamış olabilir.")
+                    chain = org_hierarchy.managers_of(sicil)
+                    st.caption("Yönetim zinciri: " + (" → ".join(m['Ad_Soyad'] for m in chain) or "en üst"))
+                    total = org_hierarchy.report_count(sicil)
+                    st.caption(f"Bağlı çalışan: {total}")
+                    if total:
+                        st.dataframe(org_hierarchy.reports_under(sicil, limit=ORG_REPORTS_LIMIT),
+                                     use_container_width=True, hide_index=True)
+
         else:
             st.error(f"❌ '{search_value}' ile eşleşen çalışan bulunamadı!")
             st.info("💡 Tam isim veya doğru sicil numarası deneyiniz.")
@@ -297,77 +424,401 @@ def show_employee_details(search_value):
         st.error(f"❌ Çalışan detay hatası: {e}")
         logger.error(f"Çalışan detaylarını gösterme hatası: {e}")
 
+def show_excel_import():
+    """Excel/CSV'den toplu çalışan aktarımı"""
+    if not excel_to_db:
+        return
+    if not has_access("excel_aktarim", st.session_state.get("user_role"), st.session_state.get("user_department")):
+        return
+
+    with st.expander("📥 Excel/CSV'den Çalışan Aktar"):
+        uploaded = st.file_uploader("Dosya seç", type=["xlsx", "xlsm", "xls", "csv"], key="employee_import_file")
+        if uploaded is None or not st.button("🚀 Aktarımı Başlat", key="employee_import_start"):
+            return
+
+        # Dosya belleğe alınmadan diske yazılır; okuyucu oradan parça parça akıtır
+        upload_path = os.path.join(config.BASE_DIR, "uploads", f"{uuid.uuid4().hex}_{os.path.basename(uploaded.name)}")
+        os.makedirs(os.path.dirname(upload_path), exist_ok=True)
+        with open(upload_path, "wb") as f:
+            while True:
+                block = uploaded.read(1024 * 1024)
+                if not block:
+                    break
+                f.write(block)
+
+        progress_bar = st.progress(0.0, text="Aktarım başlıyor...")
+        # Kesin satır sayısı bilinmiyor; satır başına ~100 bayt varsayımıyla kaba tahmin
+        estimated_rows = max(uploaded.size // 100, 1)
+
+        def report(status):
+            done = min(status['rows_read'] / estimated_rows, 0.99)
+            progress_bar.progress(done, text=f"{status['rows_read']} satır okundu · "
+                                             f"{status['imported']} aktarıldı · {status['rejected']} reddedildi")
+
+        try:
+            status = excel_to_db.import_employees(upload_path, progress=report)
+        except Exception as e:
+            progress_bar.empty()
+            st.error(f"❌ Aktarım hatası: {e}")
+            logger.error(f"Çalışan aktarım hatası: {e}")
+            return
+        finally:
+            try:
+                os.remove(upload_path)
+            except OSError:
+                pass
+
+        progress_bar.progress(1.0, text="Aktarım tamamlandı")
+        st.success(f"✅ {status['imported']} çalışan aktarıldı ({status['elapsed']:.1f} sn)")
+        if org_hierarchy:
+            org_hierarchy.refresh_in_background()
+        log_action(st.session_state.get("username"), "employee_import",
+                   f"{status['imported']} aktarıldı, {status['rejected']} reddedildi")
+        if status['reject_path']:
+            st.warning(f"⚠️ {status['rejected']} satır reddedildi.")
+            with open(status['reject_path'], "rb") as f:
+                st.download_button("📄 Reddedilen satırları indir", f.read(),
+                                   file_name=os.path.basename(status['reject_path']),
+                                   mime="text/csv", key="employee_import_rejects")
+
+EXPORT_SOURCE_LABELS = {
+    "employees": "👥 Çalışanlar",
+    "process_scores": "📊 Süreç Skorları",
+    "logs": "📜 Loglar",
+    "innovation_ideas": "💡 İnovasyon Fikirleri",
+}
+
+def _read_export_file(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+def _show_export_jobs():
+    """Dışa aktarım işlerinin durumu - çalışan iş varken kendi kendini yeniler"""
+    job_ids = st.session_state.get("export_jobs", [])
+    jobs = [job for job in (exports.get_job(job_id) for job_id in job_ids) if job is not None]
+    for job in jobs:
+        label = f"{EXPORT_SOURCE_LABELS.get(job.source, job.source)} · {job.format}"
+        if job.status == "hata":
+            st.error(f"❌ {label}: {job.error}")
+        elif job.done:
+            if job.path:
+                st.success(f"✅ {label}: {job.rows} satır")
+                # Dosya her yeniden çalıştırmada değil, yalnızca İndir'e basılınca okunur
+                st.download_button("⬇️ İndir", functools.partial(_read_export_file, job.path),
+                                   file_name=os.path.basename(job.path), key=f"export_download_{job.id}")
+            else:
+                st.info(f"ℹ️ {label}: yeni satır yok")
+        else:
+            total = f"/{job.total}" if job.total is not None else ""
+            st.progress(job.fraction, text=f"⏳ {label}: {job.rows}{total} satır")
+
+    # Son iş bitince periyodik yenilemeyi durdurmak için sayfayı bir kez yeniden çalıştır
+    if st.session_state.get("export_jobs_polling") and all(job.done for job in jobs):
+        st.session_state["export_jobs_polling"] = False
+        st.rerun()
+
+def show_export_panel():
+    """Akışlı dışa aktarım - büyük tablolar arka planda yazılır"""
+    if not exports:
+        return
+    if not has_access("raporlar", st.session_state.get("user_role"), st.session_state.get("user_department")):
+        return
+
+    with st.expander("📤 Dışa Aktarım"):
+        col1, col2, col3 = st.columns([2, 1, 1])
+        with col1:
+            source = st.selectbox("Kaynak", list(EXPORT_SOURCE_LABELS),
+                                  format_func=EXPORT_SOURCE_LABELS.get, key="export_source")
+        with col2:
+            fmt = st.selectbox("Biçim", exports.available_formats(), key="export_format")
+        with col3:
+            incremental = st.checkbox("Yalnızca yeniler", key="export_incremental",
+                                      help="Son artımlı aktarımdan bu yana eklenen/güncellenen satırlar")
+
+        if st.button("🚀 Dışa Aktar", key="export_start"):
+            try:
+                job = exports.start_export(source, fmt, incremental)
+                st.session_state.setdefault("export_jobs", []).insert(0, job.id)
+                log_action(st.session_state.get("username"), "export_start", f"{source} ({fmt})")
+            except Exception as e:
+                st.error(f"❌ Dışa aktarım başlatılamadı: {e}")
+                logger.error(f"Dışa aktarım başlatma hatası: {e}")
+
+        jobs = [exports.get_job(job_id) for job_id in st.session_state.get("export_jobs", [])]
+        running = any(job is not None and not job.done for job in jobs)
+        st.session_state["export_jobs_polling"] = running
+        # Yalnızca bu bölüm yenilenir; sayfanın geri kalanı yeniden çalışmaz
+        panel_fragment(_show_export_jobs, run_every=1 if running else None)()
+
+SCORE_REPORT_GRAINS = {
+    "Departman × Ay": ("department", "month"),
+    "Departman × Yıl": ("department", "year"),
+    "Süreç × Ay": ("process_id", "month"),
+    "Aylık toplam": ("month",),
+}
+
+@panel_fragment
+def show_score_report():
+    """Departman/süreç/dönem skor raporu - önceden toplanmış özetlerden okunur"""
+    if not rollups:
+        return
+    if not has_access("raporlar", st.session_state.get("user_role"), st.session_state.get("user_department")):
+        return
+
+    with st.expander("📈 Skor Raporu"):
+        col1, col2, col3 = st.columns([2, 2, 1])
+        with col1:
+            grain = st.selectbox("Kırılım", list(SCORE_REPORT_GRAINS), key="score_report_grain")
+        with col2:
+            metric = st.selectbox("Metrik", list(rollups.METRICS), index=len(rollups.METRICS) - 1,
+                                  key="score_report_metric")
+        with col3:
+            start_year = st.number_input("Başlangıç yılı", min_value=2000, max_value=2100,
+                                         value=date.today().year - 2, key="score_report_start")
+
+        group_by = SCORE_REPORT_GRAINS[grain]
+        try:
+            report = rollups.query_scores((metric,), group_by, start_month=f"{start_year}-01")
+        except Exception as e:
+            st.error(f"❌ Rapor yüklenemedi: {e}")
+            logger.error(f"Skor raporu hatası: {e}")
+            return
+
+        if report.empty:
+            st.info("ℹ️ Seçilen dönemde skor yok.")
+            return
+        period = group_by[-1] if group_by[-1] in ("month", "year") else None
+        if period and len(group_by) == 2:
+            st.line_chart(report.pivot(index=period, columns=group_by[0], values=f"{metric}_avg"))
+        elif period:
+            st.line_chart(report.set_index(period)[f"{metric}_avg"])
+        st.dataframe(report, use_container_width=True, hide_index=True)
+        st.caption(f"Kaynak: {report.attrs.get('source')}")
+
+LOG_VIEWER_LIMIT = 500
+
+@panel_fragment
+def show_log_viewer():
+    """Sistem logları - sıcak tablo ve aylık arşiv birlikte aranır"""
+    if not log_archive:
+        return
+    if not has_access("loglar", st.session_state.get("user_role"), st.session_state.get("user_department")):
+        return
+
+    with st.expander("📜 Sistem Logları"):
+        col1, col2, col3 = st.columns([2, 2, 2])
+        with col1:
+            period = st.date_input("Tarih aralığı", value=(date.today() - timedelta(days=7), date.today()),
+                                   key="log_viewer_period")
+        with col2:
+            username = st.text_input("Kullanıcı", key="log_viewer_user").strip()
+        with col3:
+            action = st.text_input("İşlem", key="log_viewer_action").strip()
+
+        # Aralığın yalnızca ilk günü seçiliyken tek gün aranır
+        if isinstance(period, (tuple, list)):
+            start, end = (period[0], period[-1]) if period else (None, None)
+        else:
+            start = end = period
+        end = end + timedelta(days=1) if end else None
+        try:
+            logs = log_archive.query_logs(start, end, username=username or None, action=action or None,
+                                          limit=LOG_VIEWER_LIMIT)
+        except Exception as e:
+            st.error(f"❌ Loglar yüklenemedi: {e}")
+            logger.error(f"Log görüntüleyici hatası: {e}")
+            return
+
+        if logs.empty:
+            st.info("ℹ️ Seçilen aralıkta log yok.")
+            return
+        st.dataframe(logs, use_container_width=True, hide_index=True)
+        months = logs.attrs.get('archive_months')
+        caption = f"{len(logs)} kayıt (en fazla {LOG_VIEWER_LIMIT})"
+        if months:
+            caption += f" · arşivden okunan aylar: {', '.join(sorted(months))}"
+        st.caption(caption)
+
+@panel_fragment
+def show_connection_test():
+    """Kenar çubuğundaki bağlantı testi - yalnızca bu bölüm yeniden çalışır"""
+    if st.button("🔍 Bağlantı Test", key="connection_test_btn"):
+        if test_connection():
+            st.success("✅ Bağlantı başarılı!")
+        else:
+            st.error("❌ Bağlantı başarısız!")
+
+@panel_fragment
+def show_test_notification():
+    if st.button("✅ Test Bildirim", key="test_notification_btn_main"):
+        send_notification("Test başarılı! 🎉", "success")
+
+# KİMLİK DOĞRULAMA
+# True ise giriş yapmadan panel açılmaz; False iken giriş isteğe bağlıdır
+AUTH_REQUIRED = False
+
+def apply_auth_session():
+    """Oturum belirteci varsa kullanıcı/rol/departmanı ondan al (önbellekten, DB'ye gitmeden)"""
+    token = st.session_state.get("auth_token")
+    if not token:
+        return False
+    session = auth.authenticate(token)
+    if session is None:
+        st.session_state.pop("auth_token", None)
+        st.warning("⚠️ Oturumunuzun süresi doldu, lütfen tekrar giriş yapın.")
+        return False
+    st.session_state["username"] = session.username
+    st.session_state["user_role"] = session.role
+    st.session_state["user_department"] = session.department
+    return True
+
+def show_login_form():
+    """Kullanıcı adı/şifre formu - form gönderilene kadar rerun olmaz"""
+    with st.form("login_form"):
+        username = st.text_input("👤 Kullanıcı adı", key="login_username")
+        password = st.text_input("🔑 Şifre", type="password", key="login_password")
+        submitted = st.form_submit_button("🔐 Giriş")
+    if submitted:
+        token = auth.login(username, password)
+        if token is None:
+            st.error("❌ Kullanıcı adı veya şifre hatalı!")
+            return
+        st.session_state["auth_token"] = token
+        log_action(username, "login")
+        # Rol bütün bölümleri etkiler
+        st.rerun()
+
+def show_logout_button():
+    if st.button("🚪 Çıkış", key="logout_btn"):
+        auth.revoke(st.session_state.pop("auth_token"))
+        log_action(st.session_state.get("username"), "logout")
+        # Sayfa başındaki varsayılanlar geri yüklensin
+        for key in ("username", "user_role", "user_department"):
+            st.session_state.pop(key, None)
+        st.rerun()
+
 # ANA UYGULAMA
 def main():
     """Ana uygulama"""
     global total_users, DB_SYSTEM_CONFIGURED
 
+    authenticated = apply_auth_session()
+    if AUTH_REQUIRED and not authenticated:
+        st.title("⭐ EFFINOVA | Giriş")
+        show_login_form()
+        return
+
+    # Birbirinden bağımsız okumalar birlikte çalışır: bekleme toplamları değil en yavaşı kadar
+    try:
+        total_users, employee_filters = config.run_queries(
+            [config.get_user_count, get_employee_filters], return_exceptions=True)
+    except TimeoutError as e:
+        logger.error(f"Açılış sorguları zaman aşımına uğradı: {e}")
+        st.error("⏱️ Veritabanı zamanında yanıt vermedi; sayılar ve filtreler eksik gösteriliyor.")
+        total_users, employee_filters = 0, ([], [])
+    if isinstance(total_users, Exception):
+        logger.error(f"Kullanıcı sayısı alınamadı: {total_users}")
+        total_users = 0
+    if isinstance(employee_filters, Exception):
+        logger.error(f"Çalışan filtreleri alınamadı: {employee_filters}")
+        st.error("❌ Departman/pozisyon filtreleri yüklenemedi")
+        employee_filters = ([], [])
+
     st.title("⭐ EFFINOVA | Admin Paneli")
     st.markdown(f"### ✅ Sistem başarıyla yüklendi! 🚀 ({total_users} kullanıcı)")
 
-    add_performance_controls()
+    with st.sidebar:
+        add_performance_controls()
+        show_query_profiler()
 
     st.sidebar.title("🎯 Navigasyon")
 
-    role_options = {
-        "👨‍💻 Admin Paneli": "admin",
-        "👔 Müdür Paneli": "mudur",
-        "👤 Çalışan Paneli": "calisan",
-        "🏢 GMY Paneli": "gmy"
-    }
+    # Giriş yapılmışsa rol oturumdan gelir, elle seçilemez
+    if not authenticated:
+        role_options = {
+            "👨‍💻 Admin Paneli": "admin",
+            "👔 Müdür Paneli": "mudur",
+            "👤 Çalışan Paneli": "calisan",
+            "🏢 GMY Paneli": "gmy"
+        }
 
-    try:
-        current_index = list(role_options.values()).index(st.session_state["user_role"])
-    except ValueError:
-        current_index = 0
+        try:
+            current_index = list(role_options.values()).index(st.session_state["user_role"])
+        except ValueError:
+            current_index = 0
 
-    selected_role_label = st.sidebar.selectbox(
-        "Panel Seç",
-        list(role_options.keys()),
-        index=current_index,
-        key=f"role_selector_{int(time_module.time())}"
-    )
+        # Rol tüm bölümlerin yetkisini belirler; değişince sayfanın tamamı yeniden çalışır
+        selected_role_label = st.sidebar.selectbox(
+            "Panel Seç",
+            list(role_options.keys()),
+            index=current_index,
+            key="role_selector"
+        )
 
-    st.session_state["user_role"] = role_options[selected_role_label]
+        st.session_state["user_role"] = role_options[selected_role_label]
 
     st.sidebar.markdown("---")
     st.sidebar.info(f"👤 **Kullanıcı:** {st.session_state['username']}")
     st.sidebar.info(f"🏷️ **Rol:** {st.session_state['user_role'].title()}")
     st.sidebar.info(f"🏢 **Departman:** {st.session_state['user_department']}")
-
-    if st.sidebar.button("🔍 Bağlantı Test", key=f"connection_test_btn_{int(time_module.time())}"):
-        if test_connection():
-            st.sidebar.success("✅ Bağlantı başarılı!")
+    with st.sidebar:
+        if authenticated:
+            show_logout_button()
         else:
-            st.sidebar.error("❌ Bağlantı başarısız!")
+            with st.expander("🔐 Giriş"):
+                show_login_form()
+
+    with st.sidebar:
+        show_connection_test()
 
     st.markdown(f"## Hoş geldin, **{st.session_state['username']}**! 👋")
 
-    col1_main_btn, col2_main_btn = st.columns(2)
-    with col1_main_btn:
-        if st.button("✅ Test Bildirim", key=f"test_notification_btn_main_{int(time_module.time())}"):
-            send_notification("Test başarılı! 🎉", "success")
-    with col2_main_btn:
-        if st.button("🧹 Cache Temizle", key=f"cache_clear_btn_main_{int(time_module.time())}"):
-            st.cache_data.clear()
-            send_notification("Cache temizlendi!", "info")
+    show_test_notification()
+
+    st.subheader("👥 Çalışanlar")
+    show_employee_table(employee_filters)
+    show_excel_import()
+    show_export_panel()
+    show_score_report()
+    show_log_viewer()
 
     # TAB YÖNETİMİ (Diğer dosyalarda yapılacak)
     st.info("🚧 Sekme yönetimi ayrı dosyalara taşınacak...")
 
+@st.cache_resource(show_spinner="Veritabanı hazırlanıyor...")
+def bootstrap_database(db_key, schema_version):
+    """Süreç başına bir kez: bağlantı testi, migrasyonlar, varsayılan veriler.
+
+    Anahtar veritabanı ve şema sürümüdür; başarısızlık cache'lenmez, bir
+    sonraki rerun yeniden dener.
+    """
+    if not initialize_database():
+        raise RuntimeError("Veritabanı sistemi yapılandırılamadı.")
+    return True
+
+@st.cache_resource
+def start_log_archiver():
+    """Süreç başına tek log arşivleme zamanlayıcısı"""
+    if not log_archive:
+        return None
+    return log_archive.start_scheduler()
+
 if __name__ == "__main__":
     # VERİTABANI BAŞLATMA
     try:
-        DB_SYSTEM_CONFIGURED = initialize_database()
+        try:
+            DB_SYSTEM_CONFIGURED = bootstrap_database(config.database_key(), config.SCHEMA_VERSION)
+        except RuntimeError:
+            DB_SYSTEM_CONFIGURED = False
         if DB_SYSTEM_CONFIGURED:
-            # Toplam kullanıcı sayısını al
+            start_log_archiver()
+            # Fragment'lar bu bayrakla tam çalıştırmayı kısmi yeniden çalıştırmadan ayırır
+            _rerun_counts()["full"] += 1
+            st.session_state["full_run_active"] = True
             try:
-                user_count_result = execute_query("SELECT COUNT(*) as total FROM users")
-                total_users = user_count_result[0]['total'] if user_count_result and user_count_result[0] else 0
-            except:
-                total_users = 0
-            
-            main()
+                main()
+            finally:
+                st.session_state["full_run_active"] = False
         else:
             st.error("❌ Uygulama başlatılamadı: Veritabanı sistemi yapılandırılamadı.")
     except Exception as e:
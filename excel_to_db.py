@@ -0,0 +1,293 @@
+# excel_to_db.py
+"""Excel/CSV'den toplu çalışan aktarımı.
+
+Girdi parça parça okunur (CSV: pandas chunksize, XLSX: openpyxl read-only),
+her parça pandas ile vektörel olarak doğrulanıp normalize edilir ve
+`Sicil_No` üzerinden upsert edilir. Her parça tek transaction'dır; bellek
+kullanımı dosya boyutundan bağımsız olarak parça boyutuyla sınırlıdır.
+Reddedilen satırlar satır numarası ve gerekçesiyle ayrı bir CSV'ye yazılır.
+"""
+
+import csv
+import logging
+import os
+import re
+import time
+from contextlib import ExitStack
+from datetime import datetime
+
+import pandas as pd
+
+import config
+from lazy import is_available
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 20000
+
+EMPLOYEE_IMPORT_COLUMNS = [
+    "Ad_Soyad", "Pozisyon", "Departman", "Yonetici_Adi", "IK_Yonetici_Adi", "Email",
+    "Sicil_No", "İşe_Giriş_Tarihi", "Telefon", "Adres", "Dogum_Tarihi", "Egitim",
+    "Sertifikalar", "Yetenekler",
+]
+REQUIRED_COLUMNS = ["Ad_Soyad", "Pozisyon", "Departman", "Sicil_No"]
+DATE_COLUMNS = ["İşe_Giriş_Tarihi", "Dogum_Tarihi"]
+
+# Arrow tabanlı string dizileri strip/match işlemlerinde Python nesnelerinden çok daha hızlıdır
+_TEXT_DTYPE = "string[pyarrow]" if is_available("pyarrow") else "string"
+
+_EMAIL_RE = r"^[^@\s]+@[^@\s]+\.[^@\s]+$"
+# Önce hızlı, sabit biçimli ayrıştırma denenir; kalanlar için esnek ayrıştırma
+_DATE_FORMATS = ["%Y-%m-%d", "%d.%m.%Y", "%d/%m/%Y", "%Y-%m-%d %H:%M:%S"]
+
+
+def _header_key(name):
+    """'İşe Giriş Tarihi', 'ise_giris_tarihi', 'AD SOYAD' gibi başlıkları eşleştir"""
+    return re.sub(r"[^0-9a-z]", "", config.fold_turkish(str(name)))
+
+
+_HEADER_ALIASES = {_header_key(col): col for col in EMPLOYEE_IMPORT_COLUMNS}
+_HEADER_ALIASES.update({
+    "adisoyadi": "Ad_Soyad",
+    "isim": "Ad_Soyad",
+    "sicil": "Sicil_No",
+    "sicilnumarasi": "Sicil_No",
+    "eposta": "Email",
+    "yonetici": "Yonetici_Adi",
+    "ikyonetici": "IK_Yonetici_Adi",
+    "isegiris": "İşe_Giriş_Tarihi",
+    "dogumtarihi": "Dogum_Tarihi",
+})
+
+
+def map_headers(headers):
+    """Dosya başlıklarını employees sütunlarına eşle; tanınmayanlar atlanır"""
+    mapping = {}
+    for header in headers:
+        column = _HEADER_ALIASES.get(_header_key(header))
+        if column and column not in mapping.values():
+            mapping[header] = column
+    missing = [col for col in REQUIRED_COLUMNS if col not in mapping.values()]
+    if missing:
+        raise ValueError(f"Zorunlu sütunlar bulunamadı: {', '.join(missing)}")
+    return mapping
+
+
+# =============================================================================
+# OKUYUCULAR
+# =============================================================================
+
+def _sniff_delimiter(path):
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        sample = f.read(64 * 1024)
+    try:
+        return csv.Sniffer().sniff(sample, delimiters=",;\t|").delimiter
+    except csv.Error:
+        return ","
+
+
+def _iter_csv(path, chunk_size):
+    reader = pd.read_csv(path, dtype=str, keep_default_na=False, chunksize=chunk_size,
+                         encoding="utf-8-sig", sep=_sniff_delimiter(path))
+    for chunk in reader:
+        yield chunk
+
+
+def _iter_xlsx(path, chunk_size, sheet_name=None):
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        sheet = workbook[sheet_name] if sheet_name else workbook.worksheets[0]
+        rows = sheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        header = [str(h).strip() if h is not None else f"_bos_{i}" for i, h in enumerate(header)]
+        batch = []
+        for row in rows:
+            if row is None or all(v is None for v in row):
+                continue
+            batch.append(row[:len(header)])
+            if len(batch) >= chunk_size:
+                yield pd.DataFrame.from_records(batch, columns=header)
+                batch = []
+        if batch:
+            yield pd.DataFrame.from_records(batch, columns=header)
+    finally:
+        workbook.close()
+
+
+def iter_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE, sheet_name=None):
+    """Dosyayı DataFrame parçaları olarak akıt"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".csv", ".txt"):
+        return _iter_csv(path, chunk_size)
+    if ext in (".xlsx", ".xlsm"):
+        return _iter_xlsx(path, chunk_size, sheet_name)
+    if ext == ".xls":
+        # Eski biçim akışla okunamaz; tek seferde okunup parçalara bölünür
+        logger.warning(f"{path}: .xls akışla okunamıyor, dosya belleğe alınacak.")
+        df = pd.read_excel(path, dtype=str, sheet_name=sheet_name or 0)
+        return (df.iloc[i:i + chunk_size] for i in range(0, len(df), chunk_size))
+    raise ValueError(f"Desteklenmeyen dosya türü: {ext}")
+
+
+# =============================================================================
+# DOĞRULAMA
+# =============================================================================
+
+def _clean_text(series):
+    series = series.astype(_TEXT_DTYPE).str.strip()
+    return series.mask(series == "")
+
+
+def parse_dates(series):
+    """Tarih sütununu vektörel ayrıştır; ayrıştırılamayanlar NaT"""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+    values = series.astype("object")
+    parsed = pd.Series(pd.NaT, index=series.index, dtype="datetime64[ns]")
+    is_datetime = values.map(lambda v: isinstance(v, datetime))
+    if is_datetime.any():
+        parsed[is_datetime] = pd.to_datetime(values[is_datetime])
+    text = values.where(~is_datetime).astype("string").str.strip()
+    for fmt in _DATE_FORMATS:
+        todo = parsed.isna() & text.notna() & (text != "")
+        if not todo.any():
+            return parsed
+        parsed[todo] = pd.to_datetime(text[todo], format=fmt, errors="coerce")
+    todo = parsed.isna() & text.notna() & (text != "")
+    if todo.any():
+        parsed[todo] = pd.to_datetime(text[todo], errors="coerce", dayfirst=True, format="mixed")
+    return parsed
+
+
+def present_columns(mapping):
+    """Dosyada bulunan employees sütunları, EMPLOYEE_IMPORT_COLUMNS sırasıyla"""
+    mapped = set(mapping.values())
+    return [col for col in EMPLOYEE_IMPORT_COLUMNS if col in mapped]
+
+
+def normalize_chunk(chunk, mapping, first_row_number):
+    """Parçayı doğrula/normalize et: (geçerli DataFrame, reddedilen DataFrame)"""
+    df = chunk[list(mapping)].rename(columns=mapping)
+    df.index = pd.RangeIndex(first_row_number, first_row_number + len(df))
+    for col in df.columns:
+        if col not in DATE_COLUMNS:
+            df[col] = _clean_text(df[col])
+    # Dosyada olmayan sütunlar eklenmez: upsert yalnızca gelen sütunları günceller
+    df = df[present_columns(mapping)]
+    # Excel sayısal sicilleri "12345.0" olarak verebilir
+    df["Sicil_No"] = df["Sicil_No"].str.replace(r"\.0+$", "", regex=True)
+    if "Email" in df.columns:
+        df["Email"] = df["Email"].str.lower()
+
+    reasons = pd.Series("", index=df.index, dtype="object")
+    for col in REQUIRED_COLUMNS:
+        reasons = reasons.mask(df[col].isna(), reasons + f"{col} boş; ")
+
+    if "Email" in df.columns:
+        bad_email = df["Email"].notna() & ~df["Email"].str.match(_EMAIL_RE).fillna(False)
+        reasons = reasons.mask(bad_email, reasons + "geçersiz e-posta; ")
+
+    for col in (c for c in DATE_COLUMNS if c in df.columns):
+        parsed = parse_dates(df[col])
+        present = df[col].notna() & (df[col].astype("string").str.strip() != "")
+        reasons = reasons.mask(present & parsed.isna(), reasons + f"geçersiz {col}; ")
+        df[col] = parsed.dt.strftime("%Y-%m-%d").astype("object").where(parsed.notna(), None)
+
+    rejected_mask = (reasons != "").to_numpy()
+    rejected = chunk[rejected_mask].copy()
+    rejected.insert(0, "satir_no", df.index[rejected_mask] + 1)
+    rejected.insert(1, "red_nedeni", reasons[rejected_mask].str.rstrip("; ").to_numpy())
+
+    valid = df[~rejected_mask]
+    # Aynı parçada tekrar eden sicil: son satır geçerli
+    valid = valid.drop_duplicates(subset="Sicil_No", keep="last")
+    return valid, rejected
+
+
+# =============================================================================
+# UPSERT
+# =============================================================================
+
+def build_upsert_query(columns=EMPLOYEE_IMPORT_COLUMNS):
+    """`columns` için upsert; dosyada olmayan sütunlar mevcut kayıtta korunur.
+
+    Yeniden aktarılan çalışan silinmişse (`deleted`) tekrar görünür olur.
+    """
+    ph = config.sql_placeholder()
+    updates = [col for col in columns if col != "Sicil_No"]
+    if config.DATABASE_TYPE == 'mysql':
+        cols = ", ".join(f"`{c}`" for c in columns)
+        assignments = "".join(f"`{c}` = VALUES(`{c}`), " for c in updates)
+        return (f"INSERT INTO employees ({cols}) VALUES ({', '.join([ph] * len(columns))}) "
+                f"ON DUPLICATE KEY UPDATE {assignments}deleted = 0, updated_at = CURRENT_TIMESTAMP")
+    cols = ", ".join(f'"{c}"' for c in columns)
+    assignments = "".join(f'"{c}" = excluded."{c}", ' for c in updates)
+    return (f"INSERT INTO employees ({cols}) VALUES ({', '.join([ph] * len(columns))}) "
+            f"ON CONFLICT(Sicil_No) DO UPDATE SET {assignments}deleted = 0, updated_at = CURRENT_TIMESTAMP")
+
+
+def _records(df):
+    values = df.astype("object").where(df.notna(), None)
+    return list(values.itertuples(index=False, name=None))
+
+
+def import_employees(path, chunk_size=DEFAULT_CHUNK_SIZE, progress=None, reject_path=None, sheet_name=None):
+    """Çalışanları dosyadan toplu aktar.
+
+    `progress(durum)` her parçadan sonra okunan/aktarılan/reddedilen satır
+    sayılarıyla çağrılır. Dönüş aynı durum sözlüğüdür; reddedilen satır yoksa
+    `reject_path` None olur.
+    """
+    if reject_path is None:
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        reject_path = os.path.join(config.BASE_DIR, "exports", f"import_rejects_{stamp}.csv")
+
+    query = None
+    status = {'rows_read': 0, 'imported': 0, 'rejected': 0, 'chunks': 0,
+              'elapsed': 0.0, 'reject_path': None}
+    started = time.perf_counter()
+    mapping = None
+    reject_writer = None
+
+    with ExitStack() as stack:
+        bulk_mode = False
+        for chunk in iter_chunks(path, chunk_size, sheet_name):
+            if mapping is None:
+                mapping = map_headers(chunk.columns)
+                query = build_upsert_query(present_columns(mapping))
+            if not bulk_mode and len(chunk) >= chunk_size:
+                # Tam dolu parça büyük dosya demektir: arama indeksi sonda tek seferde kurulur
+                stack.enter_context(config.employee_search_bulk_mode())
+                bulk_mode = True
+            valid, rejected = normalize_chunk(chunk, mapping, status['rows_read'] + 1)
+            status['rows_read'] += len(chunk)
+
+            if len(valid):
+                config.execute_many(query, _records(valid))
+                status['imported'] += len(valid)
+
+            if len(rejected):
+                if reject_writer is None:
+                    os.makedirs(os.path.dirname(reject_path), exist_ok=True)
+                    reject_file = stack.enter_context(open(reject_path, "w", newline="", encoding="utf-8-sig"))
+                    reject_writer = csv.writer(reject_file)
+                    reject_writer.writerow(list(rejected.columns))
+                    status['reject_path'] = reject_path
+                reject_writer.writerows(_records(rejected))
+                status['rejected'] += len(rejected)
+
+            status['chunks'] += 1
+            status['elapsed'] = time.perf_counter() - started
+            if progress:
+                progress(dict(status))
+
+    status['elapsed'] = time.perf_counter() - started
+    logger.info(
+        f"Çalışan aktarımı tamamlandı: {status['imported']} aktarıldı, {status['rejected']} reddedildi, "
+        f"{status['elapsed']:.1f} sn ({path})"
+    )
+    return status
@@ -0,0 +1,386 @@
+# exports.py
+"""Akışlı dışa aktarım servisi.
+
+Kayıtlı kaynaklar (`EXPORT_SOURCES`) `config.iter_dataframe()` ile parça
+parça okunup Parquet, sıkıştırılmış CSV ya da XLSX olarak `exports/`
+klasörüne yazılır; her parça bir Parquet row group'udur ve tablo hiçbir
+zaman tamamen belleğe alınmaz.
+
+Artımlı aktarımda kaynağın filigran sütunu (`updated_at`, `created_at`,
+`timestamp`) kullanılır: her çalıştırma [son filigran, şimdi) aralığını
+yazar ve filigranı `export_watermarks` tablosuna kaydeder. Üst sınır
+veritabanı saatinden alınır; aynı saniyede sonradan yazılan satırlar bir
+sonraki çalıştırmaya kalır, kaybolmaz.
+
+Büyük aktarımlar `start_export()` ile arka plan thread'inde çalışır;
+panel ilerlemeyi `get_job()` / `list_jobs()` ile okur.
+"""
+
+import gzip
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import config
+from lazy import lazy_import, is_available
+
+# pyarrow yalnızca Parquet yazılırken yüklenir
+pa = lazy_import("pyarrow")
+pq = lazy_import("pyarrow.parquet")
+PARQUET_AVAILABLE = is_available("pyarrow")
+
+logger = logging.getLogger(__name__)
+
+EXPORT_DIR = os.path.join(config.BASE_DIR, "exports")
+EXPORT_CHUNK_SIZE = 20000
+EXPORT_MAX_WORKERS = 2
+EXPORT_JOB_HISTORY = 50
+XLSX_MAX_ROWS = 1048575  # Başlık satırı hariç sayfa başına satır sınırı
+
+EXPORT_FORMATS = {
+    'parquet': ".parquet",
+    'csv.gz': ".csv.gz",
+    'xlsx': ".xlsx",
+}
+
+EXPORT_SOURCES = {}
+
+
+def register_export(name, table, columns, watermark, date_watermark=False):
+    """Dışa aktarılabilir bir kaynak kaydet.
+
+    `watermark` artımlı aktarımda kullanılan zaman sütunudur; yalnızca gün
+    tutan DATE sütunları için `date_watermark=True` verilir.
+    """
+    EXPORT_SOURCES[name] = {
+        'table': table,
+        'columns': list(columns),
+        'watermark': watermark,
+        'date_watermark': date_watermark,
+    }
+
+
+# Üretilmiş sütunlar (Ad_Soyad_norm, employee_key) dışarıda bırakılır
+register_export("employees", "employees", [
+    "id", "Ad_Soyad", "Pozisyon", "Departman", "Yonetici_Adi", "IK_Yonetici_Adi", "Email",
+    "Sicil_No", "İşe_Giriş_Tarihi", "Telefon", "Adres", "Dogum_Tarihi", "Egitim",
+    "Sertifikalar", "Yetenekler", "deleted", "created_at", "updated_at",
+], watermark="updated_at")
+register_export("process_scores", "process_scores", [
+    "id", "process_id", "employee_name", "employee_sicil_no", "cikti", "kalite", "strateji",
+    "inovasyon", "zaman", "ekstra", "ekstra_aciklama", "toplam_skor", "tarih", "onay", "created_at",
+], watermark="created_at")
+register_export("logs", "logs", [
+    "id", "username", "action", "timestamp", "details", "ip_address", "user_agent",
+    "table_name", "record_id",
+], watermark="timestamp")
+register_export("innovation_ideas", "innovation_ideas", [
+    "id", "employee_sicil_no", "employee_name", "idea", "description", "category", "created_at",
+    "status", "score", "reviewed_by", "reviewed_at",
+], watermark="created_at", date_watermark=True)
+
+
+def available_formats():
+    return [fmt for fmt in EXPORT_FORMATS if fmt != 'parquet' or PARQUET_AVAILABLE]
+
+
+# =============================================================================
+# YAZICILAR
+# =============================================================================
+
+class _ParquetWriter:
+    def __init__(self, path):
+        if not PARQUET_AVAILABLE:
+            raise RuntimeError("Parquet için pyarrow kurulu değil.")
+        self.path = path
+        self._writer = None
+        self._schema = None
+
+    def write(self, df):
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if self._writer is None:
+            # İlk parçada tamamen boş sütunların tipi bilinmez; metin kabul edilir
+            fields = [pa.field(f.name, pa.string()) if pa.types.is_null(f.type) else f
+                      for f in table.schema]
+            self._schema = pa.schema(fields)
+            self._writer = pq.ParquetWriter(self.path, self._schema, compression="zstd")
+        if not table.schema.equals(self._schema):
+            table = table.cast(self._schema, safe=False)
+        self._writer.write_table(table)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+class _CsvGzWriter:
+    def __init__(self, path):
+        self.path = path
+        self._file = gzip.open(path, "wt", encoding="utf-8", newline="", compresslevel=6)
+        self._header = True
+
+    def write(self, df):
+        df.to_csv(self._file, header=self._header, index=False)
+        self._header = False
+
+    def close(self):
+        self._file.close()
+
+
+class _XlsxWriter:
+    def __init__(self, path):
+        from openpyxl import Workbook
+
+        self.path = path
+        self._workbook = Workbook(write_only=True)
+        self._sheet = None
+        self._sheet_rows = 0
+        self._columns = None
+
+    def _new_sheet(self):
+        index = len(self._workbook.worksheets) + 1
+        self._sheet = self._workbook.create_sheet(title=f"Sayfa{index}")
+        self._sheet.append(self._columns)
+        self._sheet_rows = 0
+
+    def write(self, df):
+        if self._columns is None:
+            self._columns = list(df.columns)
+            self._new_sheet()
+        values = df.astype("object").where(df.notna(), None)
+        for row in values.itertuples(index=False, name=None):
+            if self._sheet_rows >= XLSX_MAX_ROWS:
+                self._new_sheet()
+            self._sheet.append(row)
+            self._sheet_rows += 1
+
+    def close(self):
+        if self._columns is None:
+            self._workbook.create_sheet(title="Sayfa1")
+        self._workbook.save(self.path)
+
+
+_WRITERS = {
+    'parquet': _ParquetWriter,
+    'csv.gz': _CsvGzWriter,
+    'xlsx': _XlsxWriter,
+}
+
+
+# =============================================================================
+# FİLİGRANLAR
+# =============================================================================
+
+def _watermark_key(source, fmt):
+    return f"{source}:{fmt}"
+
+
+def get_watermark(source, fmt):
+    """Son başarılı artımlı aktarımın üst sınırı (yoksa None)"""
+    ph = config.sql_placeholder()
+    return config.fetch_scalar(
+        f"SELECT watermark FROM export_watermarks WHERE name = {ph}", (_watermark_key(source, fmt),)
+    )
+
+
+def _save_watermark(source, fmt, watermark, rows, path):
+    ph = config.sql_placeholder()
+    if config.DATABASE_TYPE == 'mysql':
+        query = f"""
+            INSERT INTO export_watermarks (name, watermark, rows_exported, path)
+            VALUES ({ph}, {ph}, {ph}, {ph})
+            ON DUPLICATE KEY UPDATE watermark = VALUES(watermark),
+                rows_exported = VALUES(rows_exported), path = VALUES(path)
+        """
+    else:
+        query = f"""
+            INSERT INTO export_watermarks (name, watermark, rows_exported, path)
+            VALUES ({ph}, {ph}, {ph}, {ph})
+            ON CONFLICT(name) DO UPDATE SET watermark = excluded.watermark,
+                rows_exported = excluded.rows_exported, path = excluded.path,
+                updated_at = CURRENT_TIMESTAMP
+        """
+    config.execute_many(query, [(_watermark_key(source, fmt), watermark, rows, path)])
+
+
+def _current_watermark(spec):
+    expr = "CURRENT_DATE" if spec['date_watermark'] else "CURRENT_TIMESTAMP"
+    return str(config.fetch_scalar(f"SELECT {expr}"))
+
+
+def _export_filter(spec, since, until):
+    ph = config.sql_placeholder()
+    wm = spec['watermark']
+    if since is None:
+        return f"({wm} < {ph} OR {wm} IS NULL)", (until,), "id"
+    return f"{wm} >= {ph} AND {wm} < {ph}", (since, until), f"{wm}, id"
+
+
+def build_export_query(source, since=None, until=None):
+    """Kaynak için (sorgu, parametreler) üret; `since` verilirse artımlı"""
+    spec = EXPORT_SOURCES[source]
+    where, params, order = _export_filter(spec, since, until)
+    columns = ", ".join(spec['columns'])
+    return f"SELECT {columns} FROM {spec['table']} WHERE {where} ORDER BY {order}", params
+
+
+def count_export_rows(source, since=None, until=None):
+    spec = EXPORT_SOURCES[source]
+    where, params, _ = _export_filter(spec, since, until)
+    return config.fetch_scalar(f"SELECT COUNT(*) FROM {spec['table']} WHERE {where}", params, default=0)
+
+
+# =============================================================================
+# AKTARIM
+# =============================================================================
+
+def run_export(source, fmt="csv.gz", incremental=False, chunk_size=EXPORT_CHUNK_SIZE, progress=None):
+    """Kaynağı dosyaya akıt; sonuç sözlüğünü döndürür.
+
+    `progress(yazılan, toplam)` her parçadan sonra çağrılır. Artımlı
+    aktarımda yeni satır yoksa dosya oluşturulmaz (`path` None), filigran
+    yine ilerletilir.
+    """
+    if source not in EXPORT_SOURCES:
+        raise ValueError(f"Bilinmeyen dışa aktarım kaynağı: {source}")
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Desteklenmeyen biçim: {fmt}")
+
+    spec = EXPORT_SOURCES[source]
+    since = get_watermark(source, fmt) if incremental else None
+    until = _current_watermark(spec)
+    query, params = build_export_query(source, since, until)
+
+    total = count_export_rows(source, since, until)
+    if progress:
+        progress(0, total)
+
+    path = None
+    rows = 0
+    started = time.perf_counter()
+    if total:
+        os.makedirs(EXPORT_DIR, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        kind = "delta" if since is not None else "full"
+        path = os.path.join(EXPORT_DIR, f"{source}_{kind}_{stamp}{EXPORT_FORMATS[fmt]}")
+        # Yarım kalan dosya hiçbir zaman nihai adla görünmez
+        part_path = path + ".part"
+        writer = _WRITERS[fmt](part_path)
+        try:
+            for chunk in config.iter_dataframe(query, params, chunk_size):
+                writer.write(chunk)
+                rows += len(chunk)
+                if progress:
+                    progress(rows, max(total, rows))
+            writer.close()
+            os.replace(part_path, path)
+        except BaseException:
+            try:
+                writer.close()
+            except Exception:
+                pass
+            if os.path.exists(part_path):
+                os.remove(part_path)
+            raise
+
+    if incremental:
+        _save_watermark(source, fmt, until, rows, path)
+    elapsed = time.perf_counter() - started
+    logger.info(f"Dışa aktarım tamamlandı: {source} ({fmt}) {rows} satır, {elapsed:.1f} sn -> {path}")
+    return {'source': source, 'format': fmt, 'rows': rows, 'path': path,
+            'since': since, 'until': until, 'elapsed': elapsed}
+
+
+# =============================================================================
+# ARKA PLAN İŞLERİ
+# =============================================================================
+
+class ExportJob:
+    """Arka planda çalışan bir dışa aktarımın durumu (thread'ler arası salt okunur)"""
+
+    def __init__(self, source, fmt, incremental):
+        self.id = uuid.uuid4().hex[:12]
+        self.source = source
+        self.format = fmt
+        self.incremental = incremental
+        self.status = "bekliyor"
+        self.rows = 0
+        self.total = None
+        self.path = None
+        self.error = None
+        self.created_at = datetime.now()
+        self.finished_at = None
+
+    @property
+    def done(self):
+        return self.status in ("tamamlandı", "hata")
+
+    @property
+    def fraction(self):
+        if self.status == "tamamlandı":
+            return 1.0
+        if not self.total:
+            return 0.0
+        return min(self.rows / self.total, 1.0)
+
+    def _progress(self, rows, total):
+        self.rows = rows
+        self.total = total
+
+    def _run(self):
+        self.status = "çalışıyor"
+        try:
+            result = run_export(self.source, self.format, self.incremental, progress=self._progress)
+            self.rows = result['rows']
+            self.path = result['path']
+            self.status = "tamamlandı"
+        except Exception as e:
+            logger.error(f"Dışa aktarım hatası ({self.source}, {self.format}): {e}")
+            self.error = str(e)
+            self.status = "hata"
+        finally:
+            self.finished_at = datetime.now()
+
+
+_executor = None
+_jobs = {}
+_jobs_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    with _jobs_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=EXPORT_MAX_WORKERS, thread_name_prefix="export")
+        return _executor
+
+
+def start_export(source, fmt="csv.gz", incremental=False):
+    """Aktarımı arka planda başlat; Streamlit script thread'ini bloklamaz"""
+    if source not in EXPORT_SOURCES:
+        raise ValueError(f"Bilinmeyen dışa aktarım kaynağı: {source}")
+    if fmt not in available_formats():
+        raise ValueError(f"Desteklenmeyen biçim: {fmt}")
+    job = ExportJob(source, fmt, incremental)
+    with _jobs_lock:
+        _jobs[job.id] = job
+        # Geçmiş sınırı aşılırsa en eski biten işler unutulur
+        finished = sorted((j for j in _jobs.values() if j.done), key=lambda j: j.created_at)
+        for old in finished[:max(0, len(_jobs) - EXPORT_JOB_HISTORY)]:
+            del _jobs[old.id]
+    _get_executor().submit(job._run)
+    return job
+
+
+def get_job(job_id):
+    with _jobs_lock:
+        return _jobs.get(job_id)
+
+
+def list_jobs():
+    with _jobs_lock:
+        return sorted(_jobs.values(), key=lambda j: j.created_at, reverse=True)
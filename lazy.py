@@ -0,0 +1,80 @@
+# lazy.py
+"""İlk kullanımda yüklenen modüller.
+
+    px = lazy_import("plotly.express")
+    excel_to_db = lazy_import("excel_to_db", optional=True)
+
+Vekil nesne ilk öznitelik erişiminde gerçek modülü import eder. `bool()`
+modülü yüklemeden yalnızca kurulu olup olmadığına bakar; böylece isteğe
+bağlı özellikler `if not excel_to_db:` ile sekme açılmadan kontrol edilebilir.
+"""
+
+import importlib
+import importlib.util
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class LazyModule:
+    __slots__ = ('_name', '_optional', '_module', '_available', '_lock')
+
+    def __init__(self, name, optional=False):
+        self._name = name
+        self._optional = optional
+        self._module = None
+        self._available = None
+        self._lock = threading.Lock()
+
+    @property
+    def available(self):
+        """Modül kurulu mu? (import etmeden)"""
+        if self._module is not None:
+            return True
+        if self._available is None:
+            try:
+                self._available = importlib.util.find_spec(self._name) is not None
+            except (ImportError, ValueError):
+                self._available = False
+        return self._available
+
+    @property
+    def loaded(self):
+        return self._module is not None
+
+    def load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    try:
+                        self._module = importlib.import_module(self._name)
+                    except ImportError as e:
+                        self._available = False
+                        if self._optional:
+                            logger.warning(f"İsteğe bağlı modül yüklenemedi: {self._name} ({e})")
+                        raise
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self.load(), attr)
+
+    def __bool__(self):
+        return self.available
+
+    def __repr__(self):
+        state = "yüklü" if self._module is not None else "yüklenmedi"
+        return f"<LazyModule {self._name} ({state})>"
+
+
+def lazy_import(name, optional=False):
+    """`name` modülü için ilk kullanımda yüklenen vekil döndür"""
+    return LazyModule(name, optional)
+
+
+def is_available(name):
+    """Modül import edilmeden kurulu olup olmadığını kontrol et"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
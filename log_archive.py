@@ -0,0 +1,406 @@
+# log_archive.py
+"""`logs` tablosu için saklama süresi ve aylık arşiv.
+
+`archive_logs()` `LOG_RETENTION_DAYS` günden eski satırları id sırasıyla
+parça parça okur, her parçayı zaman damgasının ayına göre
+`logs/archive/AAAA-AA/part-<ilk_id>-<son_id>.parquet` dosyalarına yazar
+(pyarrow yoksa aynı adla `.sqlite` segmenti) ve ancak dosya yerine
+konduktan sonra satırları sıcak tablodan siler. Silmeden önce kesilen bir
+çalıştırma aynı satırları tekrar yazabilir; okuma ve sıkıştırma id
+üzerinden tekilleştirir.
+
+Tamamen saklama süresinin dışına düşmüş aylardaki parçalar tek dosyada
+birleştirilir. `query_logs()` önce sıcak tabloyu, gerekirse yalnızca
+istenen zaman aralığına düşen ay klasörlerini okur.
+
+Zamanlanmış çalıştırma için `start_scheduler()` (panel süreç başına bir
+kez başlatır) ya da `python manage.py archive-logs` kullanılır.
+"""
+
+import glob
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+import config
+from lazy import lazy_import, is_available
+
+pa = lazy_import("pyarrow")
+pq = lazy_import("pyarrow.parquet")
+PARQUET_AVAILABLE = is_available("pyarrow")
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_DIR = os.path.join(config.BASE_DIR, "logs", "archive")
+LOG_RETENTION_DAYS = 90
+LOG_ARCHIVE_CHUNK_SIZE = 50000
+LOG_ARCHIVE_INTERVAL = 6 * 3600     # Zamanlayıcı çalıştırma aralığı (sn)
+LOG_ARCHIVE_FIRST_DELAY = 60        # Açılıştan sonra ilk çalıştırmaya kadar bekleme (sn)
+LOG_ARCHIVE_LOCK_STALE = 3600       # Bu süreden eski kilit dosyası yarım kalmış çalıştırmadır (sn)
+LOG_ARCHIVE_FORMAT = "parquet" if PARQUET_AVAILABLE else "sqlite"
+
+LOG_COLUMNS = ("id", "username", "action", "timestamp", "details", "ip_address",
+               "user_agent", "table_name", "record_id")
+_TEXT_COLUMNS = [c for c in LOG_COLUMNS if c not in ("id", "timestamp")]
+_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+_SEGMENT_EXTENSIONS = {'parquet': ".parquet", 'sqlite': ".sqlite"}
+
+
+# =============================================================================
+# SEGMENTLER
+# =============================================================================
+
+def _normalize_frame(df):
+    df = df.loc[:, list(LOG_COLUMNS)].copy()
+    df['id'] = df['id'].astype("int64")
+    df['timestamp'] = pd.to_datetime(df['timestamp'], errors="coerce")
+    for column in _TEXT_COLUMNS:
+        df[column] = df[column].astype(object).where(df[column].notna(), None)
+    return df
+
+
+def _parquet_schema():
+    fields = [pa.field("id", pa.int64()), pa.field("timestamp", pa.timestamp("s"))]
+    fields += [pa.field(c, pa.string()) for c in _TEXT_COLUMNS]
+    return pa.schema([next(f for f in fields if f.name == c) for c in LOG_COLUMNS])
+
+
+def _write_segment(path, df):
+    """Segmenti geçici dosyaya yaz, sonra atomik olarak yerine koy"""
+    tmp_path = os.path.join(ARCHIVE_DIR, f".{uuid.uuid4().hex}.tmp")
+    try:
+        if path.endswith(".parquet"):
+            table = pa.Table.from_pandas(df, schema=_parquet_schema(), preserve_index=False)
+            pq.write_table(table, tmp_path, compression="zstd")
+        else:
+            with sqlite3.connect(tmp_path) as conn:
+                conn.execute(f"CREATE TABLE logs ({', '.join(LOG_COLUMNS)})")
+                conn.execute("CREATE INDEX idx_logs_timestamp ON logs (timestamp)")
+                rows = df.assign(timestamp=df['timestamp'].dt.strftime(_TIMESTAMP_FORMAT))
+                rows = rows.astype(object).where(rows.notna(), None)
+                conn.executemany(f"INSERT INTO logs VALUES ({', '.join('?' * len(LOG_COLUMNS))})",
+                                 rows.itertuples(index=False, name=None))
+            conn.close()
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _read_segment(path, start=None, end=None, username=None, action=None):
+    if path.endswith(".parquet"):
+        filters = []
+        if start is not None:
+            filters.append(("timestamp", ">=", start))
+        if end is not None:
+            filters.append(("timestamp", "<", end))
+        if username:
+            filters.append(("username", "==", username))
+        if action:
+            filters.append(("action", "==", action))
+        return pq.read_table(path, filters=filters or None).to_pandas()
+
+    where, params = [], []
+    if start is not None:
+        where.append("timestamp >= ?")
+        params.append(start.strftime(_TIMESTAMP_FORMAT))
+    if end is not None:
+        where.append("timestamp < ?")
+        params.append(end.strftime(_TIMESTAMP_FORMAT))
+    if username:
+        where.append("username = ?")
+        params.append(username)
+    if action:
+        where.append("action = ?")
+        params.append(action)
+    query = f"SELECT {', '.join(LOG_COLUMNS)} FROM logs"
+    if where:
+        query += " WHERE " + " AND ".join(where)
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        df = pd.read_sql_query(query, conn, params=params)
+    finally:
+        conn.close()
+    df['timestamp'] = pd.to_datetime(df['timestamp'])
+    return df
+
+
+def _month_dir(month):
+    return os.path.join(ARCHIVE_DIR, month)
+
+
+def _segment_paths(month):
+    paths = []
+    for ext in _SEGMENT_EXTENSIONS.values():
+        paths += glob.glob(os.path.join(_month_dir(month), f"part-*{ext}"))
+    return sorted(paths)
+
+
+def archived_months():
+    """Arşivdeki aylar ('AAAA-AA'), eskiden yeniye"""
+    if not os.path.isdir(ARCHIVE_DIR):
+        return []
+    return sorted(name for name in os.listdir(ARCHIVE_DIR)
+                  if len(name) == 7 and name[4] == "-" and os.path.isdir(_month_dir(name)))
+
+
+def archive_stats():
+    """Ay başına segment sayısı ve disk boyutu"""
+    stats = []
+    for month in archived_months():
+        paths = _segment_paths(month)
+        stats.append({'month': month, 'segments': len(paths),
+                      'bytes': sum(os.path.getsize(p) for p in paths)})
+    return stats
+
+
+# =============================================================================
+# ARŞİVLEME
+# =============================================================================
+
+class _ArchiveLock:
+    """Süreçler arası tek arşivleyici (kilit dosyası)"""
+
+    def __init__(self):
+        self.path = os.path.join(ARCHIVE_DIR, ".lock")
+        self.acquired = False
+
+    def __enter__(self):
+        os.makedirs(ARCHIVE_DIR, exist_ok=True)
+        try:
+            if time.time() - os.path.getmtime(self.path) > LOG_ARCHIVE_LOCK_STALE:
+                os.remove(self.path)
+        except OSError:
+            pass
+        try:
+            os.close(os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            self.acquired = True
+        except FileExistsError:
+            self.acquired = False
+        return self
+
+    def touch(self):
+        """Uzun çalıştırmada kilidin bayat sayılmaması için zaman damgasını yenile"""
+        if self.acquired:
+            try:
+                os.utime(self.path)
+            except OSError:
+                pass
+
+    def __exit__(self, *exc):
+        if self.acquired:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+
+def retention_cutoff(days=LOG_RETENTION_DAYS):
+    """Bu zamandan eski satırlar arşivlenir (veritabanı saatine göre)"""
+    now = datetime.strptime(str(config.fetch_scalar("SELECT CURRENT_TIMESTAMP"))[:19], _TIMESTAMP_FORMAT)
+    return (now - timedelta(days=days)).strftime(_TIMESTAMP_FORMAT)
+
+
+def _write_chunk(chunk, fmt):
+    df = _normalize_frame(chunk)
+    months = df['timestamp'].dt.strftime("%Y-%m").fillna("0000-00")
+    for month, part in df.groupby(months, sort=False):
+        os.makedirs(_month_dir(month), exist_ok=True)
+        name = f"part-{int(part['id'].iloc[0]):012d}-{int(part['id'].iloc[-1]):012d}{_SEGMENT_EXTENSIONS[fmt]}"
+        _write_segment(os.path.join(_month_dir(month), name), part)
+
+
+def compact_month(month):
+    """Ayın segmentlerini id'ye göre tekilleştirip tek dosyada birleştir"""
+    paths = _segment_paths(month)
+    if len(paths) < 2:
+        return False
+    df = pd.concat([_read_segment(p) for p in paths], ignore_index=True)
+    df = df.drop_duplicates("id").sort_values("id")
+    ext = _SEGMENT_EXTENSIONS[LOG_ARCHIVE_FORMAT]
+    name = f"part-{int(df['id'].iloc[0]):012d}-{int(df['id'].iloc[-1]):012d}{ext}"
+    target = os.path.join(_month_dir(month), name)
+    _write_segment(target, _normalize_frame(df))
+    for path in paths:
+        if path != target:
+            os.remove(path)
+    return True
+
+
+def archive_logs(days=LOG_RETENTION_DAYS, chunk_size=LOG_ARCHIVE_CHUNK_SIZE, dry_run=False, fmt=None):
+    """Saklama süresini aşan log satırlarını arşive taşı.
+
+    Dönen sözlükte taşınan satır sayısı, dokunulan aylar, birleştirilen
+    aylar ve süre bulunur. Başka bir süreç arşivliyorsa hiçbir şey yapılmaz.
+    """
+    fmt = fmt or LOG_ARCHIVE_FORMAT
+    if fmt == "parquet" and not PARQUET_AVAILABLE:
+        raise RuntimeError("Parquet için pyarrow kurulu değil.")
+    started = time.perf_counter()
+    cutoff = retention_cutoff(days)
+    ph = config.sql_placeholder()
+    status = {'cutoff': cutoff, 'archived': 0, 'months': set(), 'compacted': [], 'skipped': False,
+              'dry_run': dry_run}
+
+    if dry_run:
+        status['archived'] = config.fetch_scalar(
+            f"SELECT COUNT(*) FROM logs WHERE timestamp < {ph}", (cutoff,), default=0)
+        status['months'] = []
+        status['elapsed'] = time.perf_counter() - started
+        return status
+
+    with _ArchiveLock() as lock:
+        if not lock.acquired:
+            logger.info("Log arşivleme başka bir süreçte çalışıyor, atlandı.")
+            status['skipped'] = True
+            return status
+
+        select_sql = f"""
+            SELECT {', '.join(LOG_COLUMNS)} FROM logs
+            WHERE id > {ph} AND timestamp < {ph}
+            ORDER BY id
+            LIMIT {ph}
+        """
+        delete_sql = f"DELETE FROM logs WHERE id > {ph} AND id <= {ph} AND timestamp < {ph}"
+        last_id = 0
+        while True:
+            chunk = config.get_dataframe(select_sql, (last_id, cutoff, chunk_size))
+            if chunk is None or chunk.empty:
+                break
+            _write_chunk(chunk, fmt)
+            max_id = int(chunk['id'].iloc[-1])
+            # Satırlar ancak segment dosyası yerine konduktan sonra silinir
+            config.execute_many(delete_sql, [(last_id, max_id, cutoff)])
+            status['archived'] += len(chunk)
+            status['months'].update(pd.to_datetime(chunk['timestamp']).dt.strftime("%Y-%m").dropna())
+            last_id = max_id
+            lock.touch()
+            if len(chunk) < chunk_size:
+                break
+
+        # Saklama sınırının tamamen gerisinde kalan aylar artık değişmez
+        cutoff_month = cutoff[:7]
+        for month in archived_months():
+            if month < cutoff_month and compact_month(month):
+                status['compacted'].append(month)
+                lock.touch()
+
+    status['months'] = sorted(status['months'])
+    status['elapsed'] = time.perf_counter() - started
+    if status['archived'] or status['compacted']:
+        logger.info(f"Log arşivleme: {status['archived']} satır {len(status['months'])} aya taşındı, "
+                    f"{len(status['compacted'])} ay birleştirildi ({status['elapsed']:.1f} sn)")
+    return status
+
+
+# =============================================================================
+# SORGU
+# =============================================================================
+
+def _as_timestamp(value):
+    return None if value is None else pd.Timestamp(value)
+
+
+def query_logs(start=None, end=None, username=None, action=None, limit=200, include_archive=True):
+    """Sıcak tablo ve arşivden [start, end) aralığındaki en yeni `limit` log satırı.
+
+    Arşivden yalnızca aralığa düşen aylar, yeniden eskiye ve sonuç dolana
+    kadar okunur. `df.attrs['archive_months']` okunan ayları gösterir.
+    """
+    start, end = _as_timestamp(start), _as_timestamp(end)
+    ph = config.sql_placeholder()
+    where, params = [], []
+    if start is not None:
+        where.append(f"timestamp >= {ph}")
+        params.append(start.strftime(_TIMESTAMP_FORMAT))
+    if end is not None:
+        where.append(f"timestamp < {ph}")
+        params.append(end.strftime(_TIMESTAMP_FORMAT))
+    if username:
+        where.append(f"username = {ph}")
+        params.append(username)
+    if action:
+        where.append(f"action = {ph}")
+        params.append(action)
+    query = f"SELECT {', '.join(LOG_COLUMNS)} FROM logs"
+    if where:
+        query += " WHERE " + " AND ".join(where)
+    query += f" ORDER BY timestamp DESC LIMIT {int(limit)}"
+    hot = config.get_dataframe(query, tuple(params))
+    frames = [_normalize_frame(hot)] if hot is not None and not hot.empty else []
+    found = sum(len(f) for f in frames)
+
+    months_read = []
+    if include_archive and found < limit:
+        first = start.strftime("%Y-%m") if start is not None else None
+        # end hariçtir: ay başındaki bir end o ayı taramaz
+        last = (end - pd.Timedelta(seconds=1)).strftime("%Y-%m") if end is not None else None
+        for month in reversed(archived_months()):
+            if (last and month > last) or (first and month < first):
+                continue
+            part = pd.concat([_read_segment(p, start, end, username, action) for p in _segment_paths(month)],
+                             ignore_index=True)
+            months_read.append(month)
+            if not part.empty:
+                frames.append(_normalize_frame(part))
+                found += len(part)
+            if found >= limit:
+                break
+
+    if frames:
+        result = pd.concat(frames, ignore_index=True).drop_duplicates("id")
+        result = result.sort_values(["timestamp", "id"], ascending=False).head(limit).reset_index(drop=True)
+    else:
+        result = pd.DataFrame(columns=list(LOG_COLUMNS))
+    result.attrs['archive_months'] = months_read
+    return result
+
+
+# =============================================================================
+# ZAMANLAYICI
+# =============================================================================
+
+class ArchiveScheduler(threading.Thread):
+    """`archive_logs()`'u belirli aralıklarla çalıştıran arka plan thread'i"""
+
+    def __init__(self, interval=LOG_ARCHIVE_INTERVAL, first_delay=LOG_ARCHIVE_FIRST_DELAY):
+        super().__init__(name="log-archiver", daemon=True)
+        self.interval = interval
+        self.first_delay = first_delay
+        self.last_status = None
+        self.last_error = None
+        self._stop_event = threading.Event()
+
+    def run(self):
+        delay = self.first_delay
+        while not self._stop_event.wait(delay):
+            try:
+                self.last_status = archive_logs()
+                self.last_error = None
+            except Exception as e:
+                self.last_error = str(e)
+                logger.error(f"Log arşivleme hatası: {e}")
+            delay = self.interval
+
+    def stop(self):
+        self._stop_event.set()
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def start_scheduler(interval=LOG_ARCHIVE_INTERVAL, first_delay=LOG_ARCHIVE_FIRST_DELAY):
+    """Süreç başına tek zamanlayıcıyı başlat (zaten çalışıyorsa onu döndür)"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None or not _scheduler.is_alive():
+            _scheduler = ArchiveScheduler(interval, first_delay)
+            _scheduler.start()
+        return _scheduler
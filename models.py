@@ -0,0 +1,273 @@
+# models.py
+"""SQLAlchemy ORM modelleri ve motorları.
+
+Panel ham SQL ile çalışır; SQLAlchemy yalnızca bu modülü kullanan kod
+yolları için yüklenir (bkz. repository.py). Motorlar ilk istendiğinde
+config'teki havuz ayarlarıyla oluşturulur; SQLite bağlantıları panelin
+havuzlarıyla aynı PRAGMA'larla açılır. Geriye uyumluluk için `config.Base`,
+`config.User`, `config.SQLITE_ENGINE` vb. adlar bu modüle yönlendirilir.
+
+Şemanın kaynağı config.MIGRATIONS'tır. `create_ddl()` modellerden DDL
+üretir, `check_schema_drift()` modelleri canlı veritabanıyla karşılaştırır
+(`python manage.py check-schema`).
+"""
+
+import threading
+from datetime import date
+
+from sqlalchemy import (create_engine, inspect, Column, Integer, String, Text, DateTime, Boolean, ForeignKey,
+                        Date, Float, Computed, func, text)
+from sqlalchemy.engine import URL
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.schema import CreateTable, CreateIndex
+try:
+    from sqlalchemy.orm import declarative_base
+except ImportError:
+    from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import sessionmaker, relationship
+
+import config
+
+Base = declarative_base()
+
+# Zaman damgaları ham SQL yollarıyla aynı saatten (veritabanı, UTC) gelsin; özet ve
+# dışa aktarım filigranları created_at'i veritabanı saatiyle karşılaştırır
+_DB_NOW = text("CURRENT_TIMESTAMP")
+
+# =============================================================================
+# MOTORLAR
+# =============================================================================
+
+_engines = {}
+_engines_lock = threading.Lock()
+
+def get_sqlite_engine():
+    with _engines_lock:
+        if 'sqlite' not in _engines:
+            cfg = config.SQLITE_POOL_CONFIG
+            _engines['sqlite'] = create_engine(
+                "sqlite://",
+                creator=lambda: config.open_sqlite_connection(config.SQLITE_DB_PATH),
+                poolclass=QueuePool,
+                pool_size=cfg['max_connections'],
+                max_overflow=0,
+                pool_timeout=cfg['checkout_timeout'],
+            )
+        return _engines['sqlite']
+
+def get_mysql_engine():
+    if not config.MYSQL_AVAILABLE:
+        return None
+    with _engines_lock:
+        if 'mysql' not in _engines:
+            cfg = config.MYSQL_CONFIG
+            pool = config.MYSQL_POOL_CONFIG
+            mysql_url = URL.create(
+                "mysql+mysqlconnector", username=cfg['user'], password=cfg['password'], host=cfg['host'],
+                port=cfg['port'], database=cfg['database'], query={'charset': cfg['charset']},
+            )
+            _engines['mysql'] = create_engine(
+                mysql_url,
+                echo=False,
+                pool_size=pool['pool_size'],
+                max_overflow=0,
+                pool_timeout=pool['checkout_timeout'],
+                pool_recycle=int(pool['max_lifetime']),
+                pool_pre_ping=True,
+            )
+        return _engines['mysql']
+
+def get_engine():
+    """Etkin veritabanının motoru"""
+    return get_mysql_engine() if config.DATABASE_TYPE == 'mysql' else get_sqlite_engine()
+
+_session_factories = {}
+
+def get_session_factory():
+    """Etkin veritabanı için sessionmaker"""
+    backend = 'mysql' if config.DATABASE_TYPE == 'mysql' else 'sqlite'
+    with _engines_lock:
+        factory = _session_factories.get(backend)
+    if factory is None:
+        factory = sessionmaker(autoflush=False, expire_on_commit=False, bind=get_engine())
+        with _engines_lock:
+            factory = _session_factories.setdefault(backend, factory)
+    return factory
+
+# =============================================================================
+# ORM MODELLER
+# =============================================================================
+
+class User(Base):
+    __tablename__ = 'users'
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    username = Column(String(50), unique=True, nullable=False)
+    password = Column(String(255), nullable=False)
+    role = Column(String(20), nullable=False, default='calisan')
+    email = Column(String(100))
+    score = Column(Integer, default=0)
+    last_login = Column(DateTime)
+    token = Column(String(255))
+    employee_sicil_no = Column(String(20))
+    department = Column(String(100))
+    deleted = Column(Boolean, default=False)
+    created_at = Column(DateTime, server_default=_DB_NOW)
+
+class Employee(Base):
+    __tablename__ = 'employees'
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    Ad_Soyad = Column(String(100), nullable=False)
+    Pozisyon = Column(String(100), nullable=False)
+    Departman = Column(String(100), nullable=False)
+    Yonetici_Adi = Column(String(100))
+    IK_Yonetici_Adi = Column(String(100))
+    Email = Column(String(100))
+    Sicil_No = Column(String(20), unique=True, nullable=False)
+    İşe_Giriş_Tarihi = Column(Date)
+    Telefon = Column(String(20))
+    Adres = Column(Text)
+    Dogum_Tarihi = Column(Date)
+    Egitim = Column(Text)
+    Sertifikalar = Column(Text)
+    Yetenekler = Column(Text)
+    # Türkçe katlamalı arama anahtarı (v5); veritabanı hesaplar
+    Ad_Soyad_norm = Column(String(100), Computed(config.turkish_fold_sql('Ad_Soyad')))
+    deleted = Column(Boolean, default=False)
+    created_at = Column(DateTime, server_default=_DB_NOW)
+    updated_at = Column(DateTime, server_default=_DB_NOW, onupdate=func.current_timestamp())
+
+class Process(Base):
+    __tablename__ = 'processes'
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    process_name = Column(String(200), nullable=False)
+    description = Column(Text)
+    department = Column(String(100))
+    created_at = Column(Date, default=date.today)
+    score = Column(Integer, default=0)
+    weight = Column(Float, default=1.0)
+    deleted = Column(Boolean, default=False)
+    scores = relationship("ProcessScore", back_populates="process", lazy="raise_on_sql")
+
+class ProcessScore(Base):
+    __tablename__ = 'process_scores'
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    process_id = Column(Integer, ForeignKey('processes.id'))
+    employee_name = Column(String(100), nullable=False)
+    employee_sicil_no = Column(String(20))
+    # Sicil no, yoksa ad (v3); veritabanı hesaplar
+    employee_key = Column(String(100), Computed("COALESCE(employee_sicil_no, employee_name)"))
+    cikti = Column(Integer, default=0)
+    kalite = Column(Integer, default=0)
+    strateji = Column(Integer, default=0)
+    inovasyon = Column(Integer, default=0)
+    zaman = Column(Float, default=0)
+    ekstra = Column(Integer, default=0)
+    ekstra_aciklama = Column(Text)
+    toplam_skor = Column(Float, default=0)
+    tarih = Column(Date, default=date.today)
+    onay = Column(String(50), default='Beklemede')
+    created_at = Column(DateTime, server_default=_DB_NOW)
+    # Tembel yükleme sorgu atacaksa hata verir: N+1 yerine selectinload/joinedload kullanılmalı
+    process = relationship("Process", back_populates="scores", lazy="raise_on_sql")
+
+class InnovationIdea(Base):
+    __tablename__ = 'innovation_ideas'
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    employee_sicil_no = Column(String(20))
+    employee_name = Column(String(100), nullable=False)
+    idea = Column(Text, nullable=False)
+    description = Column(Text)
+    category = Column(String(100))
+    created_at = Column(Date, default=date.today)
+    status = Column(String(50), default='Beklemede')
+    score = Column(Integer, default=0)
+    reviewed_by = Column(String(50))
+    reviewed_at = Column(DateTime)
+
+class Project(Base):
+    __tablename__ = 'projects'
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String(200), nullable=False)
+    description = Column(Text)
+    start_date = Column(Date, default=date.today)
+    end_date = Column(Date, default=date.today)
+    status = Column(String(50), default='Planning')
+    budget = Column(Float, default=0)
+    manager_sicil_no = Column(String(20))
+    created_at = Column(DateTime, server_default=_DB_NOW)
+
+# =============================================================================
+# ŞEMA: DDL ÜRETİMİ VE SAPMA KONTROLÜ
+# =============================================================================
+
+def _dialect(backend=None):
+    backend = backend or ('mysql' if config.DATABASE_TYPE == 'mysql' else 'sqlite')
+    if backend == 'mysql':
+        from sqlalchemy.dialects import mysql
+        return mysql.dialect()
+    from sqlalchemy.dialects import sqlite
+    return sqlite.dialect()
+
+def create_ddl(backend=None):
+    """Modellerden CREATE TABLE/INDEX ifadeleri (bağımlılık sırasıyla)"""
+    dialect = _dialect(backend)
+    statements = []
+    for table in Base.metadata.sorted_tables:
+        statements.append(str(CreateTable(table).compile(dialect=dialect)).strip())
+        statements += [str(CreateIndex(index).compile(dialect=dialect)) for index in table.indexes]
+    return statements
+
+# Uzun adlar önce: DATETIME 'DATE'ten, TINYINT 'INT'ten önce eşleşmeli
+_TYPE_FAMILIES = (
+    ('datetime', ('DATETIME', 'TIMESTAMP')),
+    ('date', ('DATE',)),
+    ('integer', ('INT', 'BOOL')),
+    ('real', ('REAL', 'FLOA', 'DOUB', 'DEC', 'NUMERIC')),
+    ('text', ('CHAR', 'TEXT', 'CLOB')),
+)
+
+def _type_family(type_name):
+    type_name = type_name.upper()
+    for family, markers in _TYPE_FAMILIES:
+        if any(marker in type_name for marker in markers):
+            return family
+    return type_name
+
+def _types_compatible(model_family, db_family, backend):
+    if model_family == db_family:
+        return True
+    # SQLite tarihleri metin olarak saklar; TEXT sütun DateTime/Date modeliyle uyumludur
+    return backend == 'sqlite' and model_family in ('date', 'datetime') and db_family == 'text'
+
+def check_schema_drift(engine=None):
+    """Modelleri canlı şemayla karşılaştır; her sapma için bir sözlük döndür (boşsa uyumlu)"""
+    engine = engine or get_engine()
+    backend = engine.dialect.name
+    inspector = inspect(engine)
+    existing = set(inspector.get_table_names())
+    drift = []
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing:
+            drift.append({'table': table.name, 'column': None, 'issue': 'tablo yok'})
+            continue
+        db_columns = {col['name']: col for col in inspector.get_columns(table.name)}
+        for column in table.columns:
+            db_col = db_columns.pop(column.name, None)
+            if db_col is None:
+                drift.append({'table': table.name, 'column': column.name, 'issue': 'sütun yok'})
+                continue
+            model_type = column.type.compile(dialect=engine.dialect)
+            db_type = str(db_col['type'])
+            if not _types_compatible(_type_family(model_type), _type_family(db_type), backend):
+                drift.append({'table': table.name, 'column': column.name, 'issue': 'tip',
+                              'model': model_type, 'database': db_type})
+            elif backend == 'mysql' and getattr(column.type, 'length', None) and \
+                    getattr(db_col['type'], 'length', None) not in (None, column.type.length):
+                drift.append({'table': table.name, 'column': column.name, 'issue': 'uzunluk',
+                              'model': column.type.length, 'database': db_col['type'].length})
+            if not column.primary_key and column.nullable != db_col['nullable']:
+                drift.append({'table': table.name, 'column': column.name, 'issue': 'nullable',
+                              'model': column.nullable, 'database': db_col['nullable']})
+        for name in db_columns:
+            drift.append({'table': table.name, 'column': name, 'issue': 'modelde yok'})
+    return drift
@@ -0,0 +1,426 @@
+# org_hierarchy.py
+"""Yönetim hiyerarşisi kapanış tablosu ve zincir sorguları.
+
+`employees.Yonetici_Adi` (yönetici hattı) ve `IK_Yonetici_Adi` (İK hattı)
+yöneticinin adını tutar. Her hat için `org_hierarchy` tablosunda tüm
+(üst, ast, derinlik) çiftleri saklanır; derinlik 0 satırı çalışanın kendisidir.
+Böylece "X'in altındaki herkes" ve "Y, X'in zincirinde mi" soruları özyinelemeli
+CTE ya da Python döngüsü yerine tek indeksli aramayla cevaplanır:
+
+    org_hierarchy.reports_under("S0000042")              # tüm astlar, derinlikleriyle
+    org_hierarchy.in_chain("S0000042", "S0001234")       # True / False
+    org_hierarchy.departments_under("S0000042")          # departman kapsamlı yetki için
+
+Yönetici adı aktif bir çalışanın `Ad_Soyad`'ı ile birebir eşleşmelidir. Aynı
+adda birden çok çalışan varsa astla aynı departmandaki, o da yoksa en küçük
+id'li olan seçilir. Döngü oluşturan bağlantı (id sırasıyla bağlanırken
+döngüyü kapatan) yok sayılır, günlüğe ve `org_hierarchy_cycles`'a yazılır;
+döngü kırılınca sonraki yenilemede bağlanır. Döngülü veride artımlı sonuç,
+hangi bağlantının atlandığı bakımından tam kurulumdan farklı olabilir.
+
+Tetikleyiciler değişen çalışanı `org_hierarchy_queue`'ya ekler. `refresh()`
+kuyruğu okur; yalnızca etkilenen çalışanların alt ağaçlarını eski üst
+zincirinden koparıp yenisine bağlar. Kuyruk `ORG_FULL_REBUILD_NODES`'tan çok
+çalışana dokunuyorsa (ör. Excel aktarımı) ya da tam kurulum istenmişse kapanış
+bellekte baştan hesaplanır. Tam kurulum büyük veride dakikalar sürebildiğinden
+sorgu yardımcıları yenileme yapmaz, o anki kapanışı okur; yenileme yazan
+taraftan (`manage.py`), ya da `refresh_in_background()` ile arka planda yapılır.
+"""
+
+import logging
+import threading
+import time
+from collections import defaultdict
+
+import config
+
+logger = logging.getLogger(__name__)
+
+# hat adı -> (org_hierarchy.line değeri, yöneticinin adını tutan sütun)
+LINES = {
+    'yonetici': (1, "Yonetici_Adi"),
+    'ik': (2, "IK_Yonetici_Adi"),
+}
+DEFAULT_LINE = 'yonetici'
+
+ORG_FULL_REBUILD_NODES = 2000   # Daha çok çalışan etkilenmişse bellekte baştan kurmak daha ucuz
+INSERT_CHUNK_SIZE = 50000
+MAX_DEPTH = 10000               # reports_under(max_depth=None) için üst sınır
+
+_ACTIVE = "(deleted = 0 OR deleted IS NULL)"
+_refresh_lock = threading.Lock()
+_background_lock = threading.Lock()
+_background = None
+
+
+def _line_code(line):
+    if line not in LINES:
+        raise ValueError(f"Bilinmeyen hiyerarşi hattı: {line} (geçerli: {', '.join(LINES)})")
+    return LINES[line][0]
+
+
+def _resolve(candidates, employee_id, department):
+    """Yönetici adının adaylarından birini seç: önce aynı departman, sonra en küçük id"""
+    options = [c for c in candidates if c[0] != employee_id]
+    if not options:
+        return None
+    same_department = [c for c in options if c[1] == department]
+    return min(same_department or options)[0]
+
+
+# =============================================================================
+# YENİLEME
+# =============================================================================
+
+def _select_in(cursor, query, values):
+    """`{in}` yer tutucusunu parça parça IN listesiyle çalıştır, tüm satırları döndür"""
+    ph = config.sql_placeholder()
+    rows = []
+    for chunk in config.chunked(values):
+        cursor.execute(query.format(ph=ph, **{'in': ", ".join([ph] * len(chunk))}), tuple(chunk))
+        rows.extend(cursor.fetchall())
+    return rows
+
+
+def _insert_ignore():
+    return "INSERT IGNORE" if config.DATABASE_TYPE == 'mysql' else "INSERT OR IGNORE"
+
+
+def _detach(cursor, code, node):
+    """Düğümün alt ağacını (kendisi dahil) tüm üstlerinden kopar"""
+    ph = config.sql_placeholder()
+    if config.DATABASE_TYPE == 'mysql':
+        # MySQL alt sorguda silinen tabloya izin vermez; çok tablolu DELETE ile aynı küme
+        cursor.execute(f"""
+            DELETE h FROM org_hierarchy h
+            JOIN org_hierarchy a ON a.line = h.line AND a.ancestor_id = h.ancestor_id
+            JOIN org_hierarchy d ON d.line = h.line AND d.descendant_id = h.descendant_id
+            WHERE h.line = {ph} AND a.descendant_id = {ph} AND a.depth > 0 AND d.ancestor_id = {ph}
+        """, (code, node, node))
+    else:
+        cursor.execute(f"""
+            DELETE FROM org_hierarchy
+            WHERE line = {ph}
+              AND ancestor_id IN (SELECT ancestor_id FROM org_hierarchy
+                                  WHERE line = {ph} AND descendant_id = {ph} AND depth > 0)
+              AND descendant_id IN (SELECT descendant_id FROM org_hierarchy
+                                    WHERE line = {ph} AND ancestor_id = {ph})
+        """, (code, code, node, code, node))
+
+
+def _attach(cursor, code, node, parent):
+    """Düğümün alt ağacını `parent`'ın ve tüm üstlerinin altına ekle"""
+    ph = config.sql_placeholder()
+    cursor.execute(f"""
+        INSERT INTO org_hierarchy (line, ancestor_id, descendant_id, depth)
+        SELECT a.line, a.ancestor_id, d.descendant_id, a.depth + d.depth + 1
+        FROM org_hierarchy a
+        JOIN org_hierarchy d ON d.line = a.line AND d.ancestor_id = {ph}
+        WHERE a.line = {ph} AND a.descendant_id = {ph}
+    """, (node, code, parent))
+
+
+def _refresh_line(cursor, code, column, employee_ids, names):
+    """Kuyruktaki çalışanlar ve adları üzerinden tek hattı artımlı güncelle"""
+    ph = config.sql_placeholder()
+    # Etkilenenler: değişen çalışanlar, yönetici adı kuyruktaki adlardan biri olanlar ve
+    # döngü yüzünden bağlanamamış olanlar (döngü başka bir değişiklikle kırılmış olabilir)
+    affected = set(employee_ids)
+    cursor.execute(f"SELECT employee_id FROM org_hierarchy_cycles WHERE line = {ph}", (code,))
+    affected.update(row[0] for row in cursor.fetchall())
+    affected.update(row[0] for row in _select_in(
+        cursor, f"SELECT id FROM employees WHERE {column} IN ({{in}}) AND {_ACTIVE}", names))
+
+    employees = {row[0]: row[1:] for row in _select_in(
+        cursor, f"SELECT id, Departman, {column} FROM employees WHERE id IN ({{in}}) AND {_ACTIVE}", affected)}
+    removed = affected - employees.keys()
+
+    manager_names = {manager for _, manager in employees.values() if manager}
+    candidates = defaultdict(list)
+    for row in _select_in(cursor, f"SELECT id, Departman, Ad_Soyad FROM employees "
+                                  f"WHERE Ad_Soyad IN ({{in}}) AND {_ACTIVE}", manager_names):
+        candidates[row[2]].append((row[0], row[1]))
+    new_parent = {}
+    for node, (department, manager) in employees.items():
+        parent = _resolve(candidates.get(manager, ()), node, department) if manager else None
+        if parent is not None:
+            new_parent[node] = parent
+
+    current_parent, present = {}, set()
+    for node, ancestor, depth in _select_in(
+            cursor, f"SELECT descendant_id, ancestor_id, depth FROM org_hierarchy "
+                    f"WHERE line = {code} AND descendant_id IN ({{in}}) AND depth <= 1", affected):
+        if depth == 0:
+            present.add(node)
+        else:
+            current_parent[node] = ancestor
+
+    moved = sorted(node for node, parent in current_parent.items() if new_parent.get(node) != parent)
+    # Önce tüm taşınanlar koparılır: bağlama sırası ara durumda sahte döngü üretmesin
+    for node in moved:
+        _detach(cursor, code, node)
+    for node in removed:
+        cursor.execute(f"DELETE FROM org_hierarchy WHERE line = {ph} AND ancestor_id = {ph}", (code, node))
+
+    missing = (employees.keys() | set(new_parent.values())) - present
+    cursor.executemany(f"{_insert_ignore()} INTO org_hierarchy (line, ancestor_id, descendant_id, depth) "
+                       f"VALUES ({ph}, {ph}, {ph}, 0)", [(code, node, node) for node in sorted(missing)])
+
+    attached, cycles = 0, []
+    for node in sorted(new_parent):
+        if current_parent.get(node) == new_parent[node]:
+            continue
+        parent = new_parent[node]
+        cursor.execute(f"SELECT 1 FROM org_hierarchy WHERE line = {ph} AND ancestor_id = {ph} AND descendant_id = {ph}",
+                       (code, node, parent))
+        if cursor.fetchone():
+            cycles.append((node, parent))
+            continue
+        _attach(cursor, code, node, parent)
+        attached += 1
+    _save_cycles(cursor, code, cycles)
+    return {'nodes': len(affected), 'detached': len(moved), 'attached': attached, 'removed': len(removed),
+            'cycles': len(cycles)}
+
+
+def _save_cycles(cursor, code, cycles):
+    """Bağlanamayan çalışanları sonraki artımlı yenilemede yeniden denenmek üzere kaydet"""
+    ph = config.sql_placeholder()
+    cursor.execute(f"SELECT employee_id FROM org_hierarchy_cycles WHERE line = {ph}", (code,))
+    known = {row[0] for row in cursor.fetchall()}
+    cursor.execute(f"DELETE FROM org_hierarchy_cycles WHERE line = {ph}", (code,))
+    cursor.executemany(f"INSERT INTO org_hierarchy_cycles (line, employee_id) VALUES ({ph}, {ph})",
+                       [(code, node) for node, _ in cycles])
+    # Süregelen döngüler her yenilemede yeniden yazılmaz
+    for node, parent in cycles:
+        if node not in known:
+            logger.warning(f"Hiyerarşi döngüsü: çalışan id {node} yöneticisi id {parent} altına bağlanmadı")
+
+
+def _closure_rows(code, nodes, parent):
+    """Orman üzerinde DFS: her düğüm için (hat, üst, ast, derinlik) satırları; derinlik 0 dahil"""
+    children = defaultdict(list)
+    for node, p in parent.items():
+        children[p].append(node)
+    for root in sorted(n for n in nodes if n not in parent):
+        path = []
+        stack = [(root, 0)]
+        while stack:
+            node, level = stack.pop()
+            del path[level:]
+            path.append(node)
+            for depth, ancestor in enumerate(reversed(path)):
+                yield (code, ancestor, node, depth)
+            stack.extend((child, level + 1) for child in children.get(node, ()))
+
+
+def _rebuild_line(cursor, code, rows):
+    """Tek hattı aktif çalışanlardan bellekte kur ve parça parça yaz"""
+    ph = config.sql_placeholder()
+    candidates = defaultdict(list)
+    for node, name, department, _ in rows:
+        candidates[name].append((node, department))
+
+    parent, cycles = {}, []
+    # Artımlı yenilemeyle aynı kural: id sırasıyla bağla, döngü kuracak bağlantıyı atla
+    for node, _, department, manager in sorted(rows):
+        target = _resolve(candidates.get(manager, ()), node, department) if manager else None
+        if target is None:
+            continue
+        ancestor = target
+        while ancestor is not None and ancestor != node:
+            ancestor = parent.get(ancestor)
+        if ancestor == node:
+            cycles.append((node, target))
+            continue
+        parent[node] = target
+
+    cursor.execute(f"DELETE FROM org_hierarchy WHERE line = {ph}", (code,))
+    insert_sql = (f"INSERT INTO org_hierarchy (line, ancestor_id, descendant_id, depth) "
+                  f"VALUES ({ph}, {ph}, {ph}, {ph})")
+    batch, written = [], 0
+    for row in _closure_rows(code, [r[0] for r in rows], parent):
+        batch.append(row)
+        if len(batch) >= INSERT_CHUNK_SIZE:
+            cursor.executemany(insert_sql, batch)
+            written += len(batch)
+            batch = []
+    if batch:
+        cursor.executemany(insert_sql, batch)
+        written += len(batch)
+    _save_cycles(cursor, code, cycles)
+    return {'nodes': len(rows), 'rows': written, 'cycles': len(cycles)}
+
+
+def refresh(full=False):
+    """Kuyruktaki değişiklikleri kapanış tablosuna uygula.
+
+    Dönüş: mod ('tam' / 'artımlı'), işlenen kuyruk satırı, hat başına
+    etkilenen çalışan / döngü sayıları ve süre.
+    """
+    started = time.perf_counter()
+    ph = config.sql_placeholder()
+    with _refresh_lock, config.db_manager.get_connection() as conn:
+        cursor = conn.cursor()
+        if config.DATABASE_TYPE == 'mysql' and conn.autocommit:
+            conn.start_transaction()
+        # MySQL: kilitli okuma, commit edilmemiş eklemeleri atlayıp sonra silmesin
+        lock = " FOR UPDATE" if config.DATABASE_TYPE == 'mysql' else ""
+        cursor.execute(f"SELECT id, employee_id, ad_soyad FROM org_hierarchy_queue ORDER BY id{lock}")
+        queued = cursor.fetchall()
+        employee_ids = {row[1] for row in queued if row[1] is not None}
+        names = {row[2] for row in queued if row[2]}
+        full = full or any(row[1] is None for row in queued) or len(employee_ids) > ORG_FULL_REBUILD_NODES
+        if not queued and not full:
+            return {'mode': "boş", 'queued': 0, 'lines': {}, 'elapsed': time.perf_counter() - started}
+
+        lines = {}
+        if full:
+            cursor.execute("SELECT id, Ad_Soyad, Departman, Yonetici_Adi, IK_Yonetici_Adi "
+                           f"FROM employees WHERE {_ACTIVE}")
+            employees = cursor.fetchall()
+            # SQLite'ta ikincil indeks sonda tek seferde kurulur (DDL transaction içindedir;
+            # MySQL'de DDL örtük commit yaptığı için indeks yerinde kalır)
+            if config.DATABASE_TYPE != 'mysql':
+                cursor.execute("DROP INDEX IF EXISTS idx_org_hierarchy_descendant")
+            for offset, (line, (code, _)) in enumerate(LINES.items()):
+                rows = [(r[0], r[1], r[2], r[3 + offset]) for r in employees]
+                lines[line] = _rebuild_line(cursor, code, rows)
+            if config.DATABASE_TYPE != 'mysql':
+                cursor.execute(config.ORG_HIERARCHY_INDEX_SQL)
+        else:
+            for line, (code, column) in LINES.items():
+                lines[line] = _refresh_line(cursor, code, column, employee_ids, names)
+        if queued:
+            cursor.execute(f"DELETE FROM org_hierarchy_queue WHERE id <= {ph}", (queued[-1][0],))
+        conn.commit()
+
+    config.invalidate_tables("org_hierarchy")
+    result = {
+        'mode': "tam" if full else "artımlı",
+        'queued': len(queued),
+        'lines': lines,
+        'elapsed': time.perf_counter() - started,
+    }
+    logger.info(f"Yönetim hiyerarşisi yenilendi ({result['mode']}, {len(queued)} kuyruk satırı, "
+                f"{result['elapsed'] * 1000:.0f} ms)")
+    return result
+
+
+def has_pending():
+    """Kuyrukta uygulanmamış değişiklik var mı (tek indeksli okuma)"""
+    return config.fetch_scalar("SELECT MIN(id) FROM org_hierarchy_queue") is not None
+
+
+def _refresh_until_empty():
+    # Yenileme sürerken gelen değişiklikler de aynı iş parçacığında uygulanır
+    try:
+        while True:
+            refresh()
+            if not has_pending():
+                return
+    except Exception as e:
+        logger.error(f"Arka plan hiyerarşi yenileme hatası: {e}")
+
+
+def refresh_in_background():
+    """Kuyruk doluysa yenilemeyi arka plan iş parçacığında başlat; çağıranı bekletmez.
+
+    Süreç başına tek iş parçacığı çalışır; zaten çalışıyorsa yeni iş açılmaz.
+    Dönüş: yeni iş parçacığı başlatıldıysa True.
+    """
+    global _background
+    with _background_lock:
+        if _background is not None and _background.is_alive():
+            return False
+        if not has_pending():
+            return False
+        _background = threading.Thread(target=_refresh_until_empty, name="org-hierarchy-refresh", daemon=True)
+        _background.start()
+        return True
+
+
+# =============================================================================
+# SORGULAR
+# =============================================================================
+# Kayıtlı metinler '?' kullanır (check_query_plans); çalışırken _sql() çevirir.
+
+REPORTS_QUERY = config.register_query_plan("org_reports_under", """
+    SELECT e.Sicil_No, e.Ad_Soyad, e.Pozisyon, e.Departman, h.depth
+    FROM employees m
+    JOIN org_hierarchy h ON h.line = ? AND h.ancestor_id = m.id
+    JOIN employees e ON e.id = h.descendant_id
+    WHERE m.Sicil_No = ? AND h.depth BETWEEN ? AND ?
+    ORDER BY h.depth, e.Ad_Soyad
+""", (1, "S0000001", 1, MAX_DEPTH))
+
+DEPARTMENTS_QUERY = config.register_query_plan("org_departments_under", """
+    SELECT DISTINCT e.Departman
+    FROM employees m
+    JOIN org_hierarchy h ON h.line = ? AND h.ancestor_id = m.id
+    JOIN employees e ON e.id = h.descendant_id
+    WHERE m.Sicil_No = ? AND h.depth >= ?
+    ORDER BY e.Departman
+""", (1, "S0000001", 0))
+
+REPORT_COUNT_QUERY = config.register_query_plan("org_report_count", """
+    SELECT COUNT(*)
+    FROM employees m
+    JOIN org_hierarchy h ON h.line = ? AND h.ancestor_id = m.id
+    WHERE m.Sicil_No = ? AND h.depth > 0
+""", (1, "S0000001"))
+
+MANAGERS_QUERY = config.register_query_plan("org_managers_of", """
+    SELECT a.Sicil_No, a.Ad_Soyad, a.Pozisyon, a.Departman, h.depth
+    FROM employees e
+    JOIN org_hierarchy h ON h.line = ? AND h.descendant_id = e.id AND h.depth > 0
+    JOIN employees a ON a.id = h.ancestor_id
+    WHERE e.Sicil_No = ?
+    ORDER BY h.depth
+""", (1, "S0000001"))
+
+IN_CHAIN_QUERY = config.register_query_plan("org_in_chain", """
+    SELECT h.depth
+    FROM employees m
+    JOIN employees e ON e.Sicil_No = ?
+    JOIN org_hierarchy h ON h.line = ? AND h.ancestor_id = m.id AND h.descendant_id = e.id
+    WHERE m.Sicil_No = ? AND h.depth > 0
+""", ("S0000002", 1, "S0000001"))
+
+
+def _sql(query):
+    return query.replace('?', config.sql_placeholder())
+
+
+def reports_under(sicil_no, line=DEFAULT_LINE, max_depth=None, include_self=False, limit=None):
+    """`sicil_no`'nun altındaki tüm çalışanlar (derinlik 1 = doğrudan bağlı), derinlik ve ada göre"""
+    code = _line_code(line)
+    query = _sql(REPORTS_QUERY) + (f" LIMIT {int(limit)}" if limit else "")
+    return config.get_dataframe(query, (code, sicil_no, 0 if include_self else 1,
+                                        MAX_DEPTH if max_depth is None else max_depth),
+                                optimize_dtypes=True)
+
+
+def report_count(sicil_no, line=DEFAULT_LINE):
+    """Altındaki çalışan sayısı (kapanış tablosunda tek aralık sayımı)"""
+    code = _line_code(line)
+    return int(config.fetch_scalar(_sql(REPORT_COUNT_QUERY), (code, sicil_no), 0))
+
+
+def managers_of(sicil_no, line=DEFAULT_LINE):
+    """Çalışanın yönetim zinciri, doğrudan yöneticiden yukarı doğru (sözlük listesi)"""
+    code = _line_code(line)
+    return config.fetch_dicts(_sql(MANAGERS_QUERY), (code, sicil_no))
+
+
+def in_chain(manager_sicil, employee_sicil, line=DEFAULT_LINE):
+    """`employee_sicil`, `manager_sicil`'in altında mı (kendisi sayılmaz)"""
+    code = _line_code(line)
+    return config.fetch_scalar(_sql(IN_CHAIN_QUERY), (employee_sicil, code, manager_sicil)) is not None
+
+
+def departments_under(sicil_no, line=DEFAULT_LINE, include_self=True):
+    """Çalışanın ve altındakilerin departmanları (departman kapsamlı yetki kontrolleri için)"""
+    code = _line_code(line)
+    rows = config.fetch_dicts(_sql(DEPARTMENTS_QUERY), (code, sicil_no, 0 if include_self else 1))
+    return [row['Departman'] for row in rows if row['Departman']]
@@ -0,0 +1,264 @@
+# repository.py
+"""models.py üzerinde depo (repository) katmanı.
+
+Her model için `Repository` okuma, toplu yazma ve ilişki yükleme işlemlerini
+toplar. Toplu ekleme ve güncelleme Core `insert()`/`update()` ifadeleriyle
+parça başına tek `executemany` olarak yapılır; ORM birim-iş (unit of work)
+yolu yalnızca tek kayıtlarda kullanılır.
+
+İlişkiler modellerde `raise_on_sql` ile tanımlıdır: bir sayfa
+`score.process`'e erişmeden önce `load=("process",)` ile `selectinload`
+istemelidir, aksi halde N+1 sorgu yerine hata alınır.
+
+    scores = process_scores.for_employee("S0000042")          # process ilişkisi yüklü
+    process_scores.bulk_insert(df)                            # DataFrame ya da sözlük listesi
+    process_scores.bulk_update([{'id': 7, 'onay': 'Onaylandı'}])
+
+Yazmalardan sonra ilgili tabloların `versioned_cache` sürümleri artırılır;
+panelin önbellekleri ham SQL yazmalarında olduğu gibi eskir.
+"""
+
+import logging
+from contextlib import contextmanager
+from datetime import date, datetime
+
+import pandas as pd
+from sqlalchemy import Date, DateTime, bindparam, func, insert, or_, select, update
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.interfaces import LoaderOption
+
+import config
+import models
+
+logger = logging.getLogger(__name__)
+
+BULK_CHUNK_SIZE = 10000
+
+
+@contextmanager
+def session_scope():
+    """Başarıda commit, hatada rollback eden ORM oturumu"""
+    session = models.get_session_factory()()
+    try:
+        yield session
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+def _records(rows):
+    """DataFrame ya da sözlük dizisini sözlük listesine çevir (NaN -> None)"""
+    if isinstance(rows, pd.DataFrame):
+        return rows.astype(object).where(rows.notna(), None).to_dict("records")
+    return [dict(row) for row in rows]
+
+
+class Repository:
+    """Tek bir modelin okuma/yazma işlemleri"""
+
+    def __init__(self, model):
+        self.model = model
+        self.table = model.__table__
+        self._columns = {c.name for c in self.table.columns if c.computed is None}
+        self._soft_delete = 'deleted' in self.table.columns
+        # SQLite sürücüsü tarih sütunlarında yalnızca date/datetime kabul eder; Excel/CSV metinleri çevrilir
+        self._temporal = {c.name: datetime if isinstance(c.type, DateTime) else date
+                          for c in self.table.columns if isinstance(c.type, (Date, DateTime))}
+
+    def __repr__(self):
+        return f"<Repository {self.table.name}>"
+
+    # ----- okuma -----
+
+    def _loader_options(self, load):
+        """'process' gibi ilişki adları selectinload'a çevrilir; hazır seçenekler olduğu gibi geçer"""
+        options = []
+        for item in load:
+            options.append(item if isinstance(item, LoaderOption) else selectinload(getattr(self.model, item)))
+        return options
+
+    def _select(self, criteria=(), filters=None, load=(), include_deleted=False):
+        stmt = select(self.model)
+        if self._soft_delete and not include_deleted:
+            stmt = stmt.where(or_(self.model.deleted == False, self.model.deleted.is_(None)))  # noqa: E712
+        if criteria:
+            stmt = stmt.where(*criteria)
+        if filters:
+            stmt = stmt.filter_by(**filters)
+        if load:
+            stmt = stmt.options(*self._loader_options(load))
+        return stmt
+
+    def get(self, id, load=()):
+        with session_scope() as session:
+            return session.scalars(self._select((self.model.id == id,), load=load, include_deleted=True)).first()
+
+    def get_many(self, ids, load=()):
+        """id listesindeki kayıtlar, verilen sırayla (bulunmayanlar atlanır)"""
+        ids = list(ids)
+        found = {}
+        with session_scope() as session:
+            for chunk in config.chunked(ids):
+                stmt = self._select((self.model.id.in_(chunk),), load=load, include_deleted=True)
+                found.update((obj.id, obj) for obj in session.scalars(stmt))
+        return [found[i] for i in ids if i in found]
+
+    def find(self, *criteria, order_by=None, limit=None, offset=None, load=(), include_deleted=False, **filters):
+        """Koşullara uyan kayıtlar.
+
+            process_scores.find(ProcessScore.tarih >= "2024-01-01", onay="Onaylandı", load=("process",))
+        """
+        stmt = self._select(criteria, filters, load, include_deleted)
+        if order_by is not None:
+            stmt = stmt.order_by(*(order_by if isinstance(order_by, (list, tuple)) else (order_by,)))
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        if offset:
+            stmt = stmt.offset(offset)
+        with session_scope() as session:
+            return list(session.scalars(stmt))
+
+    def count(self, *criteria, include_deleted=False, **filters):
+        stmt = self._select(criteria, filters, include_deleted=include_deleted)
+        with session_scope() as session:
+            return session.scalar(select(func.count()).select_from(stmt.subquery()))
+
+    def iter_chunks(self, chunk_size=BULK_CHUNK_SIZE, load=(), include_deleted=False):
+        """Tüm kayıtları id sırasıyla parça parça oku (her parça ayrı oturum ve kısa sorgu)"""
+        last_id = 0
+        while True:
+            stmt = self._select((self.model.id > last_id,), load=load, include_deleted=include_deleted)
+            stmt = stmt.order_by(self.model.id).limit(chunk_size)
+            with session_scope() as session:
+                chunk = list(session.scalars(stmt))
+            if not chunk:
+                return
+            yield chunk
+            if len(chunk) < chunk_size:
+                return
+            last_id = chunk[-1].id
+
+    # ----- yazma -----
+
+    def _invalidate(self):
+        # Tetikleyicilerle birlikte değişen tablolar config.DERIVED_TABLES'tan gelir
+        config.invalidate_tables(self.table.name, *config.DERIVED_TABLES.get(self.table.name, ()))
+
+    def _prepare(self, records):
+        unknown = set().union(*(r.keys() for r in records)) - self._columns
+        if unknown:
+            raise ValueError(f"{self.table.name} için bilinmeyen sütunlar: {', '.join(sorted(unknown))}")
+        for record in records:
+            for name, kind in self._temporal.items():
+                value = record.get(name)
+                if isinstance(value, str):
+                    parsed = datetime.fromisoformat(value.strip())
+                    record[name] = parsed if kind is datetime else parsed.date()
+                elif kind is date and isinstance(value, datetime):
+                    record[name] = value.date()
+        return records
+
+    def add(self, values):
+        """Tek kayıt ekle (ORM yolu); veritabanı varsayılanları yüklenmiş nesneyi döndür"""
+        obj = values if isinstance(values, self.model) else self.model(**values)
+        with session_scope() as session:
+            session.add(obj)
+            session.flush()
+            session.refresh(obj)
+        self._invalidate()
+        return obj
+
+    def bulk_insert(self, rows, chunk_size=BULK_CHUNK_SIZE):
+        """Çok sayıda kaydı parça başına tek executemany ile ekle; eklenen satır sayısını döndür.
+
+        Aynı sütun kümesine sahip satırlar birlikte yazılır; verilmeyen
+        sütunlar model/veritabanı varsayılanını alır.
+        """
+        records = _records(rows)
+        if not records:
+            return 0
+        self._prepare(records)
+        groups = {}
+        for record in records:
+            groups.setdefault(frozenset(record), []).append(record)
+
+        stmt = insert(self.table)
+        with session_scope() as session:
+            for group in groups.values():
+                for chunk in config.chunked(group, chunk_size):
+                    session.execute(stmt, chunk)
+        self._invalidate()
+        logger.info(f"{self.table.name}: {len(records)} satır toplu eklendi")
+        return len(records)
+
+    def bulk_update(self, rows, chunk_size=BULK_CHUNK_SIZE):
+        """Birincil anahtara ('id') göre toplu güncelle; güncellenen kayıt sayısını döndür"""
+        records = _records(rows)
+        if not records:
+            return 0
+        if any('id' not in r for r in records):
+            raise ValueError("Toplu güncellemede her satırda 'id' olmalı.")
+        self._prepare(records)
+        # Kimlik ayrı parametre adıyla bağlanır; diğer anahtarlar SET'e dönüşür
+        stmt = update(self.table).where(self.table.c.id == bindparam('_id'))
+        groups = {}
+        for record in records:
+            record['_id'] = record.pop('id')
+            groups.setdefault(frozenset(record), []).append(record)
+        with session_scope() as session:
+            for group in groups.values():
+                for chunk in config.chunked(group, chunk_size):
+                    session.connection().execute(stmt, chunk)
+        self._invalidate()
+        return len(records)
+
+    def soft_delete(self, ids):
+        """`deleted` bayrağını işaretle (bayrağı olmayan tablolarda satırı sil)"""
+        ids = list(ids)
+        total = 0
+        with session_scope() as session:
+            for chunk in config.chunked(ids):
+                if self._soft_delete:
+                    stmt = update(self.table).where(self.table.c.id.in_(chunk)).values(deleted=True)
+                else:
+                    stmt = self.table.delete().where(self.table.c.id.in_(chunk))
+                total += session.execute(stmt).rowcount
+        self._invalidate()
+        return total
+
+
+class ProcessRepository(Repository):
+    def __init__(self):
+        super().__init__(models.Process)
+
+    def with_scores(self, *criteria, **filters):
+        """Süreçler ve skorları: süreç listesi için tek sorgu, tüm skorlar için tek sorgu"""
+        return self.find(*criteria, load=("scores",), order_by=models.Process.id, **filters)
+
+
+class ProcessScoreRepository(Repository):
+    def __init__(self):
+        super().__init__(models.ProcessScore)
+
+    def for_employee(self, sicil_no, with_process=True, limit=None):
+        """Çalışanın skorları, en yeni önce"""
+        ProcessScore = models.ProcessScore
+        return self.find(ProcessScore.employee_sicil_no == sicil_no,
+                         order_by=(ProcessScore.tarih.desc(), ProcessScore.id.desc()),
+                         limit=limit, load=("process",) if with_process else ())
+
+    def for_processes(self, process_ids, with_process=True):
+        ProcessScore = models.ProcessScore
+        return self.find(ProcessScore.process_id.in_(list(process_ids)), order_by=ProcessScore.id,
+                         load=("process",) if with_process else ())
+
+
+users = Repository(models.User)
+employees = Repository(models.Employee)
+processes = ProcessRepository()
+process_scores = ProcessScoreRepository()
+innovation_ideas = Repository(models.InnovationIdea)
+projects = Repository(models.Project)
@@ -0,0 +1,307 @@
+# rollups.py
+"""Rapor ve analitik için önceden toplanmış skor özetleri.
+
+İki özet tablosu tutulur:
+
+    score_rollup_dept_month      (süreç, ay) -> departman, sayı, bileşen toplam/sayı/min/max
+    score_rollup_employee_month  (çalışan, ay) -> ad, sayı, bileşen toplam/sayı/min/max
+
+Bileşen sayısı yalnızca NULL olmayan değerleri sayar; ortalama böylece AVG()
+ve employee_score_summary ile aynıdır.
+
+Ay `process_scores.tarih`'ten gelir ('YYYY-MM'). Artımlı yenileme
+`created_at` filigranından bu yana eklenen satırların dokunduğu grupları
+bulur ve yalnızca o grupları ham satırlardan yeniden hesaplar; aynı grubu
+iki kez hesaplamak sonucu değiştirmez. Geç commit edilen satırlar için
+pencere filigranın `ROLLUP_OVERLAP_SECONDS` öncesinden başlar.
+
+Güncelleme ve silmeler `created_at`'i değiştirmez; toplu değişikliklerden
+sonra (ör. scoring.rescore) `refresh_rollups(full=True)` çağrılır.
+
+`query_scores()` istenen kırılım ve filtreler özet tablosundan
+karşılanabiliyorsa oradan, karşılanamıyorsa ham tablodan okur.
+"""
+
+import logging
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+import config
+
+logger = logging.getLogger(__name__)
+
+DEPT_ROLLUP = "score_rollup_dept_month"
+EMPLOYEE_ROLLUP = "score_rollup_employee_month"
+
+ROLLUP_OVERLAP_SECONDS = 300     # Geç commit edilen satırlar için pencere payı
+ROLLUP_FULL_REFRESH_GROUPS = 2000  # Daha çok grup etkilenmişse tam yenileme daha ucuz
+ROLLUP_MAX_STALENESS = 60        # query_scores() bu süreden eski özeti önce yeniler (sn)
+
+METRICS = config.ROLLUP_METRICS
+AGGREGATES = ("avg", "sum", "min", "max")
+
+_MONTH_EXPR = "SUBSTR(ps.tarih, 1, 7)"
+_METRIC_COLUMNS = ", ".join(f"{m}_sum, {m}_count, {m}_min, {m}_max" for m in METRICS)
+_METRIC_AGGS = ", ".join(f"SUM(ps.{m}), COUNT(ps.{m}), MIN(ps.{m}), MAX(ps.{m})" for m in METRICS)
+
+# Her özet: hangi sütunlarla gruplandığı ve grubun ham satırlardaki karşılığı
+ROLLUPS = {
+    DEPT_ROLLUP: {
+        'columns': f"process_id, month, department, score_count, {_METRIC_COLUMNS}",
+        'select': f"COALESCE(ps.process_id, 0), {_MONTH_EXPR}, COALESCE(p.department, ''), COUNT(*), {_METRIC_AGGS}",
+        'from': "process_scores ps LEFT JOIN processes p ON p.id = ps.process_id",
+        'where': "ps.tarih IS NOT NULL",
+        'group': f"COALESCE(ps.process_id, 0), {_MONTH_EXPR}, COALESCE(p.department, '')",
+        'key': "process_id",
+        'changed_key': "COALESCE(process_id, 0)",
+        'dimensions': {"department", "process_id", "month", "year"},
+    },
+    EMPLOYEE_ROLLUP: {
+        'columns': f"employee_key, month, employee_name, score_count, {_METRIC_COLUMNS}",
+        'select': f"ps.employee_key, {_MONTH_EXPR}, MAX(ps.employee_name), COUNT(*), {_METRIC_AGGS}",
+        'from': "process_scores ps",
+        'where': "ps.tarih IS NOT NULL AND ps.employee_key IS NOT NULL",
+        'group': f"ps.employee_key, {_MONTH_EXPR}",
+        'key': "employee_key",
+        'changed_key': "employee_key",
+        'dimensions': {"employee_key", "month", "year"},
+    },
+}
+
+_refresh_lock = threading.Lock()
+_last_refresh = {}   # özet -> time.monotonic()
+
+
+# =============================================================================
+# YENİLEME
+# =============================================================================
+
+def _month_bounds(month):
+    """'2024-03' -> ('2024-03-01', '2024-04-01')"""
+    year, mon = int(month[:4]), int(month[5:7])
+    start = date(year, mon, 1)
+    end = date(year + mon // 12, mon % 12 + 1, 1)
+    return start.isoformat(), end.isoformat()
+
+
+def get_rollup_watermark(name):
+    ph = config.sql_placeholder()
+    return config.fetch_scalar(f"SELECT watermark FROM rollup_state WHERE name = {ph}", (name,))
+
+
+def _save_state(cursor, name, watermark):
+    ph = config.sql_placeholder()
+    if config.DATABASE_TYPE == 'mysql':
+        cursor.execute(f"""
+            INSERT INTO rollup_state (name, watermark) VALUES ({ph}, {ph})
+            ON DUPLICATE KEY UPDATE watermark = VALUES(watermark)
+        """, (name, watermark))
+    else:
+        cursor.execute(f"""
+            INSERT INTO rollup_state (name, watermark) VALUES ({ph}, {ph})
+            ON CONFLICT(name) DO UPDATE SET watermark = excluded.watermark, refreshed_at = CURRENT_TIMESTAMP
+        """, (name, watermark))
+
+
+def _changed_groups(name, since, until):
+    spec = ROLLUPS[name]
+    ph = config.sql_placeholder()
+    rows = config.execute_query(f"""
+        SELECT DISTINCT {spec['changed_key']} AS group_key, SUBSTR(tarih, 1, 7) AS month
+        FROM process_scores
+        WHERE created_at >= {ph} AND created_at < {ph} AND tarih IS NOT NULL
+    """, (since, until))
+    groups = []
+    for row in rows or []:
+        key, month = (row['group_key'], row['month']) if isinstance(row, dict) else row
+        if key is not None and month:
+            groups.append((key, month))
+    return groups
+
+
+def _rebuild_full(cursor, name):
+    spec = ROLLUPS[name]
+    cursor.execute(f"DELETE FROM {name}")
+    cursor.execute(f"""
+        INSERT INTO {name} ({spec['columns']})
+        SELECT {spec['select']} FROM {spec['from']}
+        WHERE {spec['where']}
+        GROUP BY {spec['group']}
+    """)
+
+
+def _rebuild_groups(cursor, name, groups):
+    spec = ROLLUPS[name]
+    ph = config.sql_placeholder()
+    key = spec['key']
+    delete_sql = f"DELETE FROM {name} WHERE {key} = {ph} AND month = {ph}"
+    insert_sql = f"""
+        INSERT INTO {name} ({spec['columns']})
+        SELECT {spec['select']} FROM {spec['from']}
+        WHERE {spec['where']} AND {{key_filter}} AND ps.tarih >= {ph} AND ps.tarih < {ph}
+        GROUP BY {spec['group']}
+    """
+    # process_id NULL satırlar 0 grubunda toplanır; indeksli eşitlik yalnızca gerçek id'lerde
+    keyed_sql = insert_sql.format(key_filter=f"ps.{key} = {ph}")
+    null_sql = insert_sql.format(key_filter=f"ps.{key} IS NULL")
+    for group_key, month in groups:
+        start, end = _month_bounds(month)
+        cursor.execute(delete_sql, (group_key, month))
+        if name == DEPT_ROLLUP and group_key == 0:
+            cursor.execute(null_sql, (start, end))
+        else:
+            cursor.execute(keyed_sql, (group_key, start, end))
+
+
+def refresh_rollup(name, full=False):
+    """Tek özeti yenile; dönen sözlükte mod, yeniden hesaplanan grup sayısı ve süre bulunur"""
+    started = time.perf_counter()
+    until = str(config.fetch_scalar("SELECT CURRENT_TIMESTAMP"))
+    watermark = None if full else get_rollup_watermark(name)
+
+    groups = None
+    if watermark is not None:
+        since = datetime.strptime(str(watermark)[:19], "%Y-%m-%d %H:%M:%S") - timedelta(seconds=ROLLUP_OVERLAP_SECONDS)
+        groups = _changed_groups(name, since.strftime("%Y-%m-%d %H:%M:%S"), until)
+        if len(groups) > ROLLUP_FULL_REFRESH_GROUPS:
+            groups = None
+
+    with config.db_manager.get_connection() as conn:
+        cursor = conn.cursor()
+        if config.DATABASE_TYPE == 'mysql' and conn.autocommit:
+            conn.start_transaction()
+        if groups is None:
+            _rebuild_full(cursor, name)
+        else:
+            _rebuild_groups(cursor, name, groups)
+        _save_state(cursor, name, until)
+        conn.commit()
+
+    if groups is None or groups:
+        config.invalidate_tables(name)
+    _last_refresh[name] = time.monotonic()
+    result = {
+        'name': name,
+        'mode': "tam" if groups is None else "artımlı",
+        'groups': None if groups is None else len(groups),
+        'watermark': until,
+        'elapsed': time.perf_counter() - started,
+    }
+    logger.info(f"Özet yenilendi: {name} ({result['mode']}, "
+                f"{'' if groups is None else f'{len(groups)} grup, '}{result['elapsed'] * 1000:.0f} ms)")
+    return result
+
+
+def refresh_rollups(full=False):
+    """Tüm özetleri yenile (aynı anda tek yenileme çalışır)"""
+    with _refresh_lock:
+        return [refresh_rollup(name, full) for name in ROLLUPS]
+
+
+def ensure_fresh(max_age=ROLLUP_MAX_STALENESS):
+    """Bu süreçte son `max_age` saniyede yenilenmediyse artımlı yenile"""
+    now = time.monotonic()
+    if all(now - _last_refresh.get(name, float('-inf')) < max_age for name in ROLLUPS):
+        return
+    with _refresh_lock:
+        for name in ROLLUPS:
+            if now - _last_refresh.get(name, float('-inf')) >= max_age:
+                refresh_rollup(name)
+
+
+# =============================================================================
+# SORGU
+# =============================================================================
+
+_DIMENSION_SQL = {
+    # kırılım -> (özet tablosundaki ifade, ham tablodaki ifade)
+    'department': ("department", "COALESCE(p.department, '')"),
+    'process_id': ("process_id", "COALESCE(ps.process_id, 0)"),
+    'employee_key': ("employee_key", "ps.employee_key"),
+    'month': ("month", _MONTH_EXPR),
+    'year': ("SUBSTR(month, 1, 4)", "SUBSTR(ps.tarih, 1, 4)"),
+}
+
+
+def choose_rollup(group_by, filters):
+    """Kırılım ve filtreleri karşılayabilen özet tablosu (yoksa None)"""
+    needed = set(group_by) | set(filters)
+    for name, spec in ROLLUPS.items():
+        if needed <= spec['dimensions']:
+            return name
+    return None
+
+
+def _aggregate_expr(metric, agg, from_rollup):
+    if from_rollup:
+        return {
+            'avg': f"SUM({metric}_sum) * 1.0 / NULLIF(SUM({metric}_count), 0)",
+            'sum': f"SUM({metric}_sum)",
+            'min': f"MIN({metric}_min)",
+            'max': f"MAX({metric}_max)",
+        }[agg]
+    if agg == 'avg':
+        # Özetteki ortalama ile aynı tanım: toplam / NULL olmayan değer sayısı
+        return f"SUM(ps.{metric}) * 1.0 / NULLIF(COUNT(ps.{metric}), 0)"
+    return f"{agg.upper()}(ps.{metric})"
+
+
+def build_score_query(metrics=("toplam_skor",), group_by=("department", "month"), filters=None,
+                      start_month=None, end_month=None, aggregates=AGGREGATES):
+    """(sorgu, parametreler, kaynak) üret; kaynak özet tablosu adı ya da 'process_scores'"""
+    filters = filters or {}
+    unknown = (set(group_by) | set(filters)) - set(_DIMENSION_SQL)
+    if unknown:
+        raise ValueError(f"Desteklenmeyen kırılım/filtre: {', '.join(sorted(unknown))}")
+    bad_metrics = set(metrics) - set(METRICS)
+    if bad_metrics:
+        raise ValueError(f"Bilinmeyen metrik: {', '.join(sorted(bad_metrics))}")
+
+    source = choose_rollup(group_by, filters)
+    from_rollup = source is not None
+    which = 0 if from_rollup else 1
+    ph = config.sql_placeholder()
+
+    select = [f"{_DIMENSION_SQL[dim][which]} AS {dim}" for dim in group_by]
+    select.append("SUM(score_count) AS score_count" if from_rollup else "COUNT(*) AS score_count")
+    select += [f"{_aggregate_expr(m, agg, from_rollup)} AS {m}_{agg}" for m in metrics for agg in aggregates]
+
+    where, params = [], []
+    for dim, value in filters.items():
+        where.append(f"{_DIMENSION_SQL[dim][which]} = {ph}")
+        params.append(value)
+    month_column = "month" if from_rollup else "ps.tarih"
+    if start_month:
+        where.append(f"{month_column} >= {ph}")
+        params.append(start_month if from_rollup else _month_bounds(start_month)[0])
+    if end_month:
+        where.append(f"{month_column} <= {ph}" if from_rollup else f"{month_column} < {ph}")
+        params.append(end_month if from_rollup else _month_bounds(end_month)[1])
+    if not from_rollup:
+        where.insert(0, "ps.tarih IS NOT NULL")
+
+    table = source if from_rollup else ROLLUPS[DEPT_ROLLUP]['from']
+    query = f"SELECT {', '.join(select)} FROM {table}"
+    if where:
+        query += " WHERE " + " AND ".join(where)
+    if group_by:
+        dims = ", ".join(_DIMENSION_SQL[dim][which] for dim in group_by)
+        query += f" GROUP BY {dims} ORDER BY {dims}"
+    return query, tuple(params), source or "process_scores"
+
+
+def query_scores(metrics=("toplam_skor",), group_by=("department", "month"), filters=None,
+                 start_month=None, end_month=None, aggregates=AGGREGATES, max_staleness=ROLLUP_MAX_STALENESS):
+    """Skor özetini DataFrame olarak döndür; mümkünse özet tablosundan okur.
+
+        rollups.query_scores(group_by=("department", "year"), start_month="2022-01")
+
+    `df.attrs['source']` okunan tabloyu gösterir.
+    """
+    query, params, source = build_score_query(metrics, group_by, filters, start_month, end_month, aggregates)
+    if source != "process_scores":
+        ensure_fresh(max_staleness)
+    df = config.get_dataframe(query, params)
+    df.attrs['source'] = source
+    return df
@@ -0,0 +1,200 @@
+# scoring.py
+"""Süreç skorlarının toplu yeniden hesaplanması.
+
+`process_scores.toplam_skor` bileşenlerin ağırlıklı toplamıdır:
+
+    toplam_skor = süreç_ağırlığı * Σ ağırlık[b] * bileşen[b]
+
+Ağırlıklar `ScoringRules` ile süreç > departman > varsayılan önceliğiyle
+belirlenir; eksik verilen ağırlıklar varsayılandan tamamlanır. Skorlar
+`id` üzerinden keyset parçalarla okunur, toplamlar NumPy ile tüm parça için
+tek seferde hesaplanır ve yalnızca değişen satırlar parça başına tek
+transaction'da `executemany` ile yazılır. `dry_run=True` hiçbir şey yazmaz,
+yalnızca farkları raporlar.
+"""
+
+import json
+import logging
+import time
+from contextlib import ExitStack
+
+import numpy as np
+import pandas as pd
+
+import config
+import rollups
+
+logger = logging.getLogger(__name__)
+
+SCORE_COMPONENTS = ("cikti", "kalite", "strateji", "inovasyon", "zaman", "ekstra")
+
+DEFAULT_WEIGHTS = {
+    'cikti': 0.30,
+    'kalite': 0.25,
+    'strateji': 0.15,
+    'inovasyon': 0.15,
+    'zaman': 0.15,
+    'ekstra': 1.0,   # Ek puan olduğu gibi eklenir
+}
+
+DEFAULT_CHUNK_SIZE = 50000
+SCORE_DECIMALS = 2
+# Bir parçada bu kadar satır değişirse özet tetikleyicileri kaldırılır, özet sonda kurulur
+BULK_MODE_THRESHOLD = 5000
+DIFF_SAMPLE_SIZE = 50
+
+
+class ScoringRules:
+    """Bileşen ağırlıkları (süreç > departman > varsayılan).
+
+        rules = ScoringRules(departments={"IT": {"inovasyon": 0.3}}, processes={12: {"zaman": 0}})
+    """
+
+    def __init__(self, weights=None, departments=None, processes=None, use_process_weight=True):
+        self.default = self._complete(weights or {}, DEFAULT_WEIGHTS)
+        self.departments = {dept: self._complete(w, self.default) for dept, w in (departments or {}).items()}
+        self.processes = {int(pid): self._complete(w, self.default) for pid, w in (processes or {}).items()}
+        self.use_process_weight = use_process_weight
+
+        # Satır başına kural indeksi -> ağırlık satırı; 0 varsayılandır
+        rows = [self.default] + list(self.departments.values()) + list(self.processes.values())
+        self._matrix = np.array([[w[c] for c in SCORE_COMPONENTS] for w in rows], dtype=np.float64)
+        self._dept_index = {dept: i + 1 for i, dept in enumerate(self.departments)}
+        offset = 1 + len(self.departments)
+        self._process_index = {pid: i + offset for i, pid in enumerate(self.processes)}
+
+    @staticmethod
+    def _complete(weights, base):
+        unknown = set(weights) - set(SCORE_COMPONENTS)
+        if unknown:
+            raise ValueError(f"Bilinmeyen skor bileşenleri: {', '.join(sorted(unknown))}")
+        return {c: float(weights.get(c, base[c])) for c in SCORE_COMPONENTS}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            weights=data.get('weights'),
+            departments=data.get('departments'),
+            processes=data.get('processes'),
+            use_process_weight=data.get('use_process_weight', True),
+        )
+
+    @classmethod
+    def from_json(cls, path):
+        with open(path, encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+    def weights_for(self, process_ids, departments):
+        """Satır başına ağırlık matrisi (n x bileşen)"""
+        return self._matrix[self.rule_index(process_ids, departments)]
+
+    def rule_index(self, process_ids, departments):
+        """Her satır için ağırlık satırının indeksi (vektörel)"""
+        index = np.zeros(len(process_ids), dtype=np.intp)
+        if self._dept_index:
+            dept = departments.map(self._dept_index)
+            index = np.where(dept.notna(), dept.fillna(0), index).astype(np.intp)
+        if self._process_index:
+            proc = process_ids.map(self._process_index)
+            index = np.where(proc.notna(), proc.fillna(0), index).astype(np.intp)
+        return index
+
+
+def compute_totals(df, rules):
+    """`df` satırlarının toplam skorları (bileşen sütunları + process_id, department, weight)"""
+    components = df.loc[:, SCORE_COMPONENTS].to_numpy(dtype=np.float64, na_value=0.0)
+    weights = rules.weights_for(df['process_id'], df['department'])
+    totals = np.einsum('ij,ij->i', components, weights)
+    if rules.use_process_weight:
+        totals *= df['weight'].to_numpy(dtype=np.float64, na_value=1.0)
+    return np.round(totals, SCORE_DECIMALS)
+
+
+def _score_chunk_query():
+    p = config.sql_placeholder()
+    return f"""
+        SELECT ps.id, ps.process_id, p.department, COALESCE(p.weight, 1.0) AS weight,
+               ps.employee_name, {', '.join(f'ps.{c}' for c in SCORE_COMPONENTS)}, ps.toplam_skor
+        FROM process_scores ps
+        LEFT JOIN processes p ON p.id = ps.process_id
+        WHERE ps.id > {p}
+        ORDER BY ps.id
+        LIMIT {p}
+    """
+
+
+def iter_score_chunks(chunk_size=DEFAULT_CHUNK_SIZE):
+    """process_scores'u id sırasıyla parça parça oku (her parça ayrı, kısa sorgu)"""
+    query = _score_chunk_query()
+    last_id = 0
+    while True:
+        chunk = config.get_dataframe(query, (last_id, chunk_size))
+        if chunk is None or chunk.empty:
+            return
+        yield chunk
+        if len(chunk) < chunk_size:
+            return
+        last_id = int(chunk['id'].iloc[-1])
+
+
+def rescore(rules=None, chunk_size=DEFAULT_CHUNK_SIZE, dry_run=False, progress=None, sample_size=DIFF_SAMPLE_SIZE):
+    """Tüm skorları `rules` ile yeniden hesapla; değişenleri yaz (dry_run'da yalnızca raporla).
+
+    Dönen durum sözlüğünde taranan/değişen satır sayıları, fark istatistikleri
+    ve mutlak farkı en büyük `sample_size` satırı içeren `diff` DataFrame'i bulunur.
+    """
+    rules = rules or ScoringRules()
+    status = {'scanned': 0, 'changed': 0, 'written': 0, 'dry_run': dry_run,
+              'delta_sum': 0.0, 'max_abs_delta': 0.0, 'elapsed': 0.0}
+    samples = []
+    p = config.sql_placeholder()
+    update_sql = f"UPDATE process_scores SET toplam_skor = {p} WHERE id = {p}"
+    started = time.perf_counter()
+
+    with ExitStack() as stack:
+        bulk_mode = False
+        for chunk in iter_score_chunks(chunk_size):
+            totals = compute_totals(chunk, rules)
+            old = chunk['toplam_skor'].to_numpy(dtype=np.float64, na_value=np.nan)
+            changed = np.isnan(old) | (np.abs(totals - np.nan_to_num(old)) >= 0.5 * 10 ** -SCORE_DECIMALS)
+            status['scanned'] += len(chunk)
+
+            n_changed = int(changed.sum())
+            if n_changed:
+                ids = chunk['id'].to_numpy()[changed]
+                new = totals[changed]
+                delta = new - np.nan_to_num(old[changed])
+                status['changed'] += n_changed
+                status['delta_sum'] += float(delta.sum())
+                status['max_abs_delta'] = max(status['max_abs_delta'], float(np.abs(delta).max()))
+
+                if sample_size:
+                    diff = chunk.loc[changed, ['id', 'process_id', 'department', 'employee_name', 'toplam_skor']]
+                    diff = diff.rename(columns={'toplam_skor': 'eski'}).assign(yeni=new, fark=delta)
+                    samples.append(diff.loc[diff['fark'].abs().nlargest(sample_size).index])
+
+                if not dry_run:
+                    if not bulk_mode and n_changed >= BULK_MODE_THRESHOLD:
+                        stack.enter_context(config.score_summary_bulk_mode())
+                        bulk_mode = True
+                    status['written'] += config.execute_many(update_sql, zip(new.tolist(), ids.tolist()))
+
+            if progress:
+                progress(status)
+
+    if status['written']:
+        # Güncellemeler created_at filigranına görünmez; özetler baştan kurulur
+        rollups.refresh_rollups(full=True)
+
+    status['elapsed'] = time.perf_counter() - started
+    status['mean_delta'] = status['delta_sum'] / status['changed'] if status['changed'] else 0.0
+    if samples:
+        diff = pd.concat(samples, ignore_index=True)
+        status['diff'] = diff.loc[diff['fark'].abs().nlargest(sample_size).index].reset_index(drop=True)
+    else:
+        status['diff'] = pd.DataFrame(columns=['id', 'process_id', 'department', 'employee_name', 'eski', 'yeni', 'fark'])
+
+    mode = "deneme" if dry_run else "yazıldı"
+    logger.info(f"Yeniden puanlama ({mode}): {status['scanned']} satır tarandı, {status['changed']} değişti, "
+                f"{status['elapsed']:.1f} sn")
+    return status
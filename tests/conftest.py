@@ -0,0 +1,42 @@
+# tests/conftest.py
+"""Testler geçici bir SQLite veritabanında çalışır.
+
+config veritabanı yolunu modül yüklenirken okuduğundan ortam değişkenleri
+config import edilmeden önce ayarlanır. Her test boş iş tablolarıyla başlar.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_DB_DIR = tempfile.mkdtemp(prefix="effinova_test_")
+os.environ["EFFINOVA_DB_TYPE"] = "sqlite"
+os.environ["EFFINOVA_SQLITE_PATH"] = os.path.join(_DB_DIR, "effinova_test.db")
+
+# Silme sırası: tetikleyicilerin yazdığı türetilmiş tablolar en sonda temizlenir
+DATA_TABLES = ("process_scores", "processes", "employees", "logs", "users", "employee_score_summary",
+               "org_hierarchy", "org_hierarchy_cycles", "org_hierarchy_queue")
+
+
+@pytest.fixture(scope="session")
+def config():
+    import config as cfg
+
+    cfg.run_migrations()
+    yield cfg
+    cfg.db_manager.close()
+    shutil.rmtree(_DB_DIR, ignore_errors=True)
+
+
+@pytest.fixture
+def db(config):
+    """Boş iş tablolarıyla config modülü"""
+    for table in DATA_TABLES:
+        config.execute_query(f"DELETE FROM {table}", fetch=False)
+    config.invalidate_tables()
+    return config
@@ -0,0 +1,131 @@
+# tests/test_auth.py
+"""Oturum deposu: yalnızca özet saklanır, tek belirteç, iptal, TTL ve yeniden doğrulama"""
+import hashlib
+import types
+from datetime import datetime, timedelta
+
+import pytest
+
+import auth
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def users(db, monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(auth, "time", types.SimpleNamespace(monotonic=clock.monotonic))
+    auth.session_store.clear()
+    db.execute_many("INSERT INTO users (username, password, role, department) VALUES (?, ?, ?, ?)",
+                    [("ayse", auth.hash_password("gizli"), "mudur", "IK"),
+                     ("ali", auth.hash_password("parola"), "calisan", "IT")])
+    yield clock
+    # Arka planda kuyruğa yazılan last_login güncellemeleri bir sonraki testin temizliğinden önce biter
+    db.write_queue.flush(timeout=5)
+    auth.session_store.clear()
+
+
+def user_row(db, username):
+    return db.fetch_dicts("SELECT token, role, last_login FROM users WHERE username = ?", (username,))[0]
+
+
+def set_user(db, username, **values):
+    assignments = ", ".join(f"{column} = ?" for column in values)
+    db.execute_query(f"UPDATE users SET {assignments} WHERE username = ?", (*values.values(), username),
+                     fetch=False)
+
+
+def test_only_token_digest_is_stored(db, users):
+    assert auth.login("ayse", "yanlis") is None
+    token = auth.login("ayse", "gizli")
+
+    stored = user_row(db, "ayse")['token']
+    assert stored == hashlib.sha256(token.encode()).hexdigest()
+    assert token not in stored
+    assert auth.authenticate(token).username == "ayse"
+
+
+@pytest.mark.parametrize("cached", [True, False])
+def test_second_login_invalidates_first(db, users, cached):
+    first = auth.login("ayse", "gizli")
+    second = auth.login("ayse", "gizli")
+    if not cached:
+        auth.session_store.clear()
+
+    assert auth.authenticate(first) is None
+    assert auth.authenticate(second).username == "ayse"
+
+
+@pytest.mark.parametrize("cached", [True, False])
+def test_revoke(db, users, cached):
+    token = auth.login("ayse", "gizli")
+    other = auth.login("ali", "parola")
+    if not cached:
+        auth.session_store.clear()
+    revoked = auth.session_store.info()['revoked']
+
+    auth.revoke(token)
+
+    assert user_row(db, "ayse")['token'] is None
+    assert auth.authenticate(token) is None
+    assert auth.authenticate(other).username == "ali"
+    assert auth.session_store.info()['revoked'] == revoked + (1 if cached else 0)
+
+
+@pytest.mark.parametrize("cached", [True, False])
+def test_revoke_user(db, users, cached):
+    token = auth.login("ali", "parola")
+    if not cached:
+        auth.session_store.clear()
+    revoked = auth.session_store.info()['revoked']
+
+    auth.revoke_user("ali")
+
+    assert user_row(db, "ali")['token'] is None
+    assert auth.authenticate(token) is None
+    assert auth.session_store.info()['revoked'] == revoked + (1 if cached else 0)
+
+
+def test_ttl_expiry(db, users):
+    token = auth.login("ayse", "gizli")
+    stale = (datetime.now() - timedelta(seconds=auth.SESSION_TTL + 60)).strftime("%Y-%m-%d %H:%M:%S")
+
+    # Kullanıldıkça önbellekteki süre uzar
+    users.now += auth.SESSION_TTL - 1
+    assert auth.authenticate(token) is not None
+
+    users.now += auth.SESSION_TTL + 1
+    db.write_queue.flush(timeout=5)
+    set_user(db, "ayse", last_login=stale)
+    expired = auth.session_store.info()['expired']
+    assert auth.authenticate(token) is None
+    assert auth.session_store.info()['expired'] == expired + 1
+
+    # Önbellekte olmayan oturumda süre veritabanındaki last_login'den hesaplanır
+    fresh = auth.login("ali", "parola")
+    auth.session_store.clear()
+    set_user(db, "ali", last_login=stale)
+    assert auth.authenticate(fresh) is None
+
+
+def test_revalidation_picks_up_role_change_and_cleared_token(db, users):
+    token = auth.login("ali", "parola")
+    set_user(db, "ali", role="mudur", department="Finans")
+
+    assert auth.authenticate(token).role == "calisan"
+    users.now += auth.SESSION_REVALIDATE_AFTER
+    session = auth.authenticate(token)
+    assert (session.role, session.department) == ("mudur", "Finans")
+
+    # Başka bir süreçte yapılan iptal: yalnızca veritabanındaki belirteç silinmiş
+    set_user(db, "ali", token=None)
+    assert auth.authenticate(token) is not None
+    users.now += auth.SESSION_REVALIDATE_AFTER
+    assert auth.authenticate(token) is None
+    assert auth.authenticate(token) is None
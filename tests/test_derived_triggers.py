@@ -0,0 +1,46 @@
+# tests/test_derived_triggers.py
+"""Yarıda kalan toplu modların kaldırdığı tetikleyicilerin açılışta geri kurulması"""
+
+
+def trigger_names(db):
+    return {row['name'] for row in db.fetch_dicts("SELECT name FROM sqlite_master WHERE type = 'trigger'")}
+
+
+def drop_triggers(db, triggers):
+    with db.get_connection() as conn:
+        for trigger in triggers:
+            conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        conn.commit()
+
+
+def test_nothing_to_restore_when_triggers_exist(db):
+    assert db.ensure_derived_triggers() == []
+
+
+def test_search_index_restored_after_interrupted_import(db):
+    drop_triggers(db, db._EMPLOYEE_FTS_TRIGGERS)
+    db.execute_query("INSERT INTO employees (Ad_Soyad, Pozisyon, Departman, Sicil_No) VALUES (?, ?, ?, ?)",
+                     ("Şükrü Işık", "Uzman", "IT", "S100"), fetch=False)
+
+    assert "employees_fts" in db.ensure_derived_triggers()
+    assert set(db._EMPLOYEE_FTS_TRIGGERS) <= trigger_names(db)
+    matches = db.fetch_dicts("""
+        SELECT e.Sicil_No FROM employees_fts f JOIN employees e ON e.id = f.rowid
+        WHERE employees_fts MATCH 'isik'
+    """)
+    assert [row['Sicil_No'] for row in matches] == ["S100"]
+
+
+def test_score_summary_restored_after_interrupted_rescore(db):
+    db.execute_query("INSERT INTO processes (id, process_name) VALUES (1, 'Denetim')", fetch=False)
+    insert = ("INSERT INTO process_scores (process_id, employee_name, employee_sicil_no, toplam_skor, tarih) "
+              "VALUES (1, ?, ?, ?, ?)")
+    db.execute_query(insert, ("Ayşe Yılmaz", "S001", 80.0, "2025-01-01"), fetch=False)
+    drop_triggers(db, db._SCORE_SUMMARY_TRIGGERS)
+    db.execute_query(insert, ("Ayşe Yılmaz", "S001", None, "2025-02-01"), fetch=False)
+    db.execute_query(insert, ("Ayşe Yılmaz", "S001", 60.0, "2025-03-01"), fetch=False)
+
+    assert "employee_score_summary" in db.ensure_derived_triggers()
+    summary = db.fetch_dicts("SELECT score_count, score_sum, score_max, last_tarih FROM employee_score_summary")
+    assert summary == [{'score_count': 2, 'score_sum': 140.0, 'score_max': 80.0, 'last_tarih': "2025-03-01"}]
+    assert set(db._SCORE_SUMMARY_TRIGGERS) <= trigger_names(db)
@@ -0,0 +1,42 @@
+# tests/test_employee_search.py
+"""Türkçe katlamalı çalışan araması: Python ve SQL katlamasının eşliği, kademe sıralaması"""
+import re
+
+import pytest
+
+NAMES = ["Şükrü Işık", "İLKNUR ÖZGÜR", "Çağla Ünal", "Élodie Ørsted", "Ahmet Yılmaz"]
+
+
+@pytest.mark.parametrize("name", NAMES)
+def test_python_fold_matches_sqlite_expression(db, name):
+    assert db.fetch_scalar(f"SELECT {db.turkish_fold_sql('?', 'sqlite')}", (name,)) == db.fold_turkish(name)
+
+
+@pytest.mark.parametrize("name", NAMES)
+def test_python_fold_matches_mysql_expression(db, name):
+    # MySQL zinciri SQLite ayrıştırıcısına sığmaz; REPLACE adımları içten dışa sırayla uygulanır
+    expr = db.turkish_fold_sql('x', 'mysql')
+    assert "LOWER" not in expr
+    folded = name
+    for source, target in re.findall(r"'(.)', '(.)'", expr):
+        folded = folded.replace(source, target)
+    assert folded == db.fold_turkish(name)
+
+
+def add_employee(db, sicil_no, name):
+    db.execute_query("INSERT INTO employees (Ad_Soyad, Pozisyon, Departman, Sicil_No) VALUES (?, ?, ?, ?)",
+                     (name, "Uzman", "IT", sicil_no), fetch=False)
+
+
+def test_prefix_matches_come_before_ranked_word_matches(db):
+    add_employee(db, "S1", "Ayşe Işıklı Işık")
+    add_employee(db, "S2", "Işık Demir")
+    add_employee(db, "S3", "Mehmet Işıkgil")
+    add_employee(db, "S4", "Işıl Kaya")
+
+    found = [row['Sicil_No'] for row in db.search_employees("isik")]
+
+    assert found[0] == "S2"
+    assert set(found[1:]) == {"S1", "S3"}
+    # bm25: iki kelimesi eşleşen kısa ad, tek eşleşmeli addan önce gelir
+    assert found.index("S1") < found.index("S3")
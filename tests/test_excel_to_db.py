@@ -0,0 +1,74 @@
+# tests/test_excel_to_db.py
+import csv
+
+import pytest
+
+import excel_to_db
+
+FULL_HEADER = ["Ad Soyad", "Pozisyon", "Departman", "Sicil No", "Telefon", "Adres", "Email"]
+REQUIRED_HEADER = ["Ad Soyad", "Pozisyon", "Departman", "Sicil No"]
+
+
+def write_csv(path, header, rows):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+    return str(path)
+
+
+def employee(db, sicil_no):
+    rows = db.fetch_dicts("SELECT * FROM employees WHERE Sicil_No = ?", (sicil_no,))
+    return rows[0] if rows else None
+
+
+@pytest.fixture
+def imported(db, tmp_path):
+    path = write_csv(tmp_path / "tam.csv", FULL_HEADER, [
+        ["Ayşe Yılmaz", "Uzman", "IT", "S001", "555 0001", "Ankara", "ayse@example.com"],
+        ["Mehmet Öz", "Şef", "IK", "S002", "555 0002", "İzmir", "mehmet@example.com"],
+    ])
+    status = excel_to_db.import_employees(path, reject_path=str(tmp_path / "red.csv"))
+    assert status['imported'] == 2
+    return db
+
+
+def test_partial_reimport_keeps_missing_columns(imported, tmp_path):
+    path = write_csv(tmp_path / "kismi.csv", REQUIRED_HEADER, [["Ayşe Yılmaz", "Kıdemli Uzman", "IT", "S001"]])
+    status = excel_to_db.import_employees(path, reject_path=str(tmp_path / "red.csv"))
+
+    assert status['imported'] == 1
+    row = employee(imported, "S001")
+    assert row['Pozisyon'] == "Kıdemli Uzman"
+    assert (row['Telefon'], row['Adres'], row['Email']) == ("555 0001", "Ankara", "ayse@example.com")
+
+
+def test_reimport_restores_soft_deleted_employee(imported, tmp_path):
+    imported.execute_query("UPDATE employees SET deleted = 1 WHERE Sicil_No = ?", ("S002",), fetch=False)
+    path = write_csv(tmp_path / "geri.csv", REQUIRED_HEADER, [["Mehmet Öz", "Şef", "IK", "S002"]])
+    excel_to_db.import_employees(path, reject_path=str(tmp_path / "red.csv"))
+
+    row = employee(imported, "S002")
+    assert row['deleted'] == 0
+    assert row['Telefon'] == "555 0002"
+
+
+def test_rejected_rows_are_reported(db, tmp_path):
+    reject_path = tmp_path / "red.csv"
+    path = write_csv(tmp_path / "hatali.csv", FULL_HEADER, [
+        ["Ayşe Yılmaz", "Uzman", "IT", "S001", "", "", "gecersiz-eposta"],
+        ["", "Uzman", "IT", "S003", "", "", ""],
+    ])
+    status = excel_to_db.import_employees(path, reject_path=str(reject_path))
+
+    assert (status['imported'], status['rejected']) == (0, 2)
+    with open(reject_path, encoding="utf-8-sig") as f:
+        reasons = [row['red_nedeni'] for row in csv.DictReader(f)]
+    assert reasons == ["geçersiz e-posta", "Ad_Soyad boş"]
+
+
+def test_upsert_resets_deleted_flag_on_both_backends(db, monkeypatch):
+    assert "deleted = 0" in excel_to_db.build_upsert_query(["Ad_Soyad", "Sicil_No"])
+    monkeypatch.setattr(db, "DATABASE_TYPE", "mysql")
+    query = excel_to_db.build_upsert_query(["Ad_Soyad", "Sicil_No"])
+    assert "ON DUPLICATE KEY UPDATE `Ad_Soyad` = VALUES(`Ad_Soyad`), deleted = 0" in query
@@ -0,0 +1,118 @@
+# tests/test_log_archive.py
+"""Log arşivi: sıcak tablo + arşiv sorgusu, yarıda kalan çalıştırma, sıkıştırma, kilit"""
+import os
+
+import pytest
+
+import log_archive
+
+OLD_LOGS = [("ayse", "login", "2024-03-05 09:00:00"), ("ali", "export", "2024-03-10 10:00:00"),
+            ("ayse", "logout", "2024-03-31 23:59:59"), ("ali", "login", "2024-04-01 00:00:00"),
+            ("ayse", "login", "2024-04-15 08:30:00")]
+
+
+@pytest.fixture(params=["sqlite", "parquet"])
+def archive(db, tmp_path, monkeypatch, request):
+    """Geçici arşiv klasörü, eski ve güncel log satırları"""
+    if request.param == "parquet" and not log_archive.PARQUET_AVAILABLE:
+        pytest.skip("pyarrow kurulu değil")
+    monkeypatch.setattr(log_archive, "ARCHIVE_DIR", str(tmp_path / "archive"))
+    monkeypatch.setattr(log_archive, "LOG_ARCHIVE_FORMAT", request.param)
+    db.execute_many("INSERT INTO logs (username, action, timestamp) VALUES (?, ?, ?)", OLD_LOGS)
+    db.execute_many("INSERT INTO logs (username, action) VALUES (?, ?)", [("ayse", "view"), ("ali", "view")])
+    return db
+
+
+def all_ids(db):
+    return [row['id'] for row in db.fetch_dicts("SELECT id FROM logs ORDER BY id")]
+
+
+def hot_count(db):
+    return db.fetch_scalar("SELECT COUNT(*) FROM logs", default=0)
+
+
+def test_archive_then_query_across_hot_and_archive(archive):
+    ids = all_ids(archive)
+
+    status = log_archive.archive_logs(chunk_size=2)
+
+    assert status['archived'] == len(OLD_LOGS)
+    assert status['months'] == ["2024-03", "2024-04"]
+    assert hot_count(archive) == 2
+    logs = log_archive.query_logs(limit=100)
+    assert sorted(logs['id']) == ids
+
+    # end hariç: ay başındaki end bir sonraki ayın klasörünü okumaz
+    march = log_archive.query_logs(start="2024-03-01", end="2024-04-01", limit=100)
+    assert list(march['action']) == ["logout", "export", "login"]
+    assert march.attrs['archive_months'] == ["2024-03"]
+
+    filtered = log_archive.query_logs(username="ali", action="login", limit=100)
+    assert list(filtered['timestamp'].dt.strftime("%Y-%m-%d")) == ["2024-04-01"]
+
+
+def test_rerun_after_crash_before_delete_loses_nothing(archive, monkeypatch):
+    ids = all_ids(archive)
+    execute_many = archive.execute_many
+
+    def crash(*args, **kwargs):
+        raise RuntimeError("silmeden önce kesildi")
+
+    monkeypatch.setattr(archive, "execute_many", crash)
+    with pytest.raises(RuntimeError):
+        log_archive.archive_logs(chunk_size=2)
+    assert hot_count(archive) == len(ids)
+    assert log_archive.archived_months()
+
+    # Farklı parça boyutu: aynı satırlar başka adlı segmentlere yeniden yazılır
+    monkeypatch.setattr(archive, "execute_many", execute_many)
+    status = log_archive.archive_logs(chunk_size=3)
+
+    assert status['archived'] == len(OLD_LOGS)
+    assert hot_count(archive) == 2
+    logs = log_archive.query_logs(limit=100)
+    assert sorted(logs['id']) == ids
+
+
+def test_compaction_merges_and_deduplicates(archive):
+    old_ids = all_ids(archive)[:len(OLD_LOGS)]
+    chunk = archive.get_dataframe(f"SELECT {', '.join(log_archive.LOG_COLUMNS)} FROM logs "
+                                  "WHERE timestamp < '2024-04-01' ORDER BY id")
+    fmt = log_archive.LOG_ARCHIVE_FORMAT
+    log_archive._write_chunk(chunk.iloc[:2], fmt)
+    log_archive._write_chunk(chunk.iloc[1:], fmt)
+    assert log_archive.archive_stats()[0]['segments'] == 2
+
+    assert log_archive.compact_month("2024-03")
+    assert not log_archive.compact_month("2024-03")
+    [stats] = log_archive.archive_stats()
+    assert stats['segments'] == 1
+    merged = log_archive._read_segment(log_archive._segment_paths("2024-03")[0])
+    assert list(merged['id']) == list(chunk['id'])
+
+    status = log_archive.archive_logs(chunk_size=1)
+    assert status['compacted'] == ["2024-03", "2024-04"]
+    assert [s['segments'] for s in log_archive.archive_stats()] == [1, 1]
+    assert sorted(log_archive.query_logs(start="2024-01-01", end="2024-05-01", limit=100)['id']) == old_ids
+
+
+def test_long_run_keeps_lock_fresh(archive, monkeypatch):
+    monkeypatch.setattr(log_archive, "LOG_ARCHIVE_LOCK_STALE", 5)
+    lock_path = os.path.join(log_archive.ARCHIVE_DIR, ".lock")
+    write_chunk = log_archive._write_chunk
+    competitors = []
+
+    def slow_write(chunk, fmt):
+        with log_archive._ArchiveLock() as other:
+            competitors.append(other.acquired)
+        write_chunk(chunk, fmt)
+        # Parça uzun sürmüş gibi kilidi eskit
+        old = os.path.getmtime(lock_path) - 60
+        os.utime(lock_path, (old, old))
+
+    monkeypatch.setattr(log_archive, "_write_chunk", slow_write)
+    status = log_archive.archive_logs(chunk_size=2)
+
+    assert status['archived'] == len(OLD_LOGS)
+    assert competitors == [False, False, False]
+    assert not os.path.exists(lock_path)
@@ -0,0 +1,149 @@
+# tests/test_org_hierarchy.py
+import pytest
+
+import org_hierarchy
+
+#             Ali
+#           /     \
+#       Berk       Deniz
+#        |
+#      Cem
+ORG = [
+    ("Ali", "GM", "S1", None),
+    ("Berk", "IT", "S2", "Ali"),
+    ("Cem", "IT", "S3", "Berk"),
+    ("Deniz", "IK", "S4", "Ali"),
+]
+
+
+def add_employee(db, name, department, sicil_no, manager):
+    db.execute_query("INSERT INTO employees (Ad_Soyad, Pozisyon, Departman, Sicil_No, Yonetici_Adi) "
+                     "VALUES (?, 'Uzman', ?, ?, ?)", (name, department, sicil_no, manager), fetch=False)
+
+
+def update(db, sicil_no, **values):
+    assignments = ", ".join(f"{column} = ?" for column in values)
+    db.execute_query(f"UPDATE employees SET {assignments} WHERE Sicil_No = ?",
+                     (*values.values(), sicil_no), fetch=False)
+
+
+def chain(sicil_no):
+    return [m['Sicil_No'] for m in org_hierarchy.managers_of(sicil_no)]
+
+
+def reports(sicil_no):
+    return sorted(org_hierarchy.reports_under(sicil_no)['Sicil_No'].astype(str))
+
+
+def closure(db):
+    return db.fetch_dicts("SELECT line, ancestor_id, descendant_id, depth FROM org_hierarchy "
+                          "ORDER BY line, ancestor_id, descendant_id")
+
+
+def assert_acyclic(db):
+    loops = db.fetch_scalar("SELECT COUNT(*) FROM org_hierarchy WHERE ancestor_id = descendant_id AND depth > 0")
+    assert loops == 0
+
+
+@pytest.fixture
+def org(db):
+    for row in ORG:
+        add_employee(db, *row)
+    assert org_hierarchy.refresh()['mode'] == "artımlı"
+    return db
+
+
+def test_initial_closure(org):
+    assert reports("S1") == ["S2", "S3", "S4"]
+    assert chain("S3") == ["S2", "S1"]
+    assert org_hierarchy.report_count("S2") == 1
+    assert org_hierarchy.in_chain("S1", "S3")
+    assert not org_hierarchy.in_chain("S4", "S3")
+    assert org_hierarchy.departments_under("S2") == ["IT"]
+
+
+def test_move_subtree(org):
+    update(org, "S2", Yonetici_Adi="Deniz")
+    org_hierarchy.refresh()
+
+    assert chain("S3") == ["S2", "S4", "S1"]
+    assert reports("S4") == ["S2", "S3"]
+    incremental = closure(org)
+    org_hierarchy.refresh(full=True)
+    assert closure(org) == incremental
+
+
+def test_rename_manager_detaches_reports_until_they_follow(org):
+    update(org, "S2", Ad_Soyad="Berk Can")
+    org_hierarchy.refresh()
+    assert chain("S3") == []
+    assert reports("S2") == []
+
+    update(org, "S3", Yonetici_Adi="Berk Can")
+    org_hierarchy.refresh()
+    assert chain("S3") == ["S2", "S1"]
+
+
+def test_soft_and_hard_delete(org):
+    update(org, "S2", deleted=1)
+    org_hierarchy.refresh()
+    assert reports("S1") == ["S4"]
+    assert chain("S3") == []
+
+    org.execute_query("DELETE FROM employees WHERE Sicil_No = ?", ("S4",), fetch=False)
+    org_hierarchy.refresh()
+    assert reports("S1") == []
+    assert org.fetch_scalar("SELECT COUNT(*) FROM org_hierarchy WHERE descendant_id NOT IN "
+                            "(SELECT id FROM employees WHERE deleted = 0)") == 0
+
+
+def test_cycle_is_skipped_and_retried(org):
+    update(org, "S1", Yonetici_Adi="Cem")
+    result = org_hierarchy.refresh()
+
+    assert result['lines']['yonetici']['cycles'] == 1
+    assert org.fetch_scalar("SELECT COUNT(*) FROM org_hierarchy_cycles") == 1
+    assert_acyclic(org)
+
+    update(org, "S3", Yonetici_Adi=None)
+    org_hierarchy.refresh()
+    assert org.fetch_scalar("SELECT COUNT(*) FROM org_hierarchy_cycles") == 0
+    assert chain("S2") == ["S1", "S3"]
+    assert chain("S4") == ["S1", "S3"]
+    assert_acyclic(org)
+
+
+def test_same_name_prefers_same_department(org):
+    add_employee(org, "Berk", "IK", "S5", "Deniz")
+    add_employee(org, "Ece", "IK", "S6", "Berk")
+    org_hierarchy.refresh()
+    assert chain("S6") == ["S5", "S4", "S1"]
+
+
+def test_reads_do_not_refresh(org):
+    update(org, "S3", Yonetici_Adi="Deniz")
+    assert org_hierarchy.has_pending()
+    assert chain("S3") == ["S2", "S1"]
+
+    org_hierarchy.refresh()
+    assert not org_hierarchy.has_pending()
+    assert chain("S3") == ["S4", "S1"]
+
+
+def test_background_refresh(org):
+    update(org, "S3", Yonetici_Adi="Deniz")
+    assert org_hierarchy.refresh_in_background()
+    org_hierarchy._background.join(timeout=30)
+    assert chain("S3") == ["S4", "S1"]
+    assert not org_hierarchy.refresh_in_background()
+
+
+def test_bulk_mode_queues_single_rebuild(org):
+    with org.employee_search_bulk_mode():
+        for i in range(50):
+            add_employee(org, f"Yeni {i}", "IT", f"N{i}", "Cem")
+    queued = org.fetch_dicts("SELECT employee_id FROM org_hierarchy_queue")
+    assert queued == [{'employee_id': None}]
+
+    assert org_hierarchy.refresh()['mode'] == "tam"
+    assert org_hierarchy.report_count("S2") == 51
@@ -0,0 +1,139 @@
+# tests/test_replicate.py
+"""SQLite -> SQLite kopyalama: tam kopya, artımlı eşitleme, devam, koruma, türetilmiş özetler"""
+import sqlite3
+
+import pytest
+
+import replicate
+
+TABLES = ("employees", "processes", "process_scores")
+
+
+@pytest.fixture
+def source(db):
+    db.execute_many("INSERT INTO employees (Ad_Soyad, Pozisyon, Departman, Sicil_No) VALUES (?, ?, ?, ?)",
+                    [("Şükrü Işık", "Uzman", "IT", "S001"), ("Ayşe Yılmaz", "Müdür", "IK", "S002"),
+                     ("Ali Kaya", "Uzman", "IT", "S003")])
+    db.execute_many("INSERT INTO processes (id, process_name) VALUES (?, ?)", [(1, "Denetim"), (2, "Raporlama")])
+    db.execute_many("INSERT INTO process_scores (process_id, employee_name, employee_sicil_no, toplam_skor, tarih) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    [(1, "Şükrü Işık", "S001", 80.0, "2025-01-01"), (2, "Şükrü Işık", "S001", 70.5, "2025-02-01"),
+                     (1, "Ayşe Yılmaz", "S002", 90.0, "2025-01-15"), (2, "Ali Kaya", "S003", None, "2025-03-01"),
+                     (1, "Ali Kaya", "S003", 65.0, "03.04.2025")])
+    return db
+
+
+@pytest.fixture
+def target(tmp_path):
+    return f"sqlite://{tmp_path / 'target.db'}"
+
+
+def rows(path_or_db, table, columns="*"):
+    if isinstance(path_or_db, str):
+        conn = sqlite3.connect(path_or_db[len("sqlite://"):])
+        try:
+            return conn.execute(f"SELECT {columns} FROM {table} ORDER BY 1").fetchall()
+        finally:
+            conn.close()
+    return [tuple(r.values()) for r in path_or_db.fetch_dicts(f"SELECT {columns} FROM {table} ORDER BY 1")]
+
+
+SCORE_COLUMNS = "id, process_id, employee_name, employee_sicil_no, toplam_skor"
+
+
+def test_full_copy_is_verified(source, target):
+    results = replicate.replicate('sqlite', target, tables=TABLES, chunk_size=2)
+
+    assert [r['table'] for r in results] == list(TABLES)
+    assert all(r['verified'] for r in results)
+    assert {r['table']: r['copied'] for r in results} == {'employees': 3, 'processes': 2, 'process_scores': 5}
+    assert rows(target, "process_scores", SCORE_COLUMNS) == rows(source, "process_scores", SCORE_COLUMNS)
+    # Türkçe tarih biçimi hedefte ISO'ya çevrilir
+    assert ("2025-04-03",) in rows(target, "process_scores", "tarih")
+
+
+def test_incremental_resync_carries_updates_deletes_and_inserts(source, target):
+    replicate.replicate('sqlite', target, tables=TABLES, chunk_size=2)
+    source.execute_query("UPDATE process_scores SET toplam_skor = 99.0 WHERE employee_sicil_no = 'S002'", fetch=False)
+    source.execute_query("DELETE FROM process_scores WHERE toplam_skor IS NULL", fetch=False)
+    source.execute_query("INSERT INTO process_scores (process_id, employee_name, employee_sicil_no, toplam_skor, "
+                         "tarih) VALUES (2, 'Ayşe Yılmaz', 'S002', 75.0, '2025-05-01')", fetch=False)
+
+    results = {r['table']: r for r in replicate.replicate('sqlite', target, tables=TABLES, incremental=True,
+                                                           chunk_size=2)}
+
+    scores = results['process_scores']
+    assert scores['copied'] == 1
+    assert scores['resynced_rows'] == 2
+    assert scores['verified']
+    assert results['employees']['resynced_ranges'] == 0
+    assert rows(target, "process_scores", SCORE_COLUMNS) == rows(source, "process_scores", SCORE_COLUMNS)
+
+
+def test_resume_from_checkpoint_after_failure(source, target, monkeypatch):
+    insert_rows = replicate.SQLiteEndpoint.insert_rows
+    calls = []
+
+    def failing_insert(self, cursor, table, columns, chunk):
+        if table == "process_scores":
+            calls.append(len(chunk))
+            if len(calls) == 2:
+                raise sqlite3.OperationalError("disk I/O error")
+        return insert_rows(self, cursor, table, columns, chunk)
+
+    monkeypatch.setattr(replicate.SQLiteEndpoint, "insert_rows", failing_insert)
+    with pytest.raises(sqlite3.OperationalError):
+        replicate.replicate('sqlite', target, tables=TABLES, chunk_size=2)
+    # İlk parça kontrol noktasıyla commit edildi, ikincisi geri alındı
+    assert len(rows(target, "process_scores")) == 2
+
+    monkeypatch.setattr(replicate.SQLiteEndpoint, "insert_rows", insert_rows)
+    results = {r['table']: r for r in replicate.replicate('sqlite', target, tables=TABLES, chunk_size=2)}
+
+    scores = results['process_scores']
+    assert scores['resumed_from'] == rows(source, "process_scores", "id")[1][0]
+    assert scores['copied'] == 3
+    assert results['employees']['copied'] == 0
+    assert all(r['verified'] for r in results.values())
+    assert rows(target, "process_scores", SCORE_COLUMNS) == rows(source, "process_scores", SCORE_COLUMNS)
+
+
+def test_non_empty_target_without_checkpoint_is_refused(source, target):
+    replicate.replicate('sqlite', target, tables=TABLES)
+    conn = sqlite3.connect(target[len("sqlite://"):])
+    conn.execute("DELETE FROM replication_state")
+    conn.commit()
+    conn.close()
+
+    with pytest.raises(RuntimeError, match="kontrol noktası yok"):
+        replicate.replicate('sqlite', target, tables=TABLES)
+    assert len(rows(target, "process_scores")) == 5
+
+    results = replicate.replicate('sqlite', target, tables=TABLES, replace=True)
+    assert all(r['verified'] for r in results)
+    assert len(rows(target, "process_scores")) == 5
+
+
+def test_derived_triggers_and_summaries_restored_on_target(source, target):
+    replicate.replicate('sqlite', target, tables=TABLES)
+
+    summary = "employee_sicil_no, score_count, score_sum, score_max"
+    assert rows(target, "employee_score_summary", summary) == rows(source, "employee_score_summary", summary)
+    # Özet hedefte ISO'ya çevrilmiş tarihlerden yeniden kurulur
+    assert ("S003", "2025-04-03") in rows(target, "employee_score_summary", "employee_sicil_no, last_tarih")
+
+    conn = sqlite3.connect(target[len("sqlite://"):])
+    try:
+        triggers = {name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")}
+        assert set(replicate.config._SCORE_SUMMARY_TRIGGERS + replicate.config._EMPLOYEE_FTS_TRIGGERS) <= triggers
+        matches = conn.execute("SELECT e.Sicil_No FROM employees_fts f JOIN employees e ON e.id = f.rowid "
+                               "WHERE employees_fts MATCH 'isik'").fetchall()
+        assert matches == [("S001",)]
+        # Tetikleyiciler hedefte çalışıyor: yeni skor özeti günceller
+        conn.execute("INSERT INTO process_scores (process_id, employee_name, employee_sicil_no, toplam_skor, tarih) "
+                     "VALUES (1, 'Ayşe Yılmaz', 'S002', 100.0, '2025-06-01')")
+        assert conn.execute("SELECT score_count, score_max FROM employee_score_summary "
+                            "WHERE employee_sicil_no = 'S002'").fetchone() == (2, 100.0)
+        assert conn.execute("SELECT COUNT(*) FROM rollup_state").fetchone() == (0,)
+    finally:
+        conn.close()
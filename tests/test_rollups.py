@@ -0,0 +1,46 @@
+# tests/test_rollups.py
+"""Skor özetleri: NULL bileşenler ortalamaya katılmaz (AVG() ile aynı)"""
+import pandas as pd
+import pytest
+
+import rollups
+
+
+@pytest.fixture
+def scores(db):
+    db.execute_query("INSERT INTO processes (id, process_name, department) VALUES (1, 'Denetim', 'IT')", fetch=False)
+    insert = ("INSERT INTO process_scores (process_id, employee_name, employee_sicil_no, kalite, toplam_skor, tarih) "
+              "VALUES (1, ?, ?, ?, ?, ?)")
+    for row in [("Ayşe Yılmaz", "S001", 90.0, 80.0, "2025-01-05"),
+                ("Ayşe Yılmaz", "S001", None, 60.0, "2025-01-20"),
+                ("Ali Kaya", "S002", 70.0, None, "2025-01-25")]:
+        db.execute_query(insert, row, fetch=False)
+    rollups.refresh_rollups(full=True)
+    return db
+
+
+def expected_averages(db, key_expr):
+    rows = db.fetch_dicts(f"""
+        SELECT {key_expr} AS k, AVG(kalite) AS kalite_avg, AVG(toplam_skor) AS toplam_skor_avg
+        FROM process_scores GROUP BY {key_expr}
+    """)
+    return {row['k']: (row['kalite_avg'], row['toplam_skor_avg']) for row in rows}
+
+
+@pytest.mark.parametrize("group_by, key_expr, source", [
+    (("employee_key",), "employee_key", rollups.EMPLOYEE_ROLLUP),
+    (("process_id", "employee_key"), "employee_key", "process_scores"),
+    (("department",), "'IT'", rollups.DEPT_ROLLUP),
+])
+def test_average_matches_sql_avg(scores, group_by, key_expr, source):
+    df = rollups.query_scores(metrics=("kalite", "toplam_skor"), group_by=group_by, aggregates=("avg",))
+
+    assert df.attrs['source'] == source
+    expected = expected_averages(scores, key_expr)
+    for row in df.to_dict('records'):
+        kalite, toplam = expected[row[group_by[-1]]]
+        assert row['kalite_avg'] == pytest.approx(kalite)
+        if toplam is None:
+            assert pd.isna(row['toplam_skor_avg'])
+        else:
+            assert row['toplam_skor_avg'] == pytest.approx(toplam)
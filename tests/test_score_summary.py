@@ -0,0 +1,68 @@
+# tests/test_score_summary.py
+"""Tetikleyicilerle güncel tutulan liderlik tablosu özeti ham tabloyla aynı kalmalı"""
+import pytest
+
+SUMMARY_COLUMNS = "employee_sicil_no, employee_name, score_count, score_sum, score_max, last_tarih, last_onay"
+
+
+def raw_summary(db):
+    rows = db.fetch_dicts("""
+        SELECT ps.employee_key AS employee_sicil_no, latest.employee_name,
+               COUNT(ps.toplam_skor) AS score_count, COALESCE(SUM(ps.toplam_skor), 0) AS score_sum,
+               MAX(ps.toplam_skor) AS score_max, latest.tarih AS last_tarih, latest.onay AS last_onay
+        FROM process_scores ps
+        JOIN process_scores latest ON latest.id = (
+            SELECT id FROM process_scores WHERE employee_key = ps.employee_key ORDER BY tarih DESC, id DESC LIMIT 1)
+        GROUP BY ps.employee_key
+        ORDER BY ps.employee_key
+    """)
+    return rows
+
+
+def summary(db):
+    return db.fetch_dicts(f"SELECT {SUMMARY_COLUMNS} FROM employee_score_summary ORDER BY employee_sicil_no")
+
+
+def add_score(db, name, sicil_no, score, tarih, onay="Beklemede"):
+    db.execute_query("INSERT INTO process_scores (process_id, employee_name, employee_sicil_no, toplam_skor, "
+                     "tarih, onay) VALUES (1, ?, ?, ?, ?, ?)", (name, sicil_no, score, tarih, onay), fetch=False)
+
+
+@pytest.fixture
+def scored(db):
+    db.execute_query("INSERT INTO processes (id, process_name) VALUES (1, 'Denetim')", fetch=False)
+    add_score(db, "Ayşe Yılmaz", "S001", 80.0, "2025-01-01")
+    add_score(db, "Ayşe Yılmaz", "S001", None, "2025-02-01", "Onaylandı")
+    add_score(db, "Ali Kaya", "S002", 60.0, "2025-01-15")
+    add_score(db, "Eski Kayıt", None, 40.0, "2024-12-01")
+    return db
+
+
+def test_insert_keeps_summary_in_sync(scored):
+    rows = summary(scored)
+    assert rows == raw_summary(scored)
+    ayse = next(r for r in rows if r['employee_sicil_no'] == "S001")
+    # NULL skor sayılmaz ama en son kayıt olarak onay durumunu belirler
+    assert (ayse['score_count'], ayse['score_sum'], ayse['last_onay']) == (1, 80.0, "Onaylandı")
+    assert "Eski Kayıt" in {r['employee_sicil_no'] for r in rows}
+
+
+def test_update_move_and_delete_keep_summary_in_sync(scored):
+    scored.execute_query("UPDATE process_scores SET toplam_skor = 95.0 WHERE employee_sicil_no = 'S002'", fetch=False)
+    assert summary(scored) == raw_summary(scored)
+
+    # Sicil değişince hem eski hem yeni çalışanın satırı yenilenir
+    scored.execute_query("UPDATE process_scores SET employee_sicil_no = 'S002' WHERE tarih = '2025-01-01'",
+                         fetch=False)
+    assert summary(scored) == raw_summary(scored)
+
+    scored.execute_query("DELETE FROM process_scores WHERE employee_sicil_no = 'S002'", fetch=False)
+    rows = summary(scored)
+    assert rows == raw_summary(scored)
+    assert "S002" not in {r['employee_sicil_no'] for r in rows}
+
+
+def test_rebuild_matches_trigger_state(scored):
+    before = summary(scored)
+    assert scored.rebuild_score_summary() == len(before)
+    assert summary(scored) == before
@@ -0,0 +1,82 @@
+# tests/test_scoring.py
+"""Toplu yeniden puanlama: ağırlık önceliği, deneme modu, tekrar çalıştırma, toplu mod özetleri"""
+import pytest
+
+import rollups
+import scoring
+
+# (süreç, departman, ağırlık)
+PROCESSES = [(1, "IT", 1.0), (2, "IT", 1.0), (3, "IK", 2.0)]
+RULES = scoring.ScoringRules(weights={'inovasyon': 0.5}, departments={"IT": {'inovasyon': 1.0}},
+                             processes={2: {'inovasyon': 2.0}})
+
+
+@pytest.fixture
+def scores(db):
+    db.execute_many("INSERT INTO processes (id, process_name, department, weight) VALUES (?, ?, ?, ?)",
+                    [(pid, f"Süreç {pid}", dept, weight) for pid, dept, weight in PROCESSES])
+    db.execute_many("INSERT INTO process_scores (process_id, employee_name, employee_sicil_no, inovasyon, "
+                    "toplam_skor, tarih) VALUES (?, ?, ?, ?, ?, ?)",
+                    [(pid, f"Çalışan {i}", f"S{i:03d}", 10.0, 1.0, f"2025-0{pid}-01")
+                     for i, (pid, _, _) in enumerate(PROCESSES * 2)])
+    return db
+
+
+def totals_by_process(db):
+    return {row['process_id']: row['toplam_skor'] for row in
+            db.fetch_dicts("SELECT DISTINCT process_id, toplam_skor FROM process_scores ORDER BY process_id")}
+
+
+def test_process_rule_overrides_department_overrides_default(scores):
+    status = scoring.rescore(RULES, chunk_size=4)
+
+    assert status['changed'] == status['written'] == 6
+    # 1: departman (IT) 1.0 * 10, 2: süreç 2.0 * 10, 3: varsayılan 0.5 * 10 * süreç ağırlığı 2.0
+    assert totals_by_process(scores) == {1: 10.0, 2: 20.0, 3: 10.0}
+
+
+def test_dry_run_reports_diff_without_writing(scores):
+    status = scoring.rescore(RULES, dry_run=True, chunk_size=4)
+
+    assert (status['scanned'], status['changed'], status['written']) == (6, 6, 0)
+    assert status['delta_sum'] == pytest.approx(2 * (9.0 + 19.0 + 9.0))
+    assert status['max_abs_delta'] == pytest.approx(19.0)
+    diff = status['diff']
+    assert len(diff) == 6
+    assert set(diff.loc[diff['process_id'] == 2, 'yeni']) == {20.0}
+    assert set(diff['eski']) == {1.0}
+    assert totals_by_process(scores) == {1: 1.0, 2: 1.0, 3: 1.0}
+
+
+def test_second_run_changes_nothing(scores):
+    scoring.rescore(RULES)
+    status = scoring.rescore(RULES)
+
+    assert (status['scanned'], status['changed'], status['written']) == (6, 0, 0)
+    assert status['diff'].empty
+
+
+def test_bulk_mode_keeps_summary_and_rollups_consistent(scores, monkeypatch):
+    monkeypatch.setattr(scoring, "BULK_MODE_THRESHOLD", 2)
+    entered = []
+    bulk_mode = scores.score_summary_bulk_mode
+
+    def spy():
+        entered.append(True)
+        return bulk_mode()
+
+    monkeypatch.setattr(scores, "score_summary_bulk_mode", spy)
+    scoring.rescore(RULES, chunk_size=4)
+
+    assert entered == [True]
+    assert set(scores._SCORE_SUMMARY_TRIGGERS) <= {
+        row['name'] for row in scores.fetch_dicts("SELECT name FROM sqlite_master WHERE type = 'trigger'")}
+    summary = scores.fetch_dicts("SELECT employee_sicil_no, score_sum, score_max FROM employee_score_summary "
+                                 "ORDER BY employee_sicil_no")
+    raw = scores.fetch_dicts("SELECT employee_key AS employee_sicil_no, SUM(toplam_skor) AS score_sum, "
+                             "MAX(toplam_skor) AS score_max FROM process_scores GROUP BY employee_key ORDER BY 1")
+    assert summary == raw
+
+    df = rollups.query_scores(group_by=("process_id", "month"), aggregates=("sum", "max"))
+    assert df.attrs['source'] == rollups.DEPT_ROLLUP
+    assert dict(zip(df['process_id'], df['toplam_skor_sum'])) == {1: 20.0, 2: 40.0, 3: 20.0}
@@ -0,0 +1,36 @@
+# tests/test_sqlite_pool.py
+import sqlite3
+
+import pytest
+
+
+@pytest.mark.parametrize("query, read_only", [
+    ("SELECT 1", True),
+    ("  (SELECT 1) UNION SELECT 2", True),
+    ("EXPLAIN QUERY PLAN SELECT * FROM logs", True),
+    ("WITH x AS (SELECT 1) SELECT * FROM x", True),
+    ("WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 3) SELECT i FROM n", True),
+    ("WITH x(a) AS (SELECT 'insert') INSERT INTO logs (action) SELECT a FROM x", False),
+    ("with x as (select id from logs) delete from logs where id in (select id from x)", False),
+    ("WITH x AS (SELECT 1) /* update */ SELECT * FROM x -- delete", True),
+    ("INSERT INTO logs (action) VALUES ('select')", False),
+    ("PRAGMA table_info(logs)", False),
+])
+def test_is_read_only_query(db, query, read_only):
+    assert db.is_read_only_query(query) is read_only
+
+
+def test_cte_write_goes_to_writer(db):
+    insert = "WITH x(a) AS (SELECT ?) INSERT INTO logs (username, action) SELECT 'u', a FROM x"
+    db.execute_query(insert, ("cte_yaz",), fetch=False)
+    db.execute_query(insert, ("cte_sonuclu",))
+    actions = db.fetch_dicts("SELECT action FROM logs ORDER BY id")
+    assert [row['action'] for row in actions] == ["cte_yaz", "cte_sonuclu"]
+
+
+def test_read_pool_is_query_only(db):
+    with db.get_connection(readonly=True) as conn:
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("INSERT INTO logs (action) VALUES ('salt_okunur')")
+    stats = db.db_manager.pool_stats()
+    assert stats['read']['in_use'] == 0 and stats['write']['in_use'] == 0
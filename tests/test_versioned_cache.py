@@ -0,0 +1,104 @@
+# tests/test_versioned_cache.py
+import pytest
+
+
+@pytest.fixture
+def counted(db):
+    """İki tabloya bağlı sayaçlı önbellekler"""
+    calls = {'logs': 0, 'summary': 0}
+
+    def count_logs():
+        calls['logs'] += 1
+        return db.fetch_scalar("SELECT COUNT(*) FROM logs", default=0)
+
+    def top_score():
+        calls['summary'] += 1
+        return db.fetch_scalar("SELECT MAX(score_max) FROM employee_score_summary")
+
+    return db.VersionedCache(count_logs, ("logs",)), db.VersionedCache(top_score, ("employee_score_summary",)), calls
+
+
+def add_score(db, sicil_no, score, tarih="2025-01-01"):
+    db.execute_query("INSERT INTO process_scores (process_id, employee_name, employee_sicil_no, toplam_skor, tarih) "
+                     "VALUES (1, ?, ?, ?, ?)", (sicil_no, sicil_no, score, tarih), fetch=False)
+
+
+@pytest.mark.parametrize("query, tables", [
+    ("INSERT INTO logs (action) VALUES (?)", ("logs",)),
+    ("INSERT OR IGNORE INTO users (username) VALUES (?)", ("users",)),
+    ("  update `employees` SET Ad_Soyad = ?", ("employees", "employees_fts")),
+    ("DELETE FROM process_scores WHERE id = ?", ("process_scores", "employee_score_summary")),
+    ("CREATE INDEX idx ON logs (action)", None),
+])
+def test_written_tables(db, query, tables):
+    assert db.written_tables(query) == tables
+
+
+def test_write_invalidates_only_its_table(db, counted):
+    logs, summary, calls = counted
+    assert logs() == 0 and logs() == 0
+    summary()
+    assert calls == {'logs': 1, 'summary': 1}
+
+    db.execute_query("INSERT INTO logs (username, action) VALUES (?, ?)", ("u", "test"), fetch=False)
+    assert logs() == 1
+    summary()
+    assert calls == {'logs': 2, 'summary': 1}
+    assert logs.info()['invalidations'] == 1
+
+
+def test_noop_write_keeps_cache(db, counted):
+    logs, _, calls = counted
+    logs()
+    db.execute_query("DELETE FROM logs WHERE action = ?", ("olmayan",), fetch=False)
+    logs()
+    assert calls['logs'] == 1
+
+
+def test_source_write_invalidates_trigger_maintained_summary(db, counted):
+    _, summary, calls = counted
+    db.execute_query("INSERT INTO processes (id, process_name) VALUES (1, 'Denetim')", fetch=False)
+    add_score(db, "S1", 70.0)
+    assert summary() == 70.0
+
+    add_score(db, "S2", 90.0)
+    assert summary() == 90.0
+    db.execute_query("UPDATE process_scores SET toplam_skor = ? WHERE employee_sicil_no = ?", (50.0, "S2"),
+                     fetch=False)
+    assert summary() == 70.0
+    db.execute_query("DELETE FROM process_scores WHERE employee_sicil_no = ?", ("S1",), fetch=False)
+    assert summary() == 50.0
+    assert calls['summary'] == 4
+
+
+def test_invalidate_all_and_ttl(db, counted, monkeypatch):
+    logs, summary, calls = counted
+    logs(), summary()
+    db.invalidate_tables()
+    logs(), summary()
+    assert calls == {'logs': 2, 'summary': 2}
+
+    expiring = db.VersionedCache(lambda: object(), ("logs",), ttl=60)
+    first = expiring()
+    now = db.time.monotonic()
+    monkeypatch.setattr(db.time, "monotonic", lambda: now + 61)
+    assert expiring() is not first
+
+
+def test_lru_bound(db):
+    cache = db.VersionedCache(lambda n: [n], ("logs",), maxsize=2)
+    one = cache(1)
+    cache(2), cache(3)
+    assert cache.info()['size'] == 2
+    assert cache(1) is not one
+
+
+def test_repository_write_invalidates_derived_tables(db):
+    import repository
+
+    db.execute_query("INSERT INTO processes (id, process_name) VALUES (1, 'Denetim')", fetch=False)
+    before = db.table_versions.get(("process_scores", "employee_score_summary", "logs"))
+    repository.process_scores.bulk_insert([{'process_id': 1, 'employee_name': "S1", 'employee_sicil_no': "S1",
+                                            'toplam_skor': 50.0, 'tarih': "2025-01-01"}])
+    after = db.table_versions.get(("process_scores", "employee_score_summary", "logs"))
+    assert after[1] > before[1] and after[2] > before[2] and after[3] == before[3]
@@ -0,0 +1,86 @@
+# tests/test_write_queue.py
+import threading
+
+import pytest
+
+INSERT_LOG = "INSERT INTO logs (username, action) VALUES (?, ?)"
+
+
+class BlockingManager:
+    """Yazar thread'inin commit'ini `release` gelene kadar bekleten sarmalayıcı"""
+
+    def __init__(self, manager):
+        self.manager = manager
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+    def run_write_batch(self, groups):
+        if threading.current_thread().name == "effinova-writer":
+            self.entered.set()
+            self.release.wait(10)
+        return self.manager.run_write_batch(groups)
+
+
+@pytest.fixture
+def writer(db):
+    created = []
+
+    def make(manager=None, **options):
+        w = db.GroupCommitWriter(manager or db.db_manager, **options)
+        created.append(w)
+        return w
+
+    yield make
+    for w in created:
+        w.stop()
+
+
+def log_count(db, action):
+    return db.fetch_scalar("SELECT COUNT(*) FROM logs WHERE action = ?", (action,), 0)
+
+
+def test_flush_commits_in_batches(db, writer):
+    w = writer(max_batch=100, max_delay=0.05)
+    futures = [w.submit(INSERT_LOG, ("u", "toplu")) for _ in range(50)]
+    counted = w.submit(INSERT_LOG, ("u", "toplu"), want_result=True)
+
+    assert w.flush(timeout=10)
+    assert log_count(db, "toplu") == 51
+    assert counted.result(timeout=1) == 1
+    assert all(f.done() for f in futures)
+    assert w.stats['statements'] == 51
+    assert w.stats['batches'] < 51
+
+
+def test_full_queue_writes_in_caller_without_blocking(db, writer):
+    manager = BlockingManager(db.db_manager)
+    w = writer(manager, max_batch=1, max_delay=0, max_pending=1)
+    w.submit(INSERT_LOG, ("u", "bekleyen"))
+    assert manager.entered.wait(5)
+    w.submit(INSERT_LOG, ("u", "bekleyen"))      # kuyruğu doldurur
+
+    overflow = w.submit(INSERT_LOG, ("u", "tasan"), want_result=True)
+    assert overflow.done() and overflow.result() == 1
+    assert w.stats['overflow'] == 1
+    assert log_count(db, "tasan") == 1
+
+    manager.release.set()
+    assert w.flush(timeout=10)
+    assert log_count(db, "bekleyen") == 2
+
+
+def test_failed_statement_does_not_stop_writer(db, writer):
+    w = writer(max_batch=10, max_delay=0.01)
+    bad = w.submit("INSERT INTO olmayan_tablo (x) VALUES (?)", (1,), want_result=True)
+    good = w.submit(INSERT_LOG, ("u", "sonra"), want_result=True)
+
+    with pytest.raises(Exception):
+        bad.result(timeout=10)
+    assert good.result(timeout=10) == 1
+    assert w.stats['failed'] == 1
+
+
+def test_execute_query_queued(db):
+    future = db.execute_query(INSERT_LOG, ("u", "kuyruklu"), fetch=False, queued=True)
+    assert future.result(timeout=10) == 1
+    assert log_count(db, "kuyruklu") == 1